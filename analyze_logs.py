@@ -0,0 +1,142 @@
+"""
+analyze_logs.py
+Counts page hits in Apache/nginx "combined" access logs and writes
+popularity.json, which the build uses to rank pages:
+
+  - gen_sitemap.py      sitemap <priority> of pair and land pages
+  - update_conv_links   the "Common Conversions" links on the homepage
+  - gen_pair_pages.py   the order of the related links on each pair page
+
+Logs are streamed line by line (plain or .gz rotations), one worker process
+per file, so memory stays flat however large the logs are. Only successful
+GET/HEAD requests for pages that exist in the site are counted.
+
+Counting is exact (a dict of page -> hits) by default. --sketch switches to
+a fixed-size count-min sketch whose memory doesn't grow with the number of
+distinct URLs in the logs (useful when bots hit millions of junk paths);
+counts may then be slightly overestimated.
+
+Usage:
+  python analyze_logs.py /var/log/apache2/access.log*
+  python analyze_logs.py --sketch logs/*.gz
+"""
+
+import os, re, gzip, json, time, zlib, argparse
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from site_common import POPULARITY_FILE, write_if_changed
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+# "GET /length/meter-to-foot/?x=1 HTTP/1.1" 200
+REQUEST_RE = re.compile(rb'"(?:GET|HEAD) (/[^ ?#"]*)[^"]* HTTP/[\d.]+" (?:200|304) ')
+# /{cat}/{page}/ or /land/{state}/{from}-to-{to}/, with or without the trailing slash or index.html
+PAGE_RE = re.compile(rb"^/([a-z]+)/([a-z0-9-]+)(?:/([a-z0-9-]+))?(?:/|/index\.html)?$")
+
+SKETCH_WIDTH = 1 << 16
+SKETCH_DEPTH = 4
+
+# ── Count-min sketch ──────────────────────────────────────────────────────────
+
+class CountMinSketch:
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        self.width = width
+        self.rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+
+    def add(self, key, count=1):
+        for seed, row in enumerate(self.rows):
+            row[zlib.crc32(key, seed) % self.width] += count
+
+    def estimate(self, key):
+        return min(row[zlib.crc32(key, seed) % self.width] for seed, row in enumerate(self.rows))
+
+    def merge(self, other):
+        for row, other_row in zip(self.rows, other.rows):
+            for i, v in enumerate(other_row):
+                if v:
+                    row[i] += v
+
+# ── Log scanning ──────────────────────────────────────────────────────────────
+
+def open_log(path):
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+def scan_file(path, sketch):
+    """Worker: count page hits in one log file. Returns (lines read, counts)."""
+    counts = CountMinSketch() if sketch else Counter()
+    lines = 0
+    search, page = REQUEST_RE.search, PAGE_RE.match
+    with open_log(path) as f:
+        for line in f:
+            lines += 1
+            m = search(line)
+            if not m:
+                continue
+            p = page(m.group(1))
+            if not p:
+                continue
+            key = b"/%s/" % b"/".join(g for g in p.groups() if g)
+            if sketch:
+                counts.add(key)
+            else:
+                counts[key] += 1
+    return lines, counts
+
+def site_pages(base=BASE):
+    """URL paths of every /{cat}/{page}/ and /{cat}/{page}/{sub}/ (land pair pages) in the
+    site — the only keys worth counting."""
+    pages = []
+    for cat in sorted(os.listdir(base)):
+        cat_dir = os.path.join(base, cat)
+        if cat.startswith(".") or not os.path.isdir(cat_dir):
+            continue
+        for name in sorted(os.listdir(cat_dir)):
+            page_dir = os.path.join(cat_dir, name)
+            if os.path.exists(os.path.join(page_dir, "index.html")):
+                pages.append(f"/{cat}/{name}/")
+            if os.path.isdir(page_dir):
+                for sub in sorted(os.listdir(page_dir)):
+                    if os.path.exists(os.path.join(page_dir, sub, "index.html")):
+                        pages.append(f"/{cat}/{name}/{sub}/")
+    return pages
+
+def analyze(paths, sketch=False, out=POPULARITY_FILE, jobs=None, base=BASE):
+    start = time.perf_counter()
+    total_lines = 0
+    merged = CountMinSketch() if sketch else Counter()
+    with ProcessPoolExecutor(jobs) as pool:
+        for path, (lines, counts) in zip(paths, pool.map(scan_file, paths, [sketch] * len(paths))):
+            print(f"  {path}: {lines:,} lines")
+            total_lines += lines
+            if sketch:
+                merged.merge(counts)
+            else:
+                merged.update(counts)
+
+    hits = {}
+    for page in site_pages(base):
+        n = merged.estimate(page.encode()) if sketch else merged.get(page.encode(), 0)
+        if n:
+            hits[page] = n
+    data = {"mode": "sketch" if sketch else "exact", "lines": total_lines, "hits": hits}
+    write_if_changed(out, json.dumps(data, indent=1, sort_keys=True) + "\n")
+
+    print(f"\nRead {total_lines:,} lines from {len(paths)} files in {time.perf_counter() - start:.1f}s.")
+    print(f"{len(hits)} pages with hits, {sum(hits.values()):,} hits in total. Top pages:")
+    for page, n in sorted(hits.items(), key=lambda kv: (-kv[1], kv[0]))[:10]:
+        print(f"  {n:>10,}  {page}")
+    print(f"Written to {os.path.relpath(out)}. Rebuild (python build.py) to apply.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute page popularity from access logs")
+    parser.add_argument("logs", nargs="+", help="combined-format access logs (.gz allowed)")
+    parser.add_argument("--sketch", action="store_true", help="count with a fixed-size count-min sketch")
+    parser.add_argument("--out", default=POPULARITY_FILE, help="output file (default: popularity.json)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+    analyze(args.logs, args.sketch, args.out, args.jobs)
+
+if __name__ == "__main__":
+    main()
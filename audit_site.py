@@ -0,0 +1,206 @@
+"""
+audit_site.py
+Audits every generated index.html in the site: well-formed markup, a unique
+<title> and meta description, canonical URL matching og:url and the page's
+own address, and JSON-LD that parses. Pages are parsed with a streaming
+HTMLParser across a process pool; results stream into a JSON report.
+
+Usage:
+  python audit_site.py                          # audit this directory
+  python audit_site.py --base DIR               # audit a build output (e.g. .build/current)
+  python audit_site.py --report audit.json      # where to write the report
+
+The report goes to .build/audit-report.json by default, outside the docroot.
+Exits non-zero when any page fails a check.
+"""
+
+import os, sys, json, time, argparse
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+BASE_URL = "https://www.swapunits.online"
+REPORT_FILE = os.path.join(BASE, ".build", "audit-report.json")
+CHUNK_SIZE = 64 * 1024
+
+# Elements that never have a closing tag
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+             "meta", "param", "source", "track", "wbr"}
+# Elements whose closing tag HTML lets you leave out
+OPTIONAL_END_TAGS = {"p", "li", "dt", "dd", "option", "tr", "td", "th", "thead", "tbody", "tfoot"}
+
+# ── Page parser ───────────────────────────────────────────────────────────────
+
+class PageAuditor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []
+        self.errors = []
+        self.titles = []
+        self.descriptions = []
+        self.canonical = None
+        self.og_url = None
+        self.json_ld = []
+        self._text = None  # collects text inside <title> or a JSON-LD <script>
+
+    def error(self, msg):
+        self.errors.append(f"line {self.getpos()[0]}: {msg}")
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        if tag == "meta":
+            if a.get("name") == "description":
+                self.descriptions.append(a.get("content") or "")
+            elif a.get("property") == "og:url":
+                self.og_url = a.get("content")
+        elif tag == "link" and a.get("rel") == "canonical":
+            if self.canonical is not None:
+                self.error("more than one canonical link")
+            self.canonical = a.get("href")
+        elif tag == "title" or (tag == "script" and a.get("type") == "application/ld+json"):
+            self._text = []
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        # <br />, <meta ... /> — record attributes without opening an element
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        if tag not in self.stack:
+            self.error(f"stray </{tag}>")
+            return
+        while self.stack[-1] != tag:
+            open_tag = self.stack.pop()
+            if open_tag not in OPTIONAL_END_TAGS:
+                self.error(f"<{open_tag}> closed by </{tag}>")
+        self.stack.pop()
+        if self._text is not None and tag in ("title", "script"):
+            text = "".join(self._text).strip()
+            if tag == "title":
+                self.titles.append(text)
+            else:
+                self.json_ld.append(text)
+            self._text = None
+
+    def handle_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+def page_url(rel_path):
+    """Public URL of an index.html given its path relative to the site root."""
+    d = os.path.dirname(rel_path).replace("\\", "/")
+    return f"{BASE_URL}/{d}/" if d else f"{BASE_URL}/"
+
+def audit_page(args):
+    """Worker: parse one page and return its findings."""
+    base, rel = args
+    p = PageAuditor()
+    with open(os.path.join(base, rel), encoding="utf-8") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), ""):
+            p.feed(chunk)
+    p.close()
+
+    errors = list(p.errors)
+    unclosed = [t for t in p.stack if t not in OPTIONAL_END_TAGS]
+    if unclosed:
+        errors.append(f"unclosed elements at end of file: {', '.join(unclosed)}")
+    if len(p.titles) != 1 or not p.titles[0]:
+        errors.append(f"expected one non-empty <title>, found {len(p.titles)}")
+    if len(p.descriptions) != 1 or not p.descriptions[0]:
+        errors.append(f"expected one non-empty meta description, found {len(p.descriptions)}")
+    url = page_url(rel)
+    if p.canonical is None:
+        errors.append("missing canonical link")
+    elif p.canonical != url:
+        errors.append(f"canonical {p.canonical} is not the page URL {url}")
+    if p.og_url is None:
+        errors.append("missing og:url")
+    elif p.og_url != p.canonical:
+        errors.append(f"og:url {p.og_url} differs from canonical {p.canonical}")
+    if not p.json_ld:
+        errors.append("missing JSON-LD")
+    for block in p.json_ld:
+        try:
+            json.loads(block)
+        except ValueError as e:
+            errors.append(f"invalid JSON-LD: {e}")
+
+    return {
+        "path": rel.replace("\\", "/"),
+        "title": p.titles[0] if p.titles else None,
+        "description": p.descriptions[0] if p.descriptions else None,
+        "errors": errors,
+    }
+
+# ── Site audit ────────────────────────────────────────────────────────────────
+
+def find_pages(base):
+    pages = []
+    for root, dirs, files in os.walk(base):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and "__" not in d)
+        if "index.html" in files:
+            pages.append(os.path.relpath(os.path.join(root, "index.html"), base))
+    return pages
+
+def duplicates(results, field):
+    """{value: [paths]} for every title/description used by more than one page."""
+    seen = {}
+    for r in results:
+        if r[field]:
+            seen.setdefault(r[field], []).append(r["path"])
+    return {value: paths for value, paths in sorted(seen.items()) if len(paths) > 1}
+
+def audit(base=BASE, report_path=None, jobs=None):
+    """Audit every page under base and write the JSON report. Returns the number of problems."""
+    base = os.path.abspath(base)
+    report_path = report_path or REPORT_FILE
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    pages = find_pages(base)
+    start = time.perf_counter()
+    results = []
+    failed = 0
+
+    with open(report_path, "w", encoding="utf-8") as out, ProcessPoolExecutor(jobs) as pool:
+        out.write('{\n "pages": [\n')
+        chunksize = max(1, len(pages) // ((jobs or os.cpu_count() or 1) * 4))
+        for i, r in enumerate(pool.map(audit_page, [(base, rel) for rel in pages], chunksize=chunksize)):
+            results.append(r)
+            if r["errors"]:
+                failed += 1
+            out.write(("," if i else "") + "  " + json.dumps(r, ensure_ascii=False) + "\n")
+        dup_titles = duplicates(results, "title")
+        dup_descs = duplicates(results, "description")
+        out.write(' ],\n')
+        out.write(f' "duplicate_titles": {json.dumps(dup_titles, ensure_ascii=False, indent=1)},\n')
+        out.write(f' "duplicate_descriptions": {json.dumps(dup_descs, ensure_ascii=False, indent=1)},\n')
+        summary = {"pages": len(pages), "pages_with_errors": failed,
+                   "duplicate_titles": len(dup_titles), "duplicate_descriptions": len(dup_descs),
+                   "seconds": round(time.perf_counter() - start, 2)}
+        out.write(f' "summary": {json.dumps(summary)}\n}}\n')
+
+    for r in results:
+        for err in r["errors"]:
+            print(f"  [FAIL] {r['path']}: {err}")
+    for label, dups in (("title", dup_titles), ("description", dup_descs)):
+        for value, paths in dups.items():
+            print(f"  [DUP] {label} used by {len(paths)} pages: {value[:60]!r} ({', '.join(paths[:3])}...)")
+    print(f"Audited {len(pages)} pages in {summary['seconds']:.2f}s: "
+          f"{failed} with errors, {len(dup_titles)} duplicate titles, {len(dup_descs)} duplicate descriptions.")
+    print(f"Report written to {os.path.relpath(report_path)}")
+    return failed + len(dup_titles) + len(dup_descs)
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit every page of the site")
+    parser.add_argument("--base", default=BASE, help="site root to audit (default: this directory)")
+    parser.add_argument("--report", default=None, help="JSON report path (default: .build/audit-report.json)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+    return 1 if audit(args.base, args.report, args.jobs) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
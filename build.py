@@ -0,0 +1,469 @@
+"""
+build.py
+Builds the whole site in one go and checks that the build is reproducible.
+
+Usage:
+  python build.py               # build in place (this directory is the docroot)
+  python build.py --out DIR     # build a complete copy of the site into DIR
+  python build.py --check       # build twice into temp dirs and diff byte for byte
+  python build.py --release     # staged build, validate, atomically publish
+  python build.py --rollback    # point the live site back at the previous release
+  python build.py --force       # rerun every stage, even if its inputs are unchanged
+  python build.py --watch       # rebuild, then re-render only what each edit affects
+
+The build is a small DAG of stages (see STAGES). Stages whose dependencies
+are done run concurrently in worker processes; a stage is skipped when its
+inputs hash the same as on the last successful build into that directory.
+
+Generators only rewrite files whose bytes changed, so unchanged pages keep
+their mtime and Apache keeps serving the same ETag for them.
+
+Releases: --release renders into .build/releases/<timestamp>/, validates it,
+then swaps the .build/current symlink to it with a single rename, so the
+docroot (point Apache/nginx at .build/current) never shows a half-written
+site. Files identical to the previous release are hard-linked to it, which
+keeps their mtime/ETag. The newest KEEP_RELEASES releases are kept for rollback.
+"""
+
+import os, sys, io, json, time, shutil, hashlib, argparse, tempfile, contextlib
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import gen_pair_pages
+import ingest_land_units
+import gen_land_pages
+import gen_land_pair_pages
+import gen_land_matrix
+import date_engine
+import gen_category_pages
+import gen_js_modules
+import gen_html_sitemap
+import update_conv_links
+import gen_sitemap
+import gen_service_worker
+import gen_search_index
+import precompress
+import gen_value_pages
+from site_common import write_if_changed
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+BUILD_DIR = os.path.join(SRC_DIR, ".build")
+KEEP_RELEASES = 5
+
+# Hand-written files copied as-is into an out-of-tree build
+STATIC_PATHS = [
+    "index.html", "about.html", "contact.html", "privacy.html", "date-calculator.html",
+    "ads.txt", "robots.txt", ".htaccess",
+    "css", "js", "neet_jee",
+]
+
+# ── Build steps ───────────────────────────────────────────────────────────────
+
+def copy_file(src, dst):
+    with open(src, "rb") as f:
+        write_if_changed(dst, f.read())
+
+def copy_static(out_dir):
+    for rel in STATIC_PATHS:
+        src = os.path.join(SRC_DIR, rel)
+        if os.path.isdir(src):
+            for root, dirs, files in os.walk(src):
+                dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    copy_file(path, os.path.join(out_dir, os.path.relpath(path, SRC_DIR)))
+        elif os.path.exists(src):
+            copy_file(src, os.path.join(out_dir, rel))
+
+# ── Stages ────────────────────────────────────────────────────────────────────
+# Each stage runs in its own worker process as soon as the stages it comes
+# "after" have finished, so independent generators run concurrently.
+
+def stage_static(out_dir, update_manifest):
+    if out_dir != SRC_DIR:
+        copy_static(out_dir)
+
+def stage_pair_pages(out_dir, update_manifest):
+    gen_pair_pages.main(out_dir)
+
+def stage_land_units(out_dir, update_manifest):
+    # Compiles the spreadsheet into land-units.json in the source tree, like the lastmod manifest
+    ingest_land_units.main()
+
+# Stage workers are forked from a process that loaded land-units.json before
+# land_units ran, so the land stages re-read it
+def stage_land_pages(out_dir, update_manifest):
+    gen_land_pages.reload_registry()
+    gen_land_pages.main(out_dir)
+
+def stage_land_pair_pages(out_dir, update_manifest):
+    gen_land_pages.reload_registry()
+    gen_land_pair_pages.main(out_dir)
+
+def stage_land_matrix(out_dir, update_manifest):
+    gen_land_pages.reload_registry()
+    gen_land_matrix.main(out_dir)
+
+def stage_category_pages(out_dir, update_manifest):
+    gen_category_pages.main(out_dir)
+
+def stage_js_modules(out_dir, update_manifest):
+    gen_js_modules.main(out_dir)
+
+def stage_html_sitemap(out_dir, update_manifest):
+    gen_html_sitemap.main(out_dir)
+
+def stage_conv_links(out_dir, update_manifest):
+    update_conv_links.main(out_dir)
+
+def stage_holidays(out_dir, update_manifest):
+    date_engine.main(out_dir)
+
+def stage_search_index(out_dir, update_manifest):
+    gen_land_pages.reload_registry()
+    gen_search_index.main(out_dir)
+
+def stage_precompress(out_dir, update_manifest):
+    precompress.main(out_dir)
+
+def stage_service_worker(out_dir, update_manifest):
+    gen_service_worker.main(out_dir)
+
+def stage_value_pages(out_dir, update_manifest):
+    gen_value_pages.main(out_dir)
+
+def stage_sitemap(out_dir, update_manifest):
+    # The lastmod manifest lives in the source tree so dates carry over between builds
+    gen_sitemap.main(out_dir, os.path.join(SRC_DIR, gen_sitemap.LASTMOD_FILE), update_manifest)
+
+# inputs are source paths (files or dirs); outputs are paths under the output dir
+STAGES = [
+    {"name": "static",         "run": stage_static,         "after": [],
+     "inputs": STATIC_PATHS,                                       "outputs": STATIC_PATHS},
+    {"name": "pair_pages",     "run": stage_pair_pages,     "after": [],
+     "inputs": ["gen_pair_pages.py", "site_common.py", "popularity.json", "js/hamburger.js", "js/search.js"],
+     "outputs": list(gen_pair_pages.CATEGORIES)},
+    {"name": "land_units",     "run": stage_land_units,     "after": [],
+     "inputs": ["ingest_land_units.py", os.path.basename(ingest_land_units.SOURCE_FILE)], "outputs": []},
+    {"name": "land_pages",     "run": stage_land_pages,     "after": ["land_units"],
+     "inputs": ["gen_land_pages.py", "gen_pair_pages.py", "site_common.py", "popularity.json",
+                gen_land_pages.REGISTRY_NAME, "js/hamburger.js", "js/search.js"],
+     "outputs": ["land"]},
+    {"name": "land_pair_pages", "run": stage_land_pair_pages, "after": ["land_units"],
+     "inputs": gen_land_pair_pages.TEMPLATE_FILES + ["popularity.json", gen_land_pages.REGISTRY_NAME],
+     "outputs": [f"land/{s['slug']}" for s in gen_land_pages.STATES]},
+    {"name": "land_matrix",    "run": stage_land_matrix,    "after": ["land_units"],
+     "inputs": ["gen_land_matrix.py", "gen_land_pages.py", "site_common.py", gen_land_pages.REGISTRY_NAME,
+                "js/hamburger.js", "js/search.js"],
+     "outputs": [gen_land_matrix.MATRIX_FILE, gen_land_matrix.COMPARE_PATH]},
+    {"name": "category_pages", "run": stage_category_pages, "after": [],
+     "inputs": ["gen_category_pages.py", "gen_pair_pages.py", "gen_js_modules.py", "js/converters.js",
+                "site_common.py", "popularity.json", "js/app.js", "js/search.js"],
+     "outputs": [f"{k}/index.html" for k in gen_category_pages.CATEGORIES]},
+    {"name": "js_modules",     "run": stage_js_modules,     "after": ["static"],
+     "inputs": ["gen_js_modules.py", "js/converters.js"],          "outputs": [gen_js_modules.OUT_DIR]},
+    {"name": "html_sitemap",   "run": stage_html_sitemap,   "after": [],
+     "inputs": ["gen_html_sitemap.py", "gen_category_pages.py"],   "outputs": ["sitemap.html"]},
+    {"name": "conv_links",     "run": stage_conv_links,     "after": ["static"],
+     "inputs": ["update_conv_links.py", "gen_pair_pages.py", "gen_js_modules.py", "js/converters.js",
+                "popularity.json", "site_common.py", "js/app.js", "js/hamburger.js", "js/search.js",
+                "js/date-calculator.js"],
+     "outputs": ["index.html"] + update_conv_links.STAMPED_PAGES},
+    {"name": "holidays",       "run": stage_holidays,       "after": ["static"],
+     "inputs": ["date_engine.py", "holiday-calendars.json"],      "outputs": [date_engine.HOLIDAYS_JS]},
+    {"name": "search_index",   "run": stage_search_index,   "after": ["land_units"],
+     "inputs": ["gen_search_index.py", "gen_pair_pages.py", "gen_land_pages.py", "popularity.json",
+                gen_land_pages.REGISTRY_NAME],
+     "outputs": [gen_search_index.INDEX_FILE]},
+    {"name": "precompress",    "run": stage_precompress,    "after": ["pair_pages", "search_index", "land_matrix", "holidays"],
+     "inputs": ["precompress.py"],                                 "outputs": [gen_search_index.INDEX_FILE + ".gz"]},
+    {"name": "service_worker", "run": stage_service_worker,
+     "after": ["static", "pair_pages", "land_pages", "land_pair_pages", "land_matrix", "category_pages",
+               "js_modules", "conv_links", "search_index"],
+     "inputs": ["gen_service_worker.py", "popularity.json"],       "outputs": [gen_service_worker.SW_FILE]},
+    {"name": "sitemap",        "run": stage_sitemap,
+     "after": ["static", "pair_pages", "land_pages", "land_pair_pages", "land_matrix", "category_pages",
+               "html_sitemap", "conv_links"],
+     "inputs": ["gen_sitemap.py", "popularity.json"],             "outputs": ["sitemap.xml"]},
+    # Opt-in: does nothing (beyond removing old value pages) without value-pages.json
+    {"name": "value_pages",    "run": stage_value_pages,    "after": ["static", "pair_pages", "sitemap"],
+     "inputs": ["gen_value_pages.py", "gen_pair_pages.py", "site_common.py", "value-pages.json",
+                "js/hamburger.js", "js/search.js"],
+     "outputs": ["robots.txt"]},
+]
+
+def hash_inputs(paths):
+    h = hashlib.sha1()
+    for rel in paths:
+        src = os.path.join(SRC_DIR, rel)
+        if os.path.isdir(src):
+            files = [os.path.join(src, f) for f in list_files(src) if "__pycache__" not in f]
+        else:
+            files = [src] if os.path.isfile(src) else []
+        for path in files:
+            h.update(os.path.relpath(path, SRC_DIR).encode())
+            with open(path, "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+def run_stage(func, out_dir, update_manifest):
+    """Worker entry point: run one stage, capturing its console output."""
+    buf = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(buf):
+        func(out_dir, update_manifest)
+    return time.perf_counter() - start, buf.getvalue()
+
+def cache_path(out_dir):
+    key = hashlib.sha1(out_dir.encode()).hexdigest()[:12]
+    return os.path.join(BUILD_DIR, "cache", f"stages-{key}.json")
+
+def build(out_dir=SRC_DIR, update_manifest=True, use_cache=True, jobs=None, verbose=False):
+    """Render the whole site into out_dir, running independent stages in parallel.
+
+    A stage is skipped when the fingerprint of its inputs (and of every stage
+    it runs after) matches the last successful build into the same out_dir and
+    its outputs still exist. Returns {stage name: (status, seconds)}.
+    """
+    out_dir = os.path.abspath(out_dir)
+    cache_file = cache_path(out_dir)
+    cache = {}
+    if use_cache and os.path.exists(cache_file):
+        with open(cache_file, encoding="utf-8") as f:
+            cache = json.load(f)
+
+    by_name = {s["name"]: s for s in STAGES}
+    fingerprints = {}
+    def fingerprint(name):
+        if name not in fingerprints:
+            stage = by_name[name]
+            deps = "".join(fingerprint(d) for d in stage["after"])
+            fingerprints[name] = hashlib.sha1((hash_inputs(stage["inputs"]) + deps).encode()).hexdigest()
+        return fingerprints[name]
+
+    pending = [s["name"] for s in STAGES]
+    done, results, running = set(), {}, {}
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            while pending or running:
+                for name in [n for n in pending if all(d in done for d in by_name[n]["after"])]:
+                    pending.remove(name)
+                    stage = by_name[name]
+                    outputs_exist = all(os.path.exists(os.path.join(out_dir, o)) for o in stage["outputs"])
+                    if use_cache and outputs_exist and cache.get(name) == fingerprint(name):
+                        done.add(name)
+                        results[name] = ("skipped", 0.0)
+                        continue
+                    running[pool.submit(run_stage, stage["run"], out_dir, update_manifest)] = name
+                if not running:
+                    if pending and not any(all(d in done for d in by_name[n]["after"]) for n in pending):
+                        raise RuntimeError(f"stages can never run: {pending}")
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    name = running.pop(fut)
+                    seconds, output = fut.result()
+                    if verbose and output:
+                        print(f"── {name} ──\n{output.rstrip()}")
+                    done.add(name)
+                    results[name] = ("ran", seconds)
+                    cache[name] = fingerprint(name)
+    finally:
+        if use_cache:
+            write_if_changed(cache_file, json.dumps(cache, indent=1, sort_keys=True) + "\n")
+    return results
+
+def print_summary(results, wall):
+    print(f"{'Stage':<16} {'Status':<8} {'Time':>8}")
+    for stage in STAGES:
+        status, seconds = results.get(stage["name"], ("-", 0.0))
+        print(f"{stage['name']:<16} {status:<8} {seconds:>7.2f}s")
+    busy = sum(seconds for _, seconds in results.values())
+    print(f"Total: {wall:.2f}s wall, {busy:.2f}s of stage time")
+
+# ── Staged releases ───────────────────────────────────────────────────────────
+
+# A release is refused unless these exist and are non-empty
+REQUIRED_FILES = [
+    "index.html", "css/style.css", "js/units/loader.js", "js/app.js",
+    "length/index.html", "temperature/index.html", "area/index.html",
+    "volume/index.html", "weight/index.html", "time/index.html",
+    "speed/index.html", "pressure/index.html", "energy/index.html",
+    "land/index.html", "sitemap.xml", "sitemap.html", "robots.txt", "ads.txt", ".htaccess", "sw.js",
+]
+
+def validate(out_dir):
+    """Return a list of problems that make out_dir unfit to publish."""
+    problems = []
+    for rel in REQUIRED_FILES:
+        path = os.path.join(out_dir, rel)
+        if not os.path.isfile(path) or os.path.getsize(path) == 0:
+            problems.append(f"missing or empty: {rel}")
+    for rel in list_files(out_dir):
+        if rel.endswith(".html"):
+            with open(os.path.join(out_dir, rel), "rb") as f:
+                data = f.read()
+            if data.lstrip()[:9].upper() == b"<!DOCTYPE" and not data.rstrip().endswith(b"</html>"):
+                problems.append(f"truncated page: {rel}")
+    return problems
+
+def link_identical(prev_dir, out_dir):
+    """Hard-link files that are byte-identical to the previous release.
+
+    Releases are never modified after publishing, so sharing inodes is safe;
+    it saves disk and keeps each unchanged file's mtime (and ETag).
+    """
+    linked = 0
+    for rel in list_files(out_dir):
+        old, new = os.path.join(prev_dir, rel), os.path.join(out_dir, rel)
+        if not os.path.isfile(old) or os.path.getsize(old) != os.path.getsize(new):
+            continue
+        with open(old, "rb") as fa, open(new, "rb") as fb:
+            if fa.read() != fb.read():
+                continue
+        tmp = new + ".lnk"
+        os.link(old, tmp)
+        os.replace(tmp, new)
+        linked += 1
+    return linked
+
+def list_releases(build_dir):
+    releases_dir = os.path.join(build_dir, "releases")
+    if not os.path.isdir(releases_dir):
+        return []
+    return sorted(os.listdir(releases_dir))
+
+def current_release(build_dir):
+    link = os.path.join(build_dir, "current")
+    if not os.path.islink(link):
+        return None
+    return os.path.basename(os.readlink(link))
+
+def publish(build_dir, name):
+    """Atomically point build_dir/current at releases/name."""
+    link = os.path.join(build_dir, "current")
+    tmp = link + ".tmp"
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    os.symlink(os.path.join("releases", name), tmp)
+    os.replace(tmp, link)
+
+def prune(build_dir, keep):
+    live = current_release(build_dir)
+    old = [r for r in list_releases(build_dir) if r != live]
+    for name in old[:max(0, len(old) - (keep - 1))]:
+        shutil.rmtree(os.path.join(build_dir, "releases", name))
+        print(f"Removed old release {name}")
+
+def release(build_dir=BUILD_DIR, keep=KEEP_RELEASES):
+    name = time.strftime("%Y%m%d-%H%M%S")
+    while name in list_releases(build_dir):
+        name += "_"
+    stage = os.path.join(build_dir, "releases", name)
+    prev = current_release(build_dir)
+
+    try:
+        start = time.perf_counter()
+        print_summary(build(stage, use_cache=False), time.perf_counter() - start)
+        problems = validate(stage)
+        if problems:
+            for p in problems:
+                print(f"  [FAIL] {p}")
+            raise RuntimeError(f"release {name} failed validation ({len(problems)} problems)")
+    except BaseException:
+        shutil.rmtree(stage, ignore_errors=True)
+        print(f"Build failed; live site left on release {prev}.")
+        raise
+
+    if prev:
+        linked = link_identical(os.path.join(build_dir, "releases", prev), stage)
+        print(f"{linked} unchanged files shared with release {prev}")
+    publish(build_dir, name)
+    print(f"Published release {name} -> {os.path.join(build_dir, 'current')}")
+    prune(build_dir, keep)
+
+def rollback(build_dir=BUILD_DIR):
+    releases = list_releases(build_dir)
+    live = current_release(build_dir)
+    if live not in releases or releases.index(live) == 0:
+        print("No earlier release to roll back to.")
+        return 1
+    target = releases[releases.index(live) - 1]
+    publish(build_dir, target)
+    print(f"Rolled back {live} -> {target}")
+    return 0
+
+# ── Reproducibility check ─────────────────────────────────────────────────────
+
+def list_files(base):
+    files = []
+    for root, dirs, names in os.walk(base):
+        dirs.sort()
+        for name in sorted(names):
+            files.append(os.path.relpath(os.path.join(root, name), base).replace("\\", "/"))
+    return files
+
+def diff_trees(a, b):
+    """Return a list of (path, reason) for every file that differs between two trees."""
+    files_a, files_b = set(list_files(a)), set(list_files(b))
+    diffs = [(p, "only in first build") for p in sorted(files_a - files_b)]
+    diffs += [(p, "only in second build") for p in sorted(files_b - files_a)]
+    for p in sorted(files_a & files_b):
+        with open(os.path.join(a, p), "rb") as fa, open(os.path.join(b, p), "rb") as fb:
+            if fa.read() != fb.read():
+                diffs.append((p, "content differs"))
+    return diffs
+
+def check():
+    # Pin the build date so a run across midnight doesn't show up as a diff
+    os.environ.setdefault("SOURCE_DATE_EPOCH", str(int(time.time())))
+    with tempfile.TemporaryDirectory() as a, tempfile.TemporaryDirectory() as b:
+        for out_dir in (a, b):
+            with contextlib.redirect_stdout(io.StringIO()):
+                build(out_dir, update_manifest=False, use_cache=False)
+        total = len(list_files(a))
+        diffs = diff_trees(a, b)
+
+    if diffs:
+        print(f"Build is NOT reproducible: {len(diffs)} of {total} files differ")
+        for path, reason in diffs:
+            print(f"  [DIFF] {path} ({reason})")
+        return 1
+    print(f"Build is reproducible: {total} files byte-identical across two builds.")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Build SwapUnits.online")
+    parser.add_argument("--out", default=SRC_DIR, help="output directory (default: build in place)")
+    parser.add_argument("--check", action="store_true", help="build twice into temp dirs and diff byte for byte")
+    parser.add_argument("--release", action="store_true", help="staged build, validate, then atomically publish")
+    parser.add_argument("--rollback", action="store_true", help="re-publish the release before the current one")
+    parser.add_argument("--build-dir", default=BUILD_DIR, help="where releases and the current symlink live")
+    parser.add_argument("--keep", type=int, default=KEEP_RELEASES, help="number of releases to keep")
+    parser.add_argument("--force", action="store_true", help="run every stage even if its inputs are unchanged")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--verbose", action="store_true", help="print each stage's own output")
+    parser.add_argument("--watch", action="store_true", help="keep running and re-render pages affected by each edit")
+    args = parser.parse_args()
+
+    if args.check:
+        return check()
+    if args.release:
+        release(os.path.abspath(args.build_dir), args.keep)
+        return 0
+    if args.rollback:
+        return rollback(os.path.abspath(args.build_dir))
+    if args.watch:
+        import watch
+        try:
+            watch.watch(args.out)
+        except KeyboardInterrupt:
+            pass
+        return 0
+    start = time.perf_counter()
+    results = build(args.out, use_cache=not args.force, jobs=args.jobs, verbose=args.verbose)
+    print_summary(results, time.perf_counter() - start)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
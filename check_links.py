@@ -0,0 +1,153 @@
+"""
+check_links.py
+Checks that every internal link in the site resolves. The output tree is
+indexed into an in-memory set of paths once; each page's href/src values are
+then resolved against that set in parallel, so a full check is a few set
+lookups per link instead of a crawl. Broken links are reported grouped by the
+template that produced the page, along with any .htaccess ErrorDocument that
+points at a missing file.
+
+Usage:
+  python check_links.py              # check this directory
+  python check_links.py --base DIR   # check a build output (e.g. .build/current)
+"""
+
+import os, re, sys, time, argparse, posixpath
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+from concurrent.futures import ProcessPoolExecutor
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+SITE_HOST = "www.swapunits.online"
+SKIP_SCHEMES = ("mailto:", "tel:", "javascript:", "data:")
+
+# ── URL index ─────────────────────────────────────────────────────────────────
+
+def build_index(base):
+    """Set of every servable path under base, relative and '/'-separated."""
+    index = set()
+    for root, dirs, files in os.walk(base):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and "__" not in d]
+        rel_root = os.path.relpath(root, base).replace("\\", "/")
+        for name in files:
+            index.add(name if rel_root == "." else f"{rel_root}/{name}")
+    return index
+
+def resolves(index, path):
+    """True if a site path (no leading '/') is served: the file, or a directory's index.html."""
+    path = path.rstrip("/")
+    if path in ("", "."):
+        return "index.html" in index
+    # .htaccess rewrites /length to /length/index.html, so both forms are fine
+    return path in index or f"{path}/index.html" in index
+
+def template_of(rel):
+    """Name of the generator/template a page came from, used to group results."""
+    parts = rel.split("/")
+    if rel == "sitemap.html":
+        return "gen_html_sitemap.py"
+    if len(parts) == 1 or parts[0] == "neet_jee":
+        return f"hand-written {rel}"
+    if parts[0] == "land":
+        if parts[1] == "compare":
+            return "gen_land_matrix.py"
+        if len(parts) == 4:
+            return "gen_land_pair_pages.py"
+        return "gen_land_pages.py (hub)" if len(parts) == 2 else "gen_land_pages.py (state)"
+    if len(parts) == 4:
+        return "gen_value_pages.py"
+    return "gen_category_pages.py" if len(parts) == 2 else "gen_pair_pages.py"
+
+# ── Page scan ─────────────────────────────────────────────────────────────────
+
+class LinkCollector(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if name in ("href", "src") and value is not None:
+                self.links.append(value)
+
+_index = None
+
+def init_worker(index):
+    global _index
+    _index = index
+
+def check_page(args):
+    """Worker: return (page, [broken hrefs]) for one page."""
+    base, rel = args
+    p = LinkCollector()
+    with open(os.path.join(base, rel), encoding="utf-8") as f:
+        p.feed(f.read())
+    page_dir = posixpath.dirname(rel)
+    broken = []
+    for href in p.links:
+        href = href.strip()
+        if not href or href.startswith("#") or href.lower().startswith(SKIP_SCHEMES):
+            continue
+        parts = urlsplit(href)
+        if parts.scheme or parts.netloc:
+            if parts.netloc != SITE_HOST:
+                continue  # external link
+            target = parts.path.lstrip("/")
+        elif parts.path.startswith("/"):
+            target = parts.path.lstrip("/")
+        else:
+            target = posixpath.normpath(posixpath.join(page_dir, parts.path))
+            if parts.path.endswith("/"):
+                target += "/"
+        if target.startswith("..") or not resolves(_index, target):
+            broken.append(href)
+    return rel, broken
+
+def check_error_documents(base, index):
+    """[(status, target)] for ErrorDocument lines in .htaccess whose file is missing."""
+    path = os.path.join(base, ".htaccess")
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        docs = re.findall(r"^\s*ErrorDocument\s+(\d{3})\s+(/\S*)", f.read(), re.M)
+    return [(status, target) for status, target in docs if not resolves(index, target.lstrip("/"))]
+
+def check(base=BASE, jobs=None):
+    """Check every page under base. Returns the number of broken links found."""
+    base = os.path.abspath(base)
+    start = time.perf_counter()
+    index = build_index(base)
+    pages = sorted(p for p in index if p.endswith(".html"))
+
+    groups = {}  # template -> {href: [pages]}
+    links_broken = 0
+    with ProcessPoolExecutor(jobs, initializer=init_worker, initargs=(index,)) as pool:
+        chunksize = max(1, len(pages) // ((jobs or os.cpu_count() or 1) * 4))
+        for rel, broken in pool.map(check_page, [(base, rel) for rel in pages], chunksize=chunksize):
+            for href in broken:
+                groups.setdefault(template_of(rel), {}).setdefault(href, []).append(rel)
+                links_broken += 1
+
+    for template, hrefs in sorted(groups.items()):
+        pages_hit = len({p for ps in hrefs.values() for p in ps})
+        print(f"\n[{template}] {sum(map(len, hrefs.values()))} broken links on {pages_hit} pages")
+        for href, srcs in sorted(hrefs.items(), key=lambda kv: -len(kv[1])):
+            print(f"  {href}  ({len(srcs)}x, e.g. {srcs[0]})")
+
+    bad_docs = check_error_documents(base, index)
+    for status, target in bad_docs:
+        print(f"\n[.htaccess] ErrorDocument {status} points at missing {target}")
+
+    print(f"\nChecked {len(pages)} pages against {len(index)} paths in {time.perf_counter() - start:.2f}s: "
+          f"{links_broken} broken links, {len(bad_docs)} broken ErrorDocuments.")
+    return links_broken + len(bad_docs)
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that every internal link resolves")
+    parser.add_argument("--base", default=BASE, help="site root to check (default: this directory)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+    return 1 if check(args.base, args.jobs) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+date_engine.py
+Business-day and date-difference arithmetic for the Date Calculator, the same
+engine js/date-calculator.js runs in the browser, for batch and server use.
+
+Dates are day numbers (days since 1970-01-01), so every span is a subtraction.
+Business days in [a, b) are counted without walking the range:
+
+  whole weeks * workdays per week
+  + REMAINDER[weekday of a][span % 7]       the leftover 0-6 days, from a table
+  - holidays in [a, b)                      two bisects over the sorted list
+
+so any span costs the same few operations plus log(holidays).
+
+Holiday calendars are hand-edited in holiday-calendars.json: fixed-date
+holidays ("MM-DD", optionally with the year they "since" apply), one-off
+"dates" ("YYYY-MM-DD"), a "weekend" (Mon = 0) and "extends" to build a
+regional calendar on top of the national one. The build compiles them into
+js/holidays.json: for each calendar, the sorted day numbers of every holiday
+from FIRST_YEAR to LAST_YEAR that falls on a workday.
+
+Usage:
+  python date_engine.py                                   # compile js/holidays.json
+  python date_engine.py 2024-01-01 2074-01-01 --calendar in-national --include-end
+"""
+
+import os, json, argparse
+from bisect import bisect_left
+from datetime import date
+
+from site_common import write_if_changed
+
+BASE = os.getcwd()
+CALENDARS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "holiday-calendars.json")
+HOLIDAYS_JS = os.path.join("js", "holidays.json")
+
+FIRST_YEAR, LAST_YEAR = 1900, 2100
+DEFAULT_WEEKEND = (5, 6)  # Saturday, Sunday
+EPOCH = date(1970, 1, 1).toordinal()
+
+# ── Day numbers ───────────────────────────────────────────────────────────────
+
+def day_number(d):
+    """Days since 1970-01-01."""
+    return d.toordinal() - EPOCH
+
+def weekday(n):
+    """Weekday of day number n, Monday = 0 (1970-01-01 was a Thursday)."""
+    return (n + 3) % 7
+
+def remainder_table(weekend=DEFAULT_WEEKEND):
+    """table[w][r]: workdays among the r days starting on weekday w, for r in 0..6."""
+    table = []
+    for w in range(7):
+        row = [0]
+        for r in range(1, 7):
+            row.append(row[-1] + ((w + r - 1) % 7 not in weekend))
+        table.append(row)
+    return table
+
+# ── Holiday calendars ─────────────────────────────────────────────────────────
+
+def load_calendars(path=CALENDARS_FILE):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def holiday_dates(calendars, cal_id, first=FIRST_YEAR, last=LAST_YEAR):
+    """Every holiday of a calendar (and the calendars it extends) between first and last."""
+    cal = calendars[cal_id]
+    days = holiday_dates(calendars, cal["extends"], first, last) if "extends" in cal else set()
+    for holiday in cal.get("fixed", []):
+        month, day = map(int, holiday["date"].split("-"))
+        for year in range(max(first, holiday.get("since", first)), last + 1):
+            days.add(date(year, month, day))
+    for text in cal.get("dates", []):
+        d = date.fromisoformat(text)
+        if first <= d.year <= last:
+            days.add(d)
+    return days
+
+def calendar_weekend(calendars, cal_id):
+    cal = calendars[cal_id]
+    if "weekend" in cal:
+        return tuple(cal["weekend"])
+    return calendar_weekend(calendars, cal["extends"]) if "extends" in cal else DEFAULT_WEEKEND
+
+def compile_calendar(calendars, cal_id):
+    """{"id", "name", "weekend", "days"}: days are the sorted day numbers of holidays on workdays.
+    A holiday that falls on a weekend doesn't change any count, so it is left out."""
+    weekend = calendar_weekend(calendars, cal_id)
+    days = sorted(n for n in map(day_number, holiday_dates(calendars, cal_id)) if weekday(n) not in weekend)
+    return {"id": cal_id, "name": calendars[cal_id]["name"], "weekend": list(weekend), "days": days}
+
+def compile_all(calendars=None):
+    calendars = calendars if calendars is not None else load_calendars()
+    return {
+        "years": [FIRST_YEAR, LAST_YEAR],
+        "calendars": [compile_calendar(calendars, cal_id) for cal_id in calendars],
+    }
+
+# ── Counting ──────────────────────────────────────────────────────────────────
+
+def business_days(start, end, calendar=None, include_end=False):
+    """Workdays from start up to end (dates, either order), end itself only with include_end.
+    calendar is a compile_calendar() result; without one only weekends are skipped.
+    Returns (workdays, holidays skipped)."""
+    a, b = sorted((day_number(start), day_number(end)))
+    b += include_end
+    weekend = calendar["weekend"] if calendar else DEFAULT_WEEKEND
+    weeks, rest = divmod(b - a, 7)
+    count = weeks * (7 - len(weekend)) + remainder_table(weekend)[weekday(a)][rest]
+    holidays = bisect_left(calendar["days"], b) - bisect_left(calendar["days"], a) if calendar else 0
+    return count - holidays, holidays
+
+def duration(start, end, include_end=False):
+    """(total days, years, months, days) between two dates, as the Duration tab shows them."""
+    d1, d2 = sorted((start, end))
+    total = day_number(d2) - day_number(d1) + include_end
+    if include_end:
+        d2 = date.fromordinal(d2.toordinal() + 1)
+    years, months, days = d2.year - d1.year, d2.month - d1.month, d2.day - d1.day
+    if days < 0:
+        months -= 1
+        days += date.fromordinal(date(d2.year, d2.month, 1).toordinal() - 1).day  # length of the month before d2
+    if months < 0:
+        years -= 1
+        months += 12
+    return total, years, months, days
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main(base=BASE):
+    data = compile_all()
+    text = json.dumps(data, separators=(",", ":")) + "\n"
+    write_if_changed(os.path.join(base, HOLIDAYS_JS), text)
+    counts = ", ".join(f"{c['id']} {len(c['days'])}" for c in data["calendars"])
+    print(f"Wrote {HOLIDAYS_JS.replace(os.sep, '/')}: {FIRST_YEAR}-{LAST_YEAR} workday holidays ({counts}), "
+          f"{len(text):,} bytes")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile holiday calendars, or count business days")
+    parser.add_argument("start", nargs="?", type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument("end", nargs="?", type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument("--calendar", help="holiday calendar id from holiday-calendars.json (default: weekends only)")
+    parser.add_argument("--include-end", action="store_true", help="count the end date too")
+    parser.add_argument("--out", default=BASE, help="site directory to write js/holidays.json into")
+    args = parser.parse_args()
+    if args.start is None:
+        main(args.out)
+    else:
+        if args.end is None:
+            parser.error("an end date is needed with a start date")
+        calendar = compile_calendar(load_calendars(), args.calendar) if args.calendar else None
+        total, years, months, days = duration(args.start, args.end, args.include_end)
+        workdays, holidays = business_days(args.start, args.end, calendar, args.include_end)
+        print(f"{total:,} days ({years} years, {months} months, {days} days)")
+        print(f"{workdays:,} workdays" + (f" ({holidays} {calendar['name']} holidays skipped)" if calendar else ""))
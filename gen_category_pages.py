@@ -4,6 +4,9 @@ Generates the main category pages (e.g., /length/, /temperature/) with corrected
 """
 
 import os
+from site_common import write_if_changed, ADSENSE_PUB_ID, resource_hints, gtag_head, adsense_head, report_blocking, speculation_rules, versioned
+import gen_pair_pages
+import gen_js_modules
 
 BASE = r"C:\Users\Administrator\Documents\AntiGravity\Units"
 # Adjust BASE if running on linux environment to current directory or relative path
@@ -11,7 +14,6 @@ BASE = r"C:\Users\Administrator\Documents\AntiGravity\Units"
 if os.name == 'posix':
     BASE = os.getcwd()
 
-ADSENSE_PUB_ID = "ca-pub-2662293899276634"
 
 CATEGORIES = {
     "length": { "name": "Length", "icon": "📏", "desc": "Convert between meters, feet, miles, and more.", "keywords": "length converter, meter to foot, mile to km" },
@@ -40,7 +42,6 @@ NAV_CATS = [
 ]
 
 
-ADSENSE_PUB_ID = "ca-pub-2662293899276634"
 
 def make_nav_links(active_key):
     links = ""
@@ -66,6 +67,65 @@ def make_sidebar_links(active_key):
             links += f'<a href="/{k}/" class="sidebar-link{active}">{label} Converter</a>\n          '
     return links
 
+# ── Pre-rendered converter ───────────────────────────────────────────────────
+# The same markup app.js builds, with the default "1 {first unit}" result and
+# the quick reference filled in, so the page paints complete and app.js only
+# attaches its event handlers. Numbers come from gen_js_modules' Python mirror
+# of converters.js, so they match what the browser computes.
+
+def render_tabs(cat_key, js_cats):
+    return "\n          ".join(
+        f'<button class="cat-tab{" active" if key == cat_key else ""}" data-category="{key}" '
+        f'aria-label="{cat["name"]} converter">{cat["name"]}</button>'
+        for key, cat in js_cats.items())
+
+def render_options(units, selected):
+    return "\n            ".join(
+        f'<option value="{uid}"{" selected" if uid == selected else ""}>{label}</option>'
+        for uid, label, _ in units)
+
+def render_converter(cat):
+    units = cat["units"]
+    from_id, from_label = units[0][:2]
+    to_id = units[1][0] if len(units) > 1 else from_id
+    result = gen_js_modules.format_result(gen_js_modules.convert(cat, 1, from_id, to_id))
+    to_value = "" if result == "\u2014" else result
+    return f"""
+      <div class="converter-grid">
+        <div class="converter-field">
+          <label for="from-value">From</label>
+          <input type="number" id="from-value" placeholder="Enter value" value="1" autocomplete="off" />
+          <select id="from-unit" size="8" aria-label="From unit">
+            {render_options(units, from_id)}
+          </select>
+        </div>
+        <div style="display:flex;flex-direction:column;align-items:center;justify-content:center;">
+          <button class="swap-btn" id="swap-btn" title="Swap units" aria-label="Swap from and to units">⇄</button>
+        </div>
+        <div class="converter-field">
+          <label for="to-value">To</label>
+          <input type="text" id="to-value" placeholder="Result" readonly tabindex="-1" value="{to_value}" />
+          <select id="to-unit" size="8" aria-label="To unit">
+            {render_options(units, to_id)}
+          </select>
+        </div>
+      </div>
+      <div class="result-display" id="result-display">
+        <div>
+          <div class="result-text" id="result-label">1 {from_label} =</div>
+          <div class="result-value" id="result-value">{result}</div>
+        </div>
+        <button class="copy-btn" id="copy-btn" aria-label="Copy result">📋 Copy</button>
+      </div>
+    """
+
+def render_quick_ref(cat):
+    base_id, base_label, _ = cat["units"][0]
+    return "\n          ".join(
+        f'<tr><td>1 {base_label}</td>'
+        f'<td>{gen_js_modules.format_result(gen_js_modules.convert(cat, 1, base_id, uid))} {label}</td></tr>'
+        for uid, label, _ in cat["units"][1:9])
+
 def get_template(cat_key, cat_data):
     name = cat_data["name"]
     icon = cat_data["icon"]
@@ -74,6 +134,15 @@ def get_template(cat_key, cat_data):
     
     nav_html = make_nav_links(cat_key)
     sidebar_html = make_sidebar_links(cat_key)
+
+    # Content hash of js/units/loader.js, so browsers pick up regenerated tables
+    loader_version = gen_js_modules.loader_version()
+    js_cats = gen_js_modules.load_categories()
+
+    # Prefetch the category's most popular pair pages
+    slugs = gen_pair_pages.SLUG_MAP
+    prefetch = speculation_rules([f"{slugs[(cat_key, a)]}-to-{slugs[(cat_key, b)]}/"
+                                  for a, b in gen_pair_pages.RANKED_PAIRS[cat_key][0]])
     
     return f"""<!DOCTYPE html>
 <html lang="en">
@@ -81,15 +150,8 @@ def get_template(cat_key, cat_data):
   <meta charset="UTF-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1.0" />
   
-  <!-- Google tag (gtag.js) -->
-  <script async src="https://www.googletagmanager.com/gtag/js?id=G-TSFVXECJ40"></script>
-  <script>
-    window.dataLayer = window.dataLayer || [];
-    function gtag(){{dataLayer.push(arguments);}}
-    gtag('js', new Date());
-
-    gtag('config', 'G-TSFVXECJ40');
-  </script>
+  {resource_hints()}
+  {gtag_head()}
 
   <title id="page-title">{name} Converter &mdash; Free Online {name} Unit Conversion | SwapUnits.online</title>
   <meta name="description" content="{desc} Free, fast, and accurate." />
@@ -119,8 +181,11 @@ def get_template(cat_key, cat_data):
   </script>
   <link rel="icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>&#x2696;</text></svg>" />
   <link rel="stylesheet" href="../css/style.css" />
-  <!-- Google AdSense -->
-  <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client={ADSENSE_PUB_ID}" crossorigin="anonymous"></script>
+  {prefetch}
+  <script src="../js/units/loader.js?v={loader_version}" defer></script>
+  <script src="../{versioned('js/app.js')}" defer></script>
+  <script src="../{versioned('js/search.js')}" defer></script>
+  {adsense_head()}
 </head>
 <body data-category="{cat_key}">
 
@@ -160,10 +225,12 @@ def get_template(cat_key, cat_data):
         <div class="converter-card-header">
           <h1 id="converter-title" itemprop="name">{icon} {name} Converter</h1>
         </div>
-        <div class="category-tabs" id="category-tabs" role="tablist" aria-label="Unit categories"></div>
+        <div class="category-tabs" id="category-tabs" role="tablist" aria-label="Unit categories">
+          {render_tabs(cat_key, js_cats)}
+        </div>
         <div class="pair-page-body">
           <p class="pair-intro">{desc}</p>
-          <div id="converter-body" role="tabpanel"></div>
+          <div id="converter-body" role="tabpanel" data-prerendered="{cat_key}">{render_converter(js_cats[cat_key])}</div>
         </div>
       </article>
 
@@ -182,7 +249,9 @@ def get_template(cat_key, cat_data):
         <div class="quick-ref-header" id="quick-ref-title">Quick Reference &mdash; {name}</div>
         <table>
           <thead><tr><th scope="col">From</th><th scope="col">To</th></tr></thead>
-          <tbody id="quick-ref-body"></tbody>
+          <tbody id="quick-ref-body">
+          {render_quick_ref(js_cats[cat_key])}
+          </tbody>
         </table>
       </section>
 
@@ -204,7 +273,7 @@ def get_template(cat_key, cat_data):
       </div>
       <div aria-label="Advertisement">
         <!-- Sidebar Ad -->
-        <ins class="adsbygoogle"
+        <ins class="adsbygoogle ad-slot-sidebar"
              style="display:block"
              data-ad-client="{ADSENSE_PUB_ID}"
              data-ad-slot="1122334455"
@@ -274,25 +343,19 @@ def get_template(cat_key, cat_data):
     </div>
   </footer>
 
-  <script src="../js/converters.js?v=2"></script>
-  <script src="../js/app.js?v=2"></script>
 </body>
 </html>"""
 
-def main():
+def main(base=BASE):
     for cat_key, cat_data in CATEGORIES.items():
         print(f"Generating {cat_key}...")
         html = get_template(cat_key, cat_data)
         
-        # Create dir if not exists (should exist)
-        cat_dir = os.path.join(BASE, cat_key)
-        os.makedirs(cat_dir, exist_ok=True)
-        
-        out_file = os.path.join(cat_dir, "index.html")
-        with open(out_file, "w", encoding="utf-8") as f:
-            f.write(html)
+        out_file = os.path.join(base, cat_key, "index.html")
+        write_if_changed(out_file, html)
             
     print("All category pages generated.")
+    report_blocking("category", html)
 
 if __name__ == "__main__":
     main()
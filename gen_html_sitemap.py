@@ -6,9 +6,9 @@ Generates a visual sitemap page (sitemap.html) similar to unitconverters.net/sit
 
 import os
 from gen_category_pages import NAV_CATS
+from site_common import write_if_changed
 
 BASE = os.getcwd()
-OUT_FILE = os.path.join(BASE, "sitemap.html")
 
 # Define Categories Groups
 GROUPS = {
@@ -35,7 +35,7 @@ def get_group_html():
         html += f'</div>\n'
     return html
 
-def main():
+def main(base=BASE):
     sitemap_grid = get_group_html()
     
     html = f"""<!DOCTYPE html>
@@ -184,10 +184,10 @@ def main():
 </body>
 </html>"""
 
-    with open(OUT_FILE, "w", encoding="utf-8") as f:
-        f.write(html)
+    out_file = os.path.join(base, "sitemap.html")
+    write_if_changed(out_file, html)
     
-    print(f"Generated {OUT_FILE}")
+    print(f"Generated {out_file}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,226 @@
+"""
+gen_js_modules.py
+Splits js/converters.js into one small ES module per category plus a loader,
+so a converter page only downloads and parses the unit table it shows:
+
+  js/units/{category}.js   export default { name, icon, units[, convert] }
+  js/units/loader.js       category names/icons, formatResult, indexCategory,
+                           and UnitLoader.load(key) / UnitLoader.prefetch(key)
+
+js/converters.js stays the one hand-edited source of the conversion tables;
+these files are regenerated from it by build.py. Every category module is
+imported with a short content hash (?v=...) so an edited table is never
+served from a stale browser cache.
+
+load_categories(), convert() and format_result() mirror the same tables and
+math in Python, so gen_category_pages.py can pre-render a converter whose
+numbers match what the browser would compute.
+"""
+
+import os, re, json, math, hashlib
+from decimal import Decimal
+
+from site_common import write_if_changed
+
+BASE = os.getcwd()
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js", "converters.js")
+OUT_DIR = os.path.join("js", "units")
+
+# "  length: {" ... "  },": one top-level entry of the CONVERTERS object
+CATEGORY_RE = re.compile(r"^  (\w+): \{\n(.*?)^  \},?\n", re.M | re.S)
+# Top-level helpers of converters.js that the loader carries too
+LOADER_HELPERS = ["indexCategory", "formatResult"]
+META_RE = re.compile(r"^  (name|icon): '([^']*)',", re.M)
+UNIT_RE = re.compile(r"\{ id: '([^']*)', label: '([^']*)'(?:, factor: ([^ }]+))? \}")
+
+# ── Source parsing ────────────────────────────────────────────────────────────
+
+def read_source(path=SOURCE):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def split_categories(source):
+    """[(key, body)] for each category in CONVERTERS, body dedented to module level."""
+    table = source[source.index("const CONVERTERS = {"):source.index("\n};\n") + 1]
+    cats = []
+    for key, body in CATEGORY_RE.findall(table):
+        lines = [line[2:] if line.startswith("  ") else line for line in body.splitlines()]
+        cats.append((key, "\n".join(lines)))
+    if not cats:
+        raise ValueError(f"no categories found in {SOURCE}")
+    return cats
+
+def function_source(source, name):
+    """Source of a top-level `function name(...) {...}` in converters.js."""
+    m = re.search(rf"^function {name}\(.*?^\}}\n", source, re.M | re.S)
+    if not m:
+        raise ValueError(f"function {name} not found in {SOURCE}")
+    return m.group(0)
+
+def short_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:8]
+
+# ── Python mirror of converters.js ────────────────────────────────────────────
+
+def load_categories(source=None):
+    """{key: {"name", "icon", "units": [(id, label, factor or None)]}} in CONVERTERS order."""
+    cats = {}
+    for key, body in split_categories(source if source is not None else read_source()):
+        fields = dict(META_RE.findall(body))
+        units = [(uid, label, float(factor) if factor else None) for uid, label, factor in UNIT_RE.findall(body)]
+        cats[key] = {"name": fields.get("name", key), "icon": fields.get("icon", ""), "units": units}
+    return cats
+
+def convert(cat, value, from_id, to_id):
+    """cat.convert(value, from, to) for a category from load_categories()."""
+    factors = {uid: factor for uid, _, factor in cat["units"]}
+    if from_id not in factors or to_id not in factors:
+        return float("nan")
+    if factors[from_id] is None:  # temperature: offsets, not factors
+        return temp_convert(value, from_id, to_id)
+    return value * (factors[from_id] / factors[to_id])  # memoized multiplier, as in indexCategory
+
+def temp_convert(value, from_id, to_id):
+    if from_id == "celsius":      c = value
+    elif from_id == "fahrenheit": c = (value - 32) * 5 / 9
+    elif from_id == "kelvin":     c = value - 273.15
+    elif from_id == "rankine":    c = (value - 491.67) * 5 / 9
+    elif from_id == "reaumur":    c = value * 5 / 4
+    else: return float("nan")
+    if to_id == "celsius":      return c
+    elif to_id == "fahrenheit": return c * 9 / 5 + 32
+    elif to_id == "kelvin":     return c + 273.15
+    elif to_id == "rankine":    return (c + 273.15) * 9 / 5
+    elif to_id == "reaumur":    return c * 4 / 5
+    return float("nan")
+
+def js_number(x):
+    """Number.prototype.toString() for a finite float: shortest digits, JS exponent rules."""
+    if x == 0:
+        return "0"
+    sign = "-" if x < 0 else ""
+    _, digits, exp = Decimal(repr(abs(x))).normalize().as_tuple()
+    d = "".join(map(str, digits))
+    k, n = len(d), exp + len(d)  # value = 0.d * 10**n
+    if k <= n <= 21:
+        return sign + d + "0" * (n - k)
+    if 0 < n <= 21:
+        return sign + d[:n] + "." + d[n:]
+    if -6 < n <= 0:
+        return sign + "0." + "0" * -n + d
+    e = f"{'+' if n - 1 >= 0 else '-'}{abs(n - 1)}"
+    return sign + (d if k == 1 else d[0] + "." + d[1:]) + "e" + e
+
+def format_result(num):
+    """formatResult(num) from converters.js."""
+    if math.isnan(num) or math.isinf(num):
+        return "\u2014"
+    if num == 0:
+        return "0"
+    rounded = float(f"{num:.9e}")  # toPrecision(10)
+    abs_r = abs(rounded)
+    if 0 < abs_r <= 0.000001:
+        decimals = max(0, min(20, -math.floor(math.log10(abs_r)) + 5))
+        return re.sub(r"\.?0+$", "", f"{rounded:.{decimals}f}")
+    if abs_r >= 1:
+        if rounded == round(rounded):
+            return js_number(rounded)
+        dec = max(0, 9 - math.floor(math.log10(abs_r)))
+        return js_number(float(f"{rounded:.{dec}f}"))
+    return js_number(float(f"{rounded:.9e}"))
+
+# ── Rendering ─────────────────────────────────────────────────────────────────
+
+def render_category(key, body):
+    return (f"// units/{key}.js — generated by gen_js_modules.py from js/converters.js. Do not edit.\n"
+            f"export default {{\n{body}\n}};\n")
+
+def render_loader(source, modules):
+    """The classic-script loader. modules is {key: module source}."""
+    meta = {}
+    for key, body in split_categories(source):
+        fields = dict(META_RE.findall(body))
+        meta[key] = {"name": fields.get("name", key), "icon": fields.get("icon", ""),
+                     "v": short_hash(modules[key])}
+    cats = ",\n".join(f"    {json.dumps(k)}: {json.dumps(v, ensure_ascii=False)}" for k, v in meta.items())
+    helpers = "\n".join("  " + line if line else line
+                        for name in LOADER_HELPERS for line in (function_source(source, name) + "\n").splitlines())
+    return f"""/**
+ * units/loader.js — generated by gen_js_modules.py from js/converters.js. Do not edit.
+ * Category names and icons up front; each category's unit table is an ES
+ * module fetched on first use (UnitLoader.load) or ahead of time (prefetch).
+ */
+
+(function () {{
+  'use strict';
+
+  const CATEGORIES = {{
+{cats}
+  }};
+
+  const BASE = new URL('.', document.currentScript.src);
+  const loaded = {{}};
+
+  function moduleUrl(key) {{
+    return new URL(`${{key}}.js?v=${{CATEGORIES[key].v}}`, BASE).href;
+  }}
+
+  // Resolves to the indexed category object ({{ name, icon, units, unitById, convert }})
+  function load(key) {{
+    if (!CATEGORIES[key]) return Promise.reject(new Error('unknown category ' + key));
+    if (!loaded[key]) loaded[key] = import(moduleUrl(key)).then(m => indexCategory(m.default));
+    return loaded[key];
+  }}
+
+  // Fetch and compile a category in the background without running it
+  function prefetch(key) {{
+    if (!CATEGORIES[key] || loaded[key]) return;
+    const href = moduleUrl(key);
+    if (document.querySelector(`link[rel="modulepreload"][href="${{href}}"]`)) return;
+    const link = document.createElement('link');
+    link.rel = 'modulepreload';
+    link.href = href;
+    document.head.appendChild(link);
+  }}
+
+{helpers}
+  window.UnitLoader = {{ categories: CATEGORIES, load, prefetch, formatResult }};
+}})();
+"""
+
+def render_all(source):
+    """{path relative to the site root: file content} for every generated module."""
+    modules = {key: render_category(key, body) for key, body in split_categories(source)}
+    files = {os.path.join(OUT_DIR, f"{key}.js"): text for key, text in modules.items()}
+    files[os.path.join(OUT_DIR, "loader.js")] = render_loader(source, modules)
+    return files
+
+def loader_version(source=None):
+    """Content hash of loader.js, for the ?v= on the pages that include it."""
+    files = render_all(source if source is not None else read_source())
+    return short_hash(files[os.path.join(OUT_DIR, "loader.js")])
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main(base=BASE):
+    source = read_source()
+    files = render_all(source)
+    written = sum(write_if_changed(os.path.join(base, rel), text) for rel, text in files.items())
+
+    out_dir = os.path.join(base, OUT_DIR)
+    stale = {n for n in os.listdir(out_dir) if n.endswith(".js")} - {os.path.basename(rel) for rel in files}
+    for name in sorted(stale):
+        os.remove(os.path.join(out_dir, name))
+
+    full = len(source.encode("utf-8"))
+    sizes = {os.path.basename(rel): len(text.encode("utf-8")) for rel, text in files.items()}
+    loader = sizes.pop("loader.js")
+    print(f"Wrote {written} of {len(files)} modules to {OUT_DIR}/ "
+          f"({len(stale)} stale removed)")
+    print(f"  converters.js: {full:,} bytes; loader.js: {loader:,} bytes; "
+          f"category modules: {min(sizes.values()):,}-{max(sizes.values()):,} bytes")
+    print(f"  a category page now parses {loader + max(sizes.values()):,} bytes at most "
+          f"({(loader + max(sizes.values())) / full:.0%} of converters.js)")
+
+if __name__ == "__main__":
+    main()
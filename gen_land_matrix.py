@@ -0,0 +1,352 @@
+"""
+gen_land_matrix.py
+Generates the cross-state land unit comparison:
+  /land/compare/matrix.json   every land unit of every state against every other
+  /land/compare/index.html    a converter from any state's unit to any other state's
+
+The matrix is built once from STATES (gen_land_pages.py). Units that are the
+same in several states (Acre, or the 14,400 sq ft Bigha of West Bengal and
+Assam) share one row, so matrix.json stays small:
+
+  {
+    "n": 37,
+    "units":  [[label, symbol, sq ft], ...],
+    "states": [[slug, name, [unit index, ...]], ...],
+    "matrix": [...]
+  }
+
+matrix[i * n + j] is how many of unit j make one unit i, rounded to
+SIG_DIGITS significant digits. Converting v of unit i is v * matrix[i * n + j]:
+one array read, whichever states the two units come from. The page fetches
+the same file other sites can use; .htaccess serves it precompressed and
+with CORS open.
+"""
+
+import os, json, re
+
+from gen_land_pages import STATES, fmt, make_nav_links, make_sidebar_links
+from site_common import (write_if_changed, ADSENSE_PUB_ID, resource_hints, gtag_head, adsense_head,
+                         speculation_rules, report_blocking, versioned)
+
+BASE = os.getcwd()
+MATRIX_FILE = os.path.join("land", "compare", "matrix.json")
+COMPARE_PATH = os.path.join("land", "compare", "index.html")
+SIG_DIGITS = 10
+
+# ── Matrix ────────────────────────────────────────────────────────────────────
+
+def round_sig(x):
+    x = float(f"{x:.{SIG_DIGITS}g}")
+    return int(x) if x.is_integer() else x
+
+def build_matrix(states=None):
+    """The matrix.json content for states (default: STATES)."""
+    units, index, members = [], {}, []
+    for state in states or STATES:
+        ids = []
+        for uid, label, sym, sqft, note in state["units"]:
+            key = (label, sym, sqft)
+            if key not in index:
+                index[key] = len(units)
+                units.append([label, sym, sqft])
+            ids.append(index[key])
+        members.append([state["slug"], state["name"], ids])
+    return {
+        "n": len(units),
+        "units": units,
+        "states": members,
+        "matrix": [round_sig(a[2] / b[2]) for a in units for b in units],
+    }
+
+def same_name_groups(states=None):
+    """{base name: [(state name, label, sq ft)]} for unit names whose size differs by state,
+    e.g. "Bigha" -> UP's Pucca and Kachha Bigha, Bihar's Bigha, Bengal's Bigha, ..."""
+    groups = {}
+    for state in states or STATES:
+        for uid, label, sym, sqft, note in state["units"]:
+            base = re.sub(r"\s*\(.*\)$", "", label)
+            groups.setdefault(base, []).append((state["name"], label, sqft))
+    return {base: sorted(rows, key=lambda r: -r[2]) for base, rows in groups.items()
+            if len({r[2] for r in rows}) > 1}
+
+# ── Page template ─────────────────────────────────────────────────────────────
+
+def make_compare_page():
+    state_options = "\n                ".join(f'<option value="{s["slug"]}">{s["name"]}</option>' for s in STATES)
+
+    table_rows = ""
+    for base, rows in same_name_groups().items():
+        for state_name, label, sqft in rows:
+            table_rows += f"""<tr>
+            <td>{label}</td><td>{state_name}</td><td>{fmt(sqft)}</td><td>{fmt(sqft / 43560)}</td>
+          </tr>
+          """
+    names = ", ".join(same_name_groups())
+
+    nav_links = make_nav_links("land")
+    sidebar_links = make_sidebar_links("land")
+    prefetch = speculation_rules(["../"])
+
+    title = "Compare Land Units Across Indian States | Bigha, Katha, Kanal Converter"
+    desc = f"Convert a land unit of one Indian state to a unit of another, e.g. a Bihar Bigha to a West Bengal Bigha. Covers {names} and every other state unit."
+    canonical = "https://www.swapunits.online/land/compare/"
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+
+  {resource_hints()}
+  {gtag_head()}
+
+  <title>{title}</title>
+  <meta name="description" content="{desc}" />
+  <meta name="keywords" content="bigha comparison by state, bihar bigha to bengal bigha, land unit comparison india, cross state land converter" />
+  <meta name="robots" content="index, follow" />
+  <link rel="canonical" href="{canonical}" />
+  <meta property="og:title" content="Compare Land Units Across Indian States" />
+  <meta property="og:description" content="{desc}" />
+  <meta property="og:url" content="{canonical}" />
+  <meta property="og:type" content="website" />
+  <script type="application/ld+json">
+  {{
+    "@context": "https://schema.org",
+    "@type": "WebApplication",
+    "name": "Cross-State Land Unit Converter",
+    "url": "{canonical}",
+    "description": "{desc}",
+    "applicationCategory": "UtilitiesApplication",
+    "operatingSystem": "Any",
+    "offers": {{"@type": "Offer", "price": "0", "priceCurrency": "USD"}}
+  }}
+  </script>
+  <link rel="icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>🌾</text></svg>" />
+  <link rel="stylesheet" href="../../css/style.css" />
+  {prefetch}
+  <link rel="preload" href="matrix.json" as="fetch" crossorigin />
+  <script src="../../{versioned('js/hamburger.js')}" defer></script>
+  <script src="../../{versioned('js/search.js')}" defer></script>
+  {adsense_head()}
+</head>
+<body data-category="land">
+
+  <header class="site-header" role="banner">
+    <div class="header-inner">
+      <a href="/" class="site-logo" aria-label="SwapUnits.online Home">
+        Swap<span class="logo-accent">Units</span><span class="logo-tld">.online</span>
+      </a>
+      <span class="header-tagline">Free Online Unit Converter</span>
+    </div>
+  </header>
+
+  <div class="ad-header" aria-label="Advertisement">
+    <!-- Middle Leaderboard -->
+    <ins class="adsbygoogle ad-placeholder banner"
+         style="display:inline-block;width:728px;height:90px"
+         data-ad-client="{ADSENSE_PUB_ID}"
+         data-ad-slot="1234567890"></ins>
+    <script>(adsbygoogle = window.adsbygoogle || []).push({{}});</script>
+  </div>
+
+  <nav class="site-nav" role="navigation" aria-label="Converter categories">
+    <div class="nav-inner">
+      {nav_links}
+    </div>
+  </nav>
+
+  <div class="page-wrapper">
+    <main class="main-content" role="main">
+
+      <nav class="breadcrumb" aria-label="Breadcrumb">
+        <a href="../../">Home</a> <span>&rsaquo;</span>
+        <a href="../">Land</a> <span>&rsaquo;</span>
+        <span>Compare States</span>
+      </nav>
+
+      <!-- Converter Card -->
+      <article class="converter-card pair-page-card">
+        <div class="converter-card-header">
+          <h1>🌾 Compare Land Units Across States</h1>
+        </div>
+        <div class="pair-page-body">
+          <p class="pair-intro">The same name can mean very different areas: a Bigha is 27,220 sq ft in Bihar but 14,400 sq ft in West Bengal. Pick a state and unit on each side to convert directly between them.</p>
+
+          <div class="converter-grid">
+            <div class="converter-field">
+              <label for="cmp-from-val">From</label>
+              <input type="number" id="cmp-from-val" value="1" placeholder="Enter value" autocomplete="off" />
+              <select id="cmp-from-state" aria-label="From state">
+                {state_options}
+              </select>
+              <select id="cmp-from-unit" size="8" aria-label="From unit"></select>
+            </div>
+            <div style="display:flex;flex-direction:column;align-items:center;justify-content:center;">
+              <button class="swap-btn" id="cmp-swap-btn" title="Swap sides">⇄</button>
+            </div>
+            <div class="converter-field">
+              <label for="cmp-to-val">To</label>
+              <input type="text" id="cmp-to-val" placeholder="Result" readonly tabindex="-1" />
+              <select id="cmp-to-state" aria-label="To state">
+                {state_options}
+              </select>
+              <select id="cmp-to-unit" size="8" aria-label="To unit"></select>
+            </div>
+          </div>
+
+          <!-- Result display -->
+          <div class="land-result-display" id="cmp-result-display" style="display:none;">
+            <div class="land-result-label" id="cmp-result-label"></div>
+            <div class="land-result-value" id="cmp-result-value"></div>
+          </div>
+        </div>
+      </article>
+
+      <!-- Same name, different size -->
+      <section class="pair-table-card">
+        <h2>Same Name, Different Size</h2>
+        <table class="pair-table">
+          <thead>
+            <tr><th>Unit</th><th>State</th><th>Sq Ft</th><th>Acres</th></tr>
+          </thead>
+          <tbody>
+            {table_rows}
+          </tbody>
+        </table>
+      </section>
+
+      <section class="pair-info-card">
+        <h2>Conversion Data</h2>
+        <p>Every conversion on this page is read from <a href="matrix.json">matrix.json</a>, a precomputed table of every state's land units against each other. <code>units</code> lists each distinct unit as [label, symbol, sq ft], <code>states</code> lists each state as [slug, name, unit indexes], and <code>matrix[i &times; n + j]</code> is how many of unit j make one unit i. The file is free to use from other sites.</p>
+      </section>
+
+    </main>
+
+    <aside class="sidebar" role="complementary" aria-label="All converters">
+      <div class="sidebar-card">
+        <div class="sidebar-card-header">All Converters</div>
+        <nav class="sidebar-links" aria-label="All converter categories">
+          {sidebar_links}
+        </nav>
+      </div>
+      <div aria-label="Advertisement">
+        <!-- Sidebar Ad -->
+        <ins class="adsbygoogle ad-slot-sidebar"
+             style="display:block"
+             data-ad-client="{ADSENSE_PUB_ID}"
+             data-ad-slot="1122334455"
+             data-ad-format="auto"></ins>
+        <script>(adsbygoogle = window.adsbygoogle || []).push({{}});</script>
+      </div>
+    </aside>
+  </div>
+
+  <footer class="site-footer" role="contentinfo">
+    <div class="footer-bottom" style="max-width:1200px;margin:0 auto;padding:20px;display:flex;justify-content:space-between;font-size:0.8rem;color:rgba(255,255,255,0.45);">
+      <span>&copy; 2026 SwapUnits.online &mdash; All rights reserved.</span>
+      <span><a href="/privacy.html" style="color:inherit;">Privacy</a> &middot; <a href="/sitemap.html" style="color:inherit;">Sitemap</a></span>
+    </div>
+  </footer>
+
+  <script>
+  (function() {{
+    var data = null;
+    var fromVal   = document.getElementById('cmp-from-val');
+    var toVal     = document.getElementById('cmp-to-val');
+    var fromState = document.getElementById('cmp-from-state');
+    var toState   = document.getElementById('cmp-to-state');
+    var fromUnit  = document.getElementById('cmp-from-unit');
+    var toUnit    = document.getElementById('cmp-to-unit');
+    var resultDisplay = document.getElementById('cmp-result-display');
+    var resultLabel   = document.getElementById('cmp-result-label');
+    var resultValue   = document.getElementById('cmp-result-value');
+
+    function formatNum(n) {{
+      if (isNaN(n) || !isFinite(n)) return '';
+      if (n === 0) return '0';
+      var rounded = parseFloat(n.toPrecision(10));
+      var abs = Math.abs(rounded);
+      if (abs <= 0.000001 && abs > 0) {{
+        var decimals = Math.max(0, Math.min(10, -Math.floor(Math.log10(abs)) + 5));
+        return rounded.toFixed(decimals).replace(/\\.?0+$/, '');
+      }}
+      if (abs >= 1) {{
+        if (rounded === Math.round(rounded)) return Math.round(rounded).toLocaleString('en-IN');
+        var dec = Math.max(0, Math.min(6, 9 - Math.floor(Math.log10(abs))));
+        return parseFloat(rounded.toFixed(dec)).toLocaleString('en-IN', {{ maximumFractionDigits: 6 }});
+      }}
+      return parseFloat(rounded.toFixed(6)).toString();
+    }}
+
+    function stateIndex(slug) {{
+      for (var i = 0; i < data.states.length; i++) if (data.states[i][0] === slug) return i;
+      return 0;
+    }}
+
+    // Unit options of one state; values are indexes into data.units
+    function fillUnits(select, stateSel, preferred) {{
+      var ids = data.states[stateIndex(stateSel.value)][2];
+      select.innerHTML = ids.map(function(u) {{
+        return '<option value="' + u + '">' + data.units[u][0] + ' (' + data.units[u][1] + ')</option>';
+      }}).join('');
+      select.value = ids.indexOf(preferred) >= 0 ? preferred : ids[ids.length - 1];
+    }}
+
+    function doConvert() {{
+      var val = parseFloat(String(fromVal.value).replace(/,/g, ''));
+      if (isNaN(val) || !data) {{ toVal.value = ''; resultDisplay.style.display = 'none'; return; }}
+      var i = +fromUnit.value, j = +toUnit.value;
+      var formatted = formatNum(val * data.matrix[i * data.n + j]);
+      var from = data.units[i], to = data.units[j];
+      toVal.value = formatted;
+      resultLabel.textContent = val.toLocaleString('en-IN') + ' ' + from[0] + ' (' + data.states[stateIndex(fromState.value)][1] + ') =';
+      resultValue.textContent = formatted + ' ' + to[0] + ' (' + data.states[stateIndex(toState.value)][1] + ')';
+      resultDisplay.style.display = 'flex';
+    }}
+
+    fetch('matrix.json').then(function(res) {{ return res.json(); }}).then(function(json) {{
+      data = json;
+      // ?from=bihar-jharkhand&to=west-bengal preselects the states
+      var params = new URLSearchParams(window.location.search);
+      fromState.value = params.get('from') || data.states[0][0];
+      toState.value = params.get('to') || data.states[Math.min(1, data.states.length - 1)][0];
+      if (!fromState.value) fromState.value = data.states[0][0];
+      if (!toState.value) toState.value = data.states[0][0];
+      fillUnits(fromUnit, fromState);
+      fillUnits(toUnit, toState, +fromUnit.value);
+      doConvert();
+    }});
+
+    fromVal.addEventListener('input', doConvert);
+    fromUnit.addEventListener('change', doConvert);
+    toUnit.addEventListener('change', doConvert);
+    fromState.addEventListener('change', function() {{ fillUnits(fromUnit, fromState, +fromUnit.value); doConvert(); }});
+    toState.addEventListener('change', function() {{ fillUnits(toUnit, toState, +toUnit.value); doConvert(); }});
+    document.getElementById('cmp-swap-btn').addEventListener('click', function() {{
+      var s = fromState.value, u = +fromUnit.value;
+      fromState.value = toState.value;
+      fillUnits(fromUnit, fromState, +toUnit.value);
+      toState.value = s;
+      fillUnits(toUnit, toState, u);
+      doConvert();
+    }});
+  }})();
+  </script>
+
+</body>
+</html>"""
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main(base=BASE):
+    data = build_matrix()
+    text = json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
+    write_if_changed(os.path.join(base, MATRIX_FILE), text)
+    write_if_changed(os.path.join(base, COMPARE_PATH), make_compare_page())
+    print(f"Wrote {MATRIX_FILE.replace(os.sep, '/')}: {data['n']} distinct units of {len(data['states'])} states, "
+          f"{data['n'] ** 2:,} entries, {len(text.encode()):,} bytes")
+    print(f"Generated: {COMPARE_PATH.replace(os.sep, '/')}")
+    report_blocking("land compare", make_compare_page())
+
+if __name__ == "__main__":
+    main()
@@ -5,14 +5,14 @@ URL structure: /land/{state-slug}/index.html
 Base unit: Square Feet (sq ft)
 """
 
-import os, math
+import os, re, json, math
+from site_common import write_if_changed, ADSENSE_PUB_ID, resource_hints, gtag_head, adsense_head, report_blocking, load_popularity, speculation_rules, versioned
+from gen_pair_pages import slug as unit_slug, rank_pairs
 
 BASE = r"C:\Users\Administrator\Documents\AntiGravity\Units"
 if os.name == 'posix':
     BASE = os.getcwd()
 
-LAND_DIR = os.path.join(BASE, "land")
-ADSENSE_PUB_ID = "ca-pub-2662293899276634"
 
 # ── State data ─────────────────────────────────────────────────────────────────
 # Each unit: (id, label, symbol, sq_ft_factor, note)
@@ -244,6 +244,61 @@ STATES = [
     },
 ]
 
+# ── Spreadsheet registry ──────────────────────────────────────────────────────
+# land-units.json is compiled from "state units.xlsx" by ingest_land_units.py.
+# Its sq ft factors replace the ones above (matched by unit name), and states
+# only the spreadsheet has are added with the common units plus their own.
+
+REGISTRY_NAME = "land-units.json"
+LAND_UNITS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), REGISTRY_NAME)
+COMMON_UNITS = ("sqft", "sqmeter", "gaj", "acre", "hectare")   # listed first in every state
+
+def unit_key(name):
+    """Spelling-tolerant key of a unit name: "Gaj (Sq Yard)", "sq yards" and "Sq Yard (Gaj)"
+    share words; "Katthas" and "Katha" match (plurals and doubled letters dropped)."""
+    words = re.sub(r"[^a-z0-9]+", " ", name.lower()).split()
+    return frozenset(re.sub(r"(.)\1", r"\1", w).rstrip("s") if len(w) > 3 else w for w in words)
+
+def load_registry(path=LAND_UNITS_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"national": [], "states": {}}
+
+def apply_registry(states, registry):
+    """STATES with the registry's sq ft factors, plus the states only the registry has."""
+    merged = []
+    for state in states:
+        entry = registry["states"].get(state["slug"], {"units": []})
+        factors = {unit_key(u["name"]): u["sqft"] for u in registry["national"] + entry["units"]}
+        merged.append({**state, "units": [(uid, label, sym, factors.get(unit_key(label), sqft), note)
+                                          for uid, label, sym, sqft, note in state["units"]]})
+    common = [u for u in merged[0]["units"] if u[0] in COMMON_UNITS]
+    for slug, entry in registry["states"].items():
+        if any(s["slug"] == slug for s in states):
+            continue
+        factors = {unit_key(u["name"]): u["sqft"] for u in registry["national"] + entry["units"]}
+        common_keys = {unit_key(u[1]) for u in common}
+        local = [(re.sub(r"[^a-z0-9]+", "_", u["name"].lower()).strip("_"), u["name"], u["name"], u["sqft"], u["note"])
+                 for u in entry["units"] if unit_key(u["name"]) not in common_keys]
+        merged.append({
+            "slug": slug,
+            "name": entry["name"],
+            "short": entry["name"],
+            "desc": f"Land units used in {entry['name']}, with their square feet equivalents.",
+            "units": [(uid, label, sym, factors.get(unit_key(label), sqft), note)
+                      for uid, label, sym, sqft, note in common] + local,
+        })
+    return merged
+
+CURATED_STATES = STATES
+STATES = apply_registry(CURATED_STATES, load_registry())
+
+def reload_registry():
+    """Re-read land-units.json into STATES in place, so modules that imported it see the change."""
+    STATES[:] = apply_registry(CURATED_STATES, load_registry())
+
 # ── Formatting helper ──────────────────────────────────────────────────────────
 
 def fmt(num):
@@ -271,6 +326,38 @@ def fmt(num):
         return f"{int(rounded)}"
     return f"{rounded:.6g}"
 
+def popular_states(exclude=None):
+    """States ordered by hits in popularity.json (visited ones only), for prefetch hints."""
+    popularity = load_popularity()
+    hits = {s["slug"]: popularity.get(f"/land/{s['slug']}-land-conversion/", 0) for s in STATES}
+    return [s for s in sorted(STATES, key=lambda s: -hits[s["slug"]]) if hits[s["slug"]] and s["slug"] != exclude]
+
+# ── Pair pages ─────────────────────────────────────────────────────────────────
+# Each state's units also get one page per pair, /land/{state-slug}/{from}-to-{to}/
+# (gen_land_pair_pages.py). The state page links its STATE_PAIR_LINKS top pairs.
+
+STATE_PAIR_LINKS = 12
+
+def pair_slugs(state):
+    """{unit id: URL slug} for one state's units, e.g. bigha_pucca -> bigha-pucca."""
+    slugs = {u[0]: unit_slug(u[1]) for u in state["units"]}
+    if len(set(slugs.values())) != len(slugs):
+        raise ValueError(f"{state['slug']}: two units share a URL slug: {sorted(slugs.values())}")
+    return slugs
+
+def ranked_state_pairs(state, slugs=None):
+    """(popular pairs, the rest) of one state's units, by hits in popularity.json.
+
+    Without popularity data, the state's own units to and from acres and
+    square feet lead, then acre <-> hectare.
+    """
+    slugs = slugs or pair_slugs(state)
+    local = [u[0] for u in state["units"] if u[0] not in COMMON_UNITS]
+    default = [p for u in local for p in ((u, "acre"), (u, "sqft"), ("acre", u), ("sqft", u))]
+    default += [("acre", "hectare"), ("hectare", "acre")]
+    return rank_pairs([u[0] for u in state["units"]],
+                      lambda a, b: f"/land/{state['slug']}/{slugs[a]}-to-{slugs[b]}/", default)
+
 # ── Nav links ──────────────────────────────────────────────────────────────────
 
 NAV_CATS = [
@@ -361,8 +448,18 @@ def make_state_page(state):
             continue
         related_html += f'<li><a href="../{s["slug"]}-land-conversion/">{s["name"]}</a></li>\n'
 
+    # Top pair pages of this state
+    slugs = pair_slugs(state)
+    labels = {u[0]: u[1] for u in units}
+    popular, rest = ranked_state_pairs(state, slugs)
+    pair_links_html = "".join(
+        f'<li><a href="../{slug}/{slugs[a]}-to-{slugs[b]}/">{labels[a]} to {labels[b]}</a></li>\n'
+        for a, b in (popular + rest)[:STATE_PAIR_LINKS])
+
     nav_links = make_nav_links("land")
     sidebar_links = make_sidebar_links("land")
+    # Back to the hub is the usual next click, then the most visited states
+    prefetch = speculation_rules(["../"] + [f"../{s['slug']}-land-conversion/" for s in popular_states(slug)])
 
     title = f"{name} Land Unit Converter | Bigha, Katha, Acre & More"
     desc_meta = f"Convert land units in {name}: Bigha, Katha, Acre, Square Feet and more. Free online {name} land measurement converter with conversion table."
@@ -374,15 +471,8 @@ def make_state_page(state):
   <meta charset="UTF-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1.0" />
   
-  <!-- Google tag (gtag.js) -->
-  <script async src="https://www.googletagmanager.com/gtag/js?id=G-TSFVXECJ40"></script>
-  <script>
-    window.dataLayer = window.dataLayer || [];
-    function gtag(){{dataLayer.push(arguments);}}
-    gtag('js', new Date());
-
-    gtag('config', 'G-TSFVXECJ40');
-  </script>
+  {resource_hints()}
+  {gtag_head()}
 
   <title>{title}</title>
   <meta name="description" content="{desc_meta}" />
@@ -407,8 +497,10 @@ def make_state_page(state):
   </script>
   <link rel="icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>🌾</text></svg>" />
   <link rel="stylesheet" href="../../css/style.css" />
-  <!-- Google AdSense -->
-  <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client={ADSENSE_PUB_ID}" crossorigin="anonymous"></script>
+  {prefetch}
+  <script src="../../{versioned('js/hamburger.js')}" defer></script>
+  <script src="../../{versioned('js/search.js')}" defer></script>
+  {adsense_head()}
 </head>
 <body data-category="land">
 
@@ -507,10 +599,19 @@ def make_state_page(state):
         </table>
       </section>
 
+      <!-- Pair Pages -->
+      <section class="pair-related-card">
+        <h2>Popular {name} Land Conversions</h2>
+        <ul class="pair-related-list">
+          {pair_links_html}
+        </ul>
+      </section>
+
       <!-- Related States -->
       <section class="pair-related-card">
         <h2>Other Indian State Land Converters</h2>
         <ul class="pair-related-list">
+          <li><a href="../compare/?from={slug}">Compare {name} units with another state</a></li>
           {related_html}
         </ul>
       </section>
@@ -526,7 +627,7 @@ def make_state_page(state):
       </div>
       <div aria-label="Advertisement">
         <!-- Sidebar Ad -->
-        <ins class="adsbygoogle"
+        <ins class="adsbygoogle ad-slot-sidebar"
              style="display:block"
              data-ad-client="{ADSENSE_PUB_ID}"
              data-ad-slot="1122334455"
@@ -691,21 +792,17 @@ def make_hub_page():
         else:
             sidebar_links += f'<a href="../{nk}/" class="sidebar-link{active}">{nn} Converter</a>\n          '
 
+    # Most visited states, or the first cards on the page without traffic data
+    prefetch = speculation_rules([f"{s['slug']}-land-conversion/" for s in popular_states() or STATES])
+
     return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="UTF-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1.0" />
   
-  <!-- Google tag (gtag.js) -->
-  <script async src="https://www.googletagmanager.com/gtag/js?id=G-TSFVXECJ40"></script>
-  <script>
-    window.dataLayer = window.dataLayer || [];
-    function gtag(){{dataLayer.push(arguments);}}
-    gtag('js', new Date());
-
-    gtag('config', 'G-TSFVXECJ40');
-  </script>
+  {resource_hints()}
+  {gtag_head()}
 
   <title>Indian Land Unit Converter | Bigha, Katha, Acre by State | SwapUnits.online</title>
   <meta name="description" content="Free Indian land unit converter for all states. Convert Bigha, Katha, Biswa, Kanal, Marla, Ground, Cent, Guntha and more. State-specific converters for UP, Bihar, Punjab, West Bengal, Rajasthan, MP, Gujarat, Maharashtra, Tamil Nadu, Himachal Pradesh." />
@@ -718,8 +815,10 @@ def make_hub_page():
   <meta property="og:type" content="website" />
   <link rel="icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>🌾</text></svg>" />
   <link rel="stylesheet" href="../css/style.css?v=2" />
-  <!-- Google AdSense -->
-  <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client={ADSENSE_PUB_ID}" crossorigin="anonymous"></script>
+  {prefetch}
+  <script src="../{versioned('js/hamburger.js')}" defer></script>
+  <script src="../{versioned('js/search.js')}" defer></script>
+  {adsense_head()}
 </head>
 <body data-category="land">
 
@@ -790,6 +889,7 @@ def make_hub_page():
             <tr><td>Acre</td><td>All States</td><td>43,560</td></tr>
           </tbody>
         </table>
+        <p style="margin-top:16px;"><a href="compare/">Compare land units across states &rarr;</a></p>
       </section>
 
     </main>
@@ -803,7 +903,7 @@ def make_hub_page():
       </div>
       <div aria-label="Advertisement">
         <!-- Sidebar Ad -->
-        <ins class="adsbygoogle"
+        <ins class="adsbygoogle ad-slot-sidebar"
              style="display:block"
              data-ad-client="{ADSENSE_PUB_ID}"
              data-ad-slot="1122334455"
@@ -861,29 +961,35 @@ def make_hub_page():
 
 # ── Generate all pages ─────────────────────────────────────────────────────────
 
-os.makedirs(LAND_DIR, exist_ok=True)
+def state_path(state_slug):
+    """Output path of a state page, relative to the site root."""
+    return os.path.join("land", f"{state_slug}-land-conversion", "index.html")
+
+HUB_PATH = os.path.join("land", "index.html")
+
+def render_hub(base):
+    return write_if_changed(os.path.join(base, HUB_PATH), make_hub_page())
 
-# Hub page
-hub_path = os.path.join(LAND_DIR, "index.html")
-with open(hub_path, "w", encoding="utf-8") as f:
-    f.write(make_hub_page())
-print("Generated: land/index.html")
+def render_state(base, state):
+    return write_if_changed(os.path.join(base, state_path(state["slug"])), make_state_page(state))
 
-# State pages
-sitemap_entries = ["https://www.swapunits.online/land/"]
-for state in STATES:
-    page_slug = f"{state['slug']}-land-conversion"
-    page_dir  = os.path.join(LAND_DIR, page_slug)
-    os.makedirs(page_dir, exist_ok=True)
-    html = make_state_page(state)
-    out_path = os.path.join(page_dir, "index.html")
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(html)
-    sitemap_entries.append(f"https://www.swapunits.online/land/{page_slug}/")
-    print(f"Generated: land/{page_slug}/index.html")
+def main(base=BASE):
+    # Hub page
+    render_hub(base)
+    print("Generated: land/index.html")
 
-print(f"\nTotal land pages: {len(sitemap_entries)}")
+    # State pages
+    sitemap_entries = ["https://www.swapunits.online/land/"]
+    for state in STATES:
+        page_slug = f"{state['slug']}-land-conversion"
+        render_state(base, state)
+        sitemap_entries.append(f"https://www.swapunits.online/land/{page_slug}/")
+        print(f"Generated: land/{page_slug}/index.html")
 
+    print(f"\nTotal land pages: {len(sitemap_entries)}")
+    report_blocking("land hub", make_hub_page())
+    report_blocking("land state", make_state_page(STATES[0]))
+    print("Done! Please run gen_sitemap.py to update sitemap.xml.")
 
-print(f"Sitemap updated with {len(sitemap_entries)} land URLs.")
-print("Done! Please run gen_sitemap.py to update sitemap.xml.")
+if __name__ == "__main__":
+    main()
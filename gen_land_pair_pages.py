@@ -0,0 +1,162 @@
+"""
+gen_land_pair_pages.py
+Generates one converter page per pair of land units of each Indian state,
+from the STATES table in gen_land_pages.py:
+URL structure: /land/{state-slug}/{from-slug}-to-{to-slug}/index.html
+
+The pages use the pair page template of gen_pair_pages.py (make_page), with
+each state passed in as a category of its own: its units, their sq ft
+factors and notes, and its related links ranked once per state by
+ranked_state_pairs(). Titles name the state, since "Bigha to Acre" differs
+from state to state.
+
+States are rendered in parallel, one state per worker process. A state whose
+units and templates are unchanged since the last run (one fingerprint per
+state in .build/cache/) is skipped. Pair pages of units or states that no
+longer exist are removed. gen_sitemap.py picks the pages up like any other.
+
+Usage:
+  python gen_land_pair_pages.py
+  python gen_land_pair_pages.py --out DIR --jobs 4
+"""
+
+import os, json, shutil, hashlib, argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from gen_pair_pages import make_page
+from gen_land_pages import STATES, fmt, pair_slugs, ranked_state_pairs, state_path
+from site_common import write_if_changed
+
+BASE = os.getcwd()
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SRC_DIR, ".build", "cache")
+
+# Sources whose edits change every land pair page
+TEMPLATE_FILES = ["gen_land_pair_pages.py", "gen_pair_pages.py", "gen_land_pages.py", "site_common.py",
+                  "js/hamburger.js", "js/search.js"]
+
+# ── State categories ──────────────────────────────────────────────────────────
+
+def state_category(state):
+    """A state's units in the shape of a CATEGORIES entry, for make_page()."""
+    slugs = pair_slugs(state)
+    definitions = {}
+    for uid, label, sym, factor, note in state["units"]:
+        definitions[uid] = f"In {state['name']}, 1 {label} ({sym}) equals {fmt(factor)} square feet." \
+                           + (f" {note}." if note else "")
+    return {
+        "name": "Land Area",
+        "cat_label": f"{state['name']} Land Conversion",
+        "icon": "🌾",
+        "units": state["units"],
+        "definitions": definitions,
+        "slugs": slugs,
+        "ranked": ranked_state_pairs(state, slugs),
+        "path": f"land/{state['slug']}",
+        "parent": os.path.dirname(state_path(state["slug"])).replace(os.sep, "/") + "/",
+        "nav": "land",
+        "where": f" in {state['name']}",
+    }
+
+def pair_dirs(state, cat=None):
+    """Directory names of one state's pair pages, e.g. "bigha-pucca-to-acre"."""
+    slugs = (cat or state_category(state))["slugs"]
+    return [f"{slugs[a[0]]}-to-{slugs[b[0]]}" for a in state["units"] for b in state["units"] if a is not b]
+
+def land_pair_path(state_slug, page_slug):
+    """Output path of a land pair page, relative to the site root."""
+    return os.path.join("land", state_slug, page_slug, "index.html")
+
+# ── Rendering ─────────────────────────────────────────────────────────────────
+
+def render_state_pairs(base, state_slug):
+    """Worker: write every pair page of one state. Returns the number of pages that changed."""
+    state = next(s for s in STATES if s["slug"] == state_slug)
+    cat = state_category(state)
+    changed = 0
+    for from_unit in state["units"]:
+        for to_unit in state["units"]:
+            if from_unit is to_unit:
+                continue
+            page_slug = f"{cat['slugs'][from_unit[0]]}-to-{cat['slugs'][to_unit[0]]}"
+            html = make_page("land", cat, from_unit, to_unit)
+            changed += write_if_changed(os.path.join(base, land_pair_path(state_slug, page_slug)), html)
+    return changed
+
+def remove_stale(base, state_slug, keep=()):
+    """Delete pair directories of one state that aren't in keep. Returns how many."""
+    state_dir = os.path.join(base, "land", state_slug)
+    try:
+        names = os.listdir(state_dir)
+    except FileNotFoundError:
+        return 0
+    stale = [n for n in names if "-to-" in n and n not in keep]
+    for name in stale:
+        shutil.rmtree(os.path.join(state_dir, name))
+    if not keep and not os.listdir(state_dir):
+        os.rmdir(state_dir)
+    return len(stale)
+
+# ── Incremental builds ────────────────────────────────────────────────────────
+
+def template_hash():
+    h = hashlib.sha1()
+    for name in TEMPLATE_FILES:
+        with open(os.path.join(SRC_DIR, name), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def fingerprint(template, cat):
+    return hashlib.sha1(json.dumps([template, cat], sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+def cache_path(base):
+    key = hashlib.sha1(os.path.abspath(base).encode()).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"land-pair-pages-{key}.json")
+
+def load_stamps(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main(base=BASE, jobs=None):
+    cache_file = cache_path(base)
+    stamps = load_stamps(cache_file)  # {state slug: fingerprint} of the last run
+    template = template_hash()
+    new_stamps, futures = {}, {}
+    total = skipped = changed = removed = 0
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        for state in STATES:
+            cat = state_category(state)
+            dirs = pair_dirs(state, cat)
+            new_stamps[state["slug"]] = fingerprint(template, cat)
+            total += len(dirs)
+            removed += remove_stale(base, state["slug"], keep=set(dirs))
+            if stamps.get(state["slug"]) == new_stamps[state["slug"]] and all(
+                    os.path.exists(os.path.join(base, land_pair_path(state["slug"], d))) for d in dirs):
+                skipped += 1
+                continue
+            futures[state["slug"]] = pool.submit(render_state_pairs, base, state["slug"])
+        for state_slug, future in futures.items():
+            n = future.result()
+            changed += n
+            print(f"Generated: land/{state_slug}/ ({n} changed)")
+
+    # States dropped from STATES since the last run
+    for state_slug in sorted(set(stamps) - set(new_stamps)):
+        removed += remove_stale(base, state_slug)
+    write_if_changed(cache_file, json.dumps(new_stamps, indent=1, sort_keys=True) + "\n")
+
+    print(f"\nLand pair pages: {total} pages for {len(STATES)} states ({changed} changed, "
+          f"{skipped} states unchanged and skipped, {removed} stale removed)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate /land/{state}/{from}-to-{to}/ pages")
+    parser.add_argument("--out", default=BASE, help="site directory to write into (default: here)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+    main(args.out, args.jobs)
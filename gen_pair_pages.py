@@ -2,15 +2,22 @@
 gen_pair_pages.py
 Generates individual conversion pair pages for every unit pair in every category.
 URL structure: /{category}/{from-slug}-to-{to-slug}/index.html
+
+Each pair page gets a machine-readable twin, /{category}/{pair}/data.json
+(coefficients, symbols and the page's conversion table), and each category a
+/{category}/units.json listing every unit's coefficients to the base unit, so
+API clients never have to scrape the HTML.
 """
 
-import os, math, itertools
+import os, json, math, itertools
+from fractions import Fraction
+from html.parser import HTMLParser
+from site_common import write_if_changed, ADSENSE_PUB_ID, resource_hints, gtag_head, adsense_head, report_blocking, load_popularity, speculation_rules, versioned
 
 BASE = r"C:\Users\Administrator\Documents\AntiGravity\Units"
 if os.name == 'posix':
     BASE = os.getcwd()
 
-ADSENSE_PUB_ID = "ca-pub-2662293899276634"
 
 # ── Unit data (mirrors converters.js exactly) ─────────────────────────────────
 CATEGORIES = {
@@ -276,6 +283,19 @@ CATEGORIES = {
 def factor_convert(value, from_factor, to_factor):
     return value * from_factor / to_factor
 
+# Temperature as affine maps to Celsius: celsius = value * scale + offset (exact)
+TEMP_TO_CELSIUS = {
+    "celsius":    (Fraction(1),    Fraction(0)),
+    "fahrenheit": (Fraction(5, 9), Fraction(-160, 9)),
+    "kelvin":     (Fraction(1),    Fraction("-273.15")),
+    "rankine":    (Fraction(5, 9), Fraction("-273.15")),
+    "reaumur":    (Fraction(5, 4), Fraction(0)),
+}
+
+# Values in the conversion table of each pair page (and its data.json)
+TABLE_VALUES = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+TEMP_TABLE_VALUES = [-40, 0, 20, 37, 100, 200, 500]
+
 def temp_convert(value, from_id, to_id):
     if from_id == "celsius":    c = value
     elif from_id == "fahrenheit": c = (value - 32) * 5/9
@@ -330,17 +350,114 @@ for cat_key, cat in CATEGORIES.items():
         s = slug(uname)
         SLUG_MAP[(cat_key, uid)] = s
 
+# ── Related links ─────────────────────────────────────────────────────────────
+# Number of "Popular ... Conversions" links on each pair page. Add a category
+# key to override the default for that category; None lists every other pair.
+RELATED_LINKS = {"default": 24}
+
+# Pairs people search for most, most popular first; they rank highest in the
+# related links after the reverse pair. Once analyze_logs.py has written
+# popularity.json, the POPULAR_TOP most-visited pairs of each category are
+# used instead, and the remaining pairs are ordered by hits too.
+POPULAR_TOP = 12
+POPULAR_PAIRS = {
+    "length":      [("meter", "foot"), ("foot", "meter"), ("kilometer", "mile"), ("mile", "kilometer"),
+                    ("inch", "centimeter"), ("centimeter", "inch"), ("foot", "inch"), ("inch", "foot"),
+                    ("meter", "yard"), ("yard", "meter"), ("millimeter", "inch"), ("foot", "centimeter")],
+    "temperature": [("celsius", "fahrenheit"), ("fahrenheit", "celsius"), ("celsius", "kelvin"),
+                    ("kelvin", "celsius"), ("fahrenheit", "kelvin"), ("kelvin", "fahrenheit")],
+    "area":        [("sqfoot", "sqmeter"), ("sqmeter", "sqfoot"), ("acre", "hectare"), ("hectare", "acre"),
+                    ("acre", "sqfoot"), ("sqmile", "sqkilometer"), ("sqkilometer", "sqmile"), ("sqyard", "sqmeter")],
+    "volume":      [("liter", "usgallon"), ("usgallon", "liter"), ("milliliter", "usfloz"), ("usfloz", "milliliter"),
+                    ("uscup", "milliliter"), ("tablespoon", "teaspoon"), ("liter", "milliliter"), ("cubicmeter", "liter")],
+    "weight":      [("kilogram", "pound"), ("pound", "kilogram"), ("gram", "ounce"), ("ounce", "gram"),
+                    ("stone", "kilogram"), ("kilogram", "stone"), ("tonne", "kilogram"), ("gram", "milligram")],
+    "time":        [("hour", "minute"), ("minute", "second"), ("day", "hour"), ("week", "day"),
+                    ("year", "day"), ("second", "millisecond"), ("month", "week")],
+    "speed":       [("kph", "mph"), ("mph", "kph"), ("mps", "kph"), ("knot", "kph"), ("knot", "mph"), ("kph", "mps")],
+    "pressure":    [("psi", "bar"), ("bar", "psi"), ("kilopascal", "psi"), ("psi", "kilopascal"),
+                    ("atm", "pascal"), ("bar", "atm"), ("mmhg", "kilopascal")],
+    "energy":      [("kilocalorie", "kilojoule"), ("kilojoule", "kilocalorie"), ("kwh", "joule"),
+                    ("calorie", "joule"), ("joule", "calorie"), ("btu", "kwh"), ("kwh", "btu")],
+}
+
+def rank_pairs(ids, url_of, default_popular=()):
+    """(popular pairs, every other pair by hits, then unit order) for one set of units.
+
+    url_of(a, b) is the pair's URL path, looked up in popularity.json; without
+    it, default_popular (pairs people search for most) leads.
+    """
+    pairs = [(a, b) for a in ids for b in ids if a != b]
+    if POPULARITY:
+        hits = {p: POPULARITY.get(url_of(*p), 0) for p in pairs}
+        pairs.sort(key=lambda p: -hits[p])  # stable: ties keep unit order
+        popular = [p for p in pairs[:POPULAR_TOP] if hits[p]]
+    else:
+        popular = [p for p in default_popular if p[0] in ids and p[1] in ids]
+    return popular, [p for p in pairs if p not in popular]
+
+# Precomputed once per category
+RANKED_PAIRS = {}
+POPULARITY = load_popularity()
+for cat_key, cat in CATEGORIES.items():
+    RANKED_PAIRS[cat_key] = rank_pairs(
+        [u[0] for u in cat["units"]],
+        lambda a, b, c=cat_key: f"/{c}/{SLUG_MAP[(c, a)]}-to-{SLUG_MAP[(c, b)]}/",
+        POPULAR_PAIRS.get(cat_key, []))
+
+def related_links(cat_key, fid, tid, k, cat=None):
+    """(label, href) of the related pairs shown on the fid -> tid page.
+
+    Ranked: the reverse pair, popular pairs sharing a unit with this page,
+    other popular pairs, then the remaining pairs that share a unit.
+    k=None keeps every other pair of the category, in unit order.
+    cat defaults to CATEGORIES[cat_key]; other page sets (gen_land_pair_pages)
+    pass their own, with "ranked" pairs and unit "slugs".
+    """
+    cat = cat or CATEGORIES[cat_key]
+    units = cat["units"]
+    if k is None:
+        pairs = [(a[0], b[0]) for a in units for b in units if a[0] != b[0] and (a[0], b[0]) != (fid, tid)]
+    else:
+        popular, rest = cat.get("ranked") or RANKED_PAIRS[cat_key]
+        shares = lambda p: fid in p or tid in p
+        ranked = [(tid, fid)] + [p for p in popular if shares(p)] + [p for p in popular if not shares(p)] \
+                 + [p for p in rest if shares(p)]
+        pairs = [p for p in dict.fromkeys(ranked) if p != (fid, tid)][:k]
+    names = {u[0]: u[1] for u in units}
+    slugs = cat.get("slugs") or {u[0]: SLUG_MAP[(cat_key, u[0])] for u in units}
+    return [(f"{names[a]} to {names[b]}", f"../{slugs[a]}-to-{slugs[b]}/") for a, b in pairs]
+
+def related_li(label, href):
+    return f'<li><a href="{href}">{label}</a></li>'
+
+def related_columns(links):
+    """The two <ul> bodies of the related links: the first half, then the rest."""
+    half = (len(links) + 1) // 2
+    return ("\n".join(related_li(l, h) for l, h in links[:half]),
+            "\n".join(related_li(l, h) for l, h in links[half:]))
+
 # ── HTML template ─────────────────────────────────────────────────────────────
 
 def make_page(cat_key, cat, from_unit, to_unit):
+    """One pair page. cat is CATEGORIES[cat_key] or a page set of the same shape
+    with optional "path" (URL directory of its pair pages), "parent" (the
+    page its breadcrumb and prefetch lead to), "nav" (active nav entry),
+    "where" (appended to titles), "ranked" and "slugs"."""
     fid, fname, fsym, *frest = from_unit
     tid, tname, tsym, *trest = to_unit
 
     ffactor = frest[0] if frest else None
     tfactor = trest[0] if trest else None
 
-    from_slug = SLUG_MAP[(cat_key, fid)]
-    to_slug   = SLUG_MAP[(cat_key, tid)]
+    slugs = cat.get("slugs") or {u[0]: SLUG_MAP[(cat_key, u[0])] for u in (from_unit, to_unit)}
+    from_slug = slugs[fid]
+    to_slug   = slugs[tid]
+    path = cat.get("path", cat_key)
+    root = "../" * (path.count("/") + 2)            # from the page up to the site root
+    parent = cat.get("parent", f"{cat_key}/")       # from the site root
+    nav_key = cat.get("nav", cat_key)
+    where = cat.get("where", "")
     page_slug = f"{from_slug}-to-{to_slug}"
     reverse_slug = f"{to_slug}-to-{from_slug}"
 
@@ -358,7 +475,7 @@ def make_page(cat_key, cat, from_unit, to_unit):
         formula_fwd = f"1 {fname} ({fsym}) = {fmt(factor_1_fwd)} {tname} ({tsym})"
         formula_rev = f"1 {tname} ({tsym}) = {fmt(factor_1_rev)} {fname} ({fsym})"
         example_str = f"{example_val} {fname} ({fsym}) = {fmt(example_result)} {tname} ({tsym})"
-        table_vals = [-40, 0, 20, 37, 100, 200, 500]
+        table_vals = TEMP_TABLE_VALUES
     else:
         factor_1_fwd = ffactor / tfactor
         factor_1_rev = tfactor / ffactor
@@ -367,7 +484,7 @@ def make_page(cat_key, cat, from_unit, to_unit):
         example_val = 15
         example_result = example_val * ffactor / tfactor
         example_str = f"{example_val} {fname} ({fsym}) = {example_val} &times; {fmt(factor_1_fwd)} {tname} ({tsym}) = {fmt(example_result)} {tname} ({tsym})"
-        table_vals = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+        table_vals = TABLE_VALUES
 
     # Conversion table rows
     table_rows = ""
@@ -378,39 +495,15 @@ def make_page(cat_key, cat, from_unit, to_unit):
             r = v * ffactor / tfactor
         table_rows += f"<tr><td>{v} {fsym}</td><td>{fmt(r)} {tsym}</td></tr>\n"
 
-    # Related conversions (all other pairs in same category, up to 24)
-    related_left = []
-    related_right = []
-    all_units = cat["units"]
-    related_pairs = []
-    for u1 in all_units:
-        for u2 in all_units:
-            if u1[0] == u2[0]: continue
-            if u1[0] == fid and u2[0] == tid: continue  # skip self
-            s1 = SLUG_MAP[(cat_key, u1[0])]
-            s2 = SLUG_MAP[(cat_key, u2[0])]
-            label = f"{u1[1]} to {u2[1]}"
-            href  = f"../{s1}-to-{s2}/"
-            related_pairs.append((label, href))
-
-    # Deduplicate and limit
-    seen = set()
-    unique_related = []
-    for label, href in related_pairs:
-        if label not in seen:
-            seen.add(label)
-            unique_related.append((label, href))
-
-    # Split into two columns
-    half = (len(unique_related) + 1) // 2
-    col1 = unique_related[:half]
-    col2 = unique_related[half:]
-
-    def make_li(label, href):
-        return f'<li><a href="{href}">{label}</a></li>'
-
-    col1_html = "\n".join(make_li(l, h) for l, h in col1)
-    col2_html = "\n".join(make_li(l, h) for l, h in col2)
+    # Related conversions (top RELATED_LINKS pairs, ranked)
+    k = RELATED_LINKS.get(cat_key, RELATED_LINKS["default"])
+    unique_related = related_links(cat_key, fid, tid, k, cat)
+
+    # Prefetch the likeliest next clicks: "vice versa", the category page, then the top related pair
+    up = f"{root}{parent}" if "parent" in cat else "../"
+    prefetch = speculation_rules([f"../{reverse_slug}/", up] + [h for _, h in unique_related])
+
+    col1_html, col2_html = related_columns(unique_related)
 
     # Nav links
     nav_links = ""
@@ -422,24 +515,25 @@ def make_page(cat_key, cat, from_unit, to_unit):
         ("date-calculator", "📅 Date Calculator"),
     ]
     for nk, nn in nav_cats:
-        active = ' class="nav-link active"' if nk == cat_key else ' class="nav-link"'
-        nav_links += f'<a href="../../{nk}/"{active}>{nn}</a>\n      '
+        active = ' class="nav-link active"' if nk == nav_key else ' class="nav-link"'
+        href = f"{root}date-calculator.html" if nk == "date-calculator" else f"{root}{nk}/"
+        nav_links += f'<a href="{href}"{active}>{nn}</a>\n      '
 
     # Sidebar links
     sidebar_links = ""
     for nk, nn in nav_cats:
-        active = ' active' if nk == cat_key else ''
+        active = ' active' if nk == nav_key else ''
         if nk == "date-calculator":
-            sidebar_links += f'<a href="../../date-calculator.html" class="sidebar-link{active}">{nn}</a>\n          '
+            sidebar_links += f'<a href="{root}date-calculator.html" class="sidebar-link{active}">{nn}</a>\n          '
         elif nk == "land":
-             sidebar_links += f'<a href="../../land/" class="sidebar-link{active}">{nn} Converter</a>\n          '
+             sidebar_links += f'<a href="{root}land/" class="sidebar-link{active}">{nn} Converter</a>\n          '
         else:
-            sidebar_links += f'<a href="../../{nk}/" class="sidebar-link{active}">{nn} Converter</a>\n          '
+            sidebar_links += f'<a href="{root}{nk}/" class="sidebar-link{active}">{nn} Converter</a>\n          '
 
-    title = f"Convert {fname} to {tname} | {fname} to {tname} Converter"
-    desc  = f"Easily convert {fname} ({fsym}) to {tname} ({tsym}). Free online {cat_name.lower()} converter with formula, examples, and conversion table."
+    title = f"Convert {fname} to {tname}{where} | {fname} to {tname} Converter"
+    desc  = f"Easily convert {fname} ({fsym}) to {tname} ({tsym}){where}. Free online {cat_name.lower()} converter with formula, examples, and conversion table."
     kw    = f"{fname} to {tname}, {fsym} to {tsym}, convert {fname} to {tname}, {cat_name.lower()} converter, {fname} {tname} conversion"
-    canonical = f"https://www.swapunits.online/{cat_key}/{page_slug}/"
+    canonical = f"https://www.swapunits.online/{path}/{page_slug}/"
     icon = cat["icon"]
 
     return f"""<!DOCTYPE html>
@@ -448,32 +542,25 @@ def make_page(cat_key, cat, from_unit, to_unit):
   <meta charset="UTF-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1.0" />
   
-  <!-- Google tag (gtag.js) -->
-  <script async src="https://www.googletagmanager.com/gtag/js?id=G-TSFVXECJ40"></script>
-  <script>
-    window.dataLayer = window.dataLayer || [];
-    function gtag(){{dataLayer.push(arguments);}}
-    gtag('js', new Date());
-
-    gtag('config', 'G-TSFVXECJ40');
-  </script>
+  {resource_hints()}
+  {gtag_head()}
 
   <title>{title}</title>
   <meta name="description" content="{desc}" />
   <meta name="keywords" content="{kw}" />
   <meta name="robots" content="index, follow" />
   <link rel="canonical" href="{canonical}" />
-  <meta property="og:title" content="Convert {fname} to {tname}" />
+  <meta property="og:title" content="Convert {fname} to {tname}{where}" />
   <meta property="og:description" content="{desc}" />
   <meta property="og:url" content="{canonical}" />
   <meta property="og:type" content="website" />
   <meta name="twitter:card" content="summary" />
-  <meta name="twitter:title" content="Convert {fname} to {tname}" />
+  <meta name="twitter:title" content="Convert {fname} to {tname}{where}" />
   <script type="application/ld+json">
   {{
     "@context": "https://schema.org",
     "@type": "WebApplication",
-    "name": "Convert {fname} to {tname}",
+    "name": "Convert {fname} to {tname}{where}",
     "url": "{canonical}",
     "description": "{desc}",
     "applicationCategory": "UtilitiesApplication",
@@ -482,13 +569,13 @@ def make_page(cat_key, cat, from_unit, to_unit):
   }}
   </script>
   <link rel="icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>&#x2696;</text></svg>" />
-  <link rel="stylesheet" href="../../css/style.css" />
-  <script src="../../js/converters.js?v=2"></script>
-  <script src="../../js/app.js?v=2"></script>
-  <!-- Google AdSense -->
-  <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client={ADSENSE_PUB_ID}" crossorigin="anonymous"></script>
+  <link rel="stylesheet" href="{root}css/style.css" />
+  {prefetch}
+  <script src="{root}{versioned('js/hamburger.js')}" defer></script>
+  <script src="{root}{versioned('js/search.js')}" defer></script>
+  {adsense_head()}
 </head>
-<body data-category="{cat_key}">
+<body data-category="{nav_key}">
 
   <header class="site-header" role="banner">
     <div class="header-inner">
@@ -519,14 +606,14 @@ def make_page(cat_key, cat, from_unit, to_unit):
 
       <nav class="breadcrumb" aria-label="Breadcrumb">
         <a href="/">Home</a> <span>&rsaquo;</span>
-        <a href="../../{cat_key}/">{cat_label}</a> <span>&rsaquo;</span>
+        <a href="{root}{parent}">{cat_label}</a> <span>&rsaquo;</span>
         <span>Convert {fname} to {tname}</span>
       </nav>
 
       <!-- Converter Card -->
       <article class="converter-card pair-page-card">
         <div class="converter-card-header">
-          <h1>{icon} Convert {fname} to {tname}</h1>
+          <h1>{icon} Convert {fname} to {tname}{where}</h1>
         </div>
         <div class="pair-page-body">
           <p class="pair-intro">Please provide values below to convert <strong>{fname} [{fsym}]</strong> to <strong>{tname} [{tsym}]</strong>, or <a href="../{reverse_slug}/">vice versa</a>.</p>
@@ -600,7 +687,7 @@ def make_page(cat_key, cat, from_unit, to_unit):
       </div>
       <div aria-label="Advertisement">
         <!-- Sidebar Ad -->
-        <ins class="adsbygoogle"
+        <ins class="adsbygoogle ad-slot-sidebar"
              style="display:block"
              data-ad-client="{ADSENSE_PUB_ID}"
              data-ad-slot="1122334455"
@@ -745,43 +832,151 @@ def js_fwd_convert(fid, tid, ffactor, tfactor, is_temp, swapped=False):
         tf = tfactor if tfactor is not None else 1
         return f"result = val * {ff} / {tf};"
 
-# ── Generate all pages ────────────────────────────────────────────────────────
-
-total = 0
-sitemap_entries = []
-
-for cat_key, cat in CATEGORIES.items():
-    units = cat["units"]
-    for i, from_unit in enumerate(units):
-        for j, to_unit in enumerate(units):
-            if i == j:
-                continue
-            fid = from_unit[0]
-            tid = to_unit[0]
-            from_slug = SLUG_MAP[(cat_key, fid)]
-            to_slug   = SLUG_MAP[(cat_key, tid)]
-            page_slug = f"{from_slug}-to-{to_slug}"
-
-            # Create directory
-            page_dir = os.path.join(BASE, cat_key, page_slug)
-            os.makedirs(page_dir, exist_ok=True)
-
-            # Generate HTML
-            html = make_page(cat_key, cat, from_unit, to_unit)
-
-            # Write file
-            out_path = os.path.join(page_dir, "index.html")
-            with open(out_path, "w", encoding="utf-8") as f:
-                f.write(html)
-
-            sitemap_entries.append(f"https://www.unitconvert.net/{cat_key}/{page_slug}/")
-            total += 1
-
-            if total % 100 == 0:
-                print(f"  Generated {total} pages...")
-
-print(f"\nTotal pages generated: {total}")
+# ── JSON endpoints ────────────────────────────────────────────────────────────
+
+DATA_FILE = "data.json"
+UNITS_FILE = "units.json"
+
+def coefficients(cat_key, fid, tid):
+    """(multiplier, offset) with to = from * multiplier + offset."""
+    if cat_key == "temperature":
+        fa, fb = TEMP_TO_CELSIUS[fid]
+        ta, tb = TEMP_TO_CELSIUS[tid]
+        return float(fa / ta), float((fb - tb) / ta)
+    units = {u[0]: u[3] for u in CATEGORIES[cat_key]["units"]}
+    return units[fid] / units[tid], 0.0
+
+def unit_json(cat_key, unit):
+    uid, name, sym, *_ = unit
+    return {"id": uid, "name": name, "symbol": sym, "slug": SLUG_MAP[(cat_key, uid)]}
+
+def pair_data(cat_key, fid, tid):
+    """Content of a pair's data.json: the numbers its HTML page shows."""
+    units = {u[0]: u for u in CATEGORIES[cat_key]["units"]}
+    multiplier, offset = coefficients(cat_key, fid, tid)
+    if cat_key == "temperature":
+        table = [[v, temp_convert(v, fid, tid)] for v in TEMP_TABLE_VALUES]
+    else:
+        table = [[v, v * units[fid][3] / units[tid][3]] for v in TABLE_VALUES]
+    return {
+        "category": cat_key,
+        "from": unit_json(cat_key, units[fid]),
+        "to": unit_json(cat_key, units[tid]),
+        "multiplier": multiplier,
+        "offset": offset,
+        "table": table,
+        "page": "/" + os.path.dirname(pair_path(cat_key, fid, tid)).replace(os.sep, "/") + "/",
+    }
+
+def units_data(cat_key):
+    """Content of a category's units.json: every unit's coefficients to the base unit."""
+    cat = CATEGORIES[cat_key]
+    base = "celsius" if cat_key == "temperature" else next(u[0] for u in cat["units"] if u[3] == 1)
+    units = []
+    for unit in cat["units"]:
+        multiplier, offset = coefficients(cat_key, unit[0], base)
+        units.append({**unit_json(cat_key, unit), "multiplier": multiplier, "offset": offset})
+    return {
+        "category": cat_key,
+        "name": cat["name"],
+        "base": base,
+        "units": units,
+        "pair_data": f"/{cat_key}/{{from}}-to-{{to}}/{DATA_FILE}",
+    }
+
+def to_json(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
 
+# ── Generate all pages ────────────────────────────────────────────────────────
 
-print(f"\nTotal pages generated: {total}")
-print("Done! Please run gen_sitemap.py to update sitemap.xml.")
+def pair_path(cat_key, fid, tid):
+    """Output path of a pair page, relative to the site root."""
+    return os.path.join(cat_key, f"{SLUG_MAP[(cat_key, fid)]}-to-{SLUG_MAP[(cat_key, tid)]}", "index.html")
+
+def data_path(cat_key, fid, tid):
+    """Output path of a pair's data.json, next to its page."""
+    return os.path.join(os.path.dirname(pair_path(cat_key, fid, tid)), DATA_FILE)
+
+def units_path(cat_key):
+    return os.path.join(cat_key, UNITS_FILE)
+
+def json_files():
+    """Every JSON endpoint this generator writes, relative to the site root."""
+    files = []
+    for cat_key, cat in CATEGORIES.items():
+        files.append(units_path(cat_key))
+        files += [data_path(cat_key, a[0], b[0]) for a in cat["units"] for b in cat["units"] if a is not b]
+    return files
+
+def render_pair(base, cat_key, fid, tid):
+    """Render one pair page and its data.json into base. Returns True if either file changed."""
+    cat = CATEGORIES[cat_key]
+    units = {u[0]: u for u in cat["units"]}
+    html = make_page(cat_key, cat, units[fid], units[tid])
+    page_changed = write_if_changed(os.path.join(base, pair_path(cat_key, fid, tid)), html)
+    data_changed = write_if_changed(os.path.join(base, data_path(cat_key, fid, tid)), to_json(pair_data(cat_key, fid, tid)))
+    return page_changed or data_changed
+
+def render_units(base, cat_key):
+    return write_if_changed(os.path.join(base, units_path(cat_key)), to_json(units_data(cat_key)))
+
+class _NodeCounter(HTMLParser):
+    """Counts the element and text nodes (whitespace between tags included) in a fragment."""
+    def __init__(self, html):
+        super().__init__()
+        self.nodes = 0
+        self.feed(html)
+        self.close()
+
+    def handle_starttag(self, tag, attrs):
+        self.nodes += 1
+
+    def handle_data(self, data):
+        self.nodes += 1
+
+def related_savings(cat_key, fid, tid):
+    """(bytes, DOM nodes) the top-K related links save on one page versus listing every pair,
+    measured on the rendered related-links markup."""
+    k = RELATED_LINKS.get(cat_key, RELATED_LINKS["default"])
+    top = "".join(related_columns(related_links(cat_key, fid, tid, k)))
+    full = "".join(related_columns(related_links(cat_key, fid, tid, None)))
+    return len(full.encode()) - len(top.encode()), _NodeCounter(full).nodes - _NodeCounter(top).nodes
+
+def main(base=BASE):
+    total = 0
+    changed = 0
+    saved_bytes = saved_nodes = 0
+
+    for cat_key, cat in CATEGORIES.items():
+        render_units(base, cat_key)
+        units = cat["units"]
+        for i, from_unit in enumerate(units):
+            for j, to_unit in enumerate(units):
+                if i == j:
+                    continue
+                # Write file (only if its content changed)
+                if render_pair(base, cat_key, from_unit[0], to_unit[0]):
+                    changed += 1
+                total += 1
+                b, n = related_savings(cat_key, from_unit[0], to_unit[0])
+                saved_bytes += b
+                saved_nodes += n
+
+                if total % 100 == 0:
+                    print(f"  Generated {total} pages...")
+
+    print(f"\nTotal pages generated: {total} ({changed} changed)")
+    if total:
+        print(f"Ranked related links saved {saved_bytes / 1024:,.0f} KB and {saved_nodes:,} DOM nodes "
+              f"({saved_bytes / total / 1024:.1f} KB, {saved_nodes // total} nodes per page)")
+    cat_key, cat = next(iter(CATEGORIES.items()))
+    fid, tid = cat["units"][0][0], cat["units"][1][0]
+    html_size = len(make_page(cat_key, cat, cat["units"][0], cat["units"][1]).encode())
+    data_size = len(to_json(pair_data(cat_key, fid, tid)).encode())
+    print(f"JSON endpoints: {total} {DATA_FILE} + {len(CATEGORIES)} {UNITS_FILE} "
+          f"(e.g. {data_size:,} bytes vs {html_size:,} bytes of HTML)")
+    report_blocking("pair", make_page(cat_key, cat, cat["units"][0], cat["units"][1]))
+    print("Done! Please run gen_sitemap.py to update sitemap.xml.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+gen_search_index.py
+Builds search-index.json, the unit search index behind js/search.js (the
+search box in the site header). Generated from the same registries as the
+pages: CATEGORIES and SLUG_MAP (gen_pair_pages.py) and STATES
+(gen_land_pages.py), plus the search-only ALIASES below.
+
+Every unit, symbol, alias, category and land state name is normalized the
+way search.js normalizes a query (lowercase, accents and punctuation
+stripped, "m²" -> "m2") and stored as one sorted, front-coded list of terms:
+each term keeps only the characters it doesn't share with the previous one.
+A parallel list maps each term to the targets it names (a unit of a
+category, a land unit of a state, a state, a category). The client decodes
+the list once and answers each keystroke with a binary search over it, so
+"psi to b" is two prefix lookups and a filter, not a server round trip.
+"""
+
+import os, re, json, unicodedata
+
+from site_common import write_if_changed
+import gen_pair_pages
+import gen_land_pages
+
+BASE = os.getcwd()
+INDEX_FILE = "search-index.json"
+
+# Search-only spellings, plurals and shorthand, keyed by (category, unit id)
+ALIASES = {
+    ("length", "meter"):        ["metre", "metres"],
+    ("length", "kilometer"):    ["kilometre", "kms"],
+    ("length", "centimeter"):   ["centimetre"],
+    ("length", "millimeter"):   ["millimetre"],
+    ("length", "micrometer"):   ["micron", "um"],
+    ("length", "foot"):         ["feet"],
+    ("length", "nautical"):     ["nautical miles"],
+    ("temperature", "celsius"): ["centigrade", "c"],
+    ("temperature", "fahrenheit"): ["f"],
+    ("area", "sqmeter"):        ["sq m", "sqm", "square metre", "square meters", "m2"],
+    ("area", "sqkilometer"):    ["sq km", "square kilometre"],
+    ("area", "sqcentimeter"):   ["sq cm"],
+    ("area", "sqmillimeter"):   ["sq mm"],
+    ("area", "sqmile"):         ["sq mi"],
+    ("area", "sqyard"):         ["sq yd", "sq yards"],
+    ("area", "sqfoot"):         ["sq ft", "sqft", "square feet", "ft2"],
+    ("area", "sqinch"):         ["sq in", "square inches"],
+    ("volume", "liter"):        ["litre", "litres", "ltr"],
+    ("volume", "milliliter"):   ["millilitre", "ml"],
+    ("volume", "cubicmeter"):   ["cubic metre", "cbm"],
+    ("volume", "cubicfoot"):    ["cubic feet", "cu ft"],
+    ("volume", "usgallon"):     ["gallon", "gallons"],
+    ("volume", "usfloz"):       ["fluid ounce", "floz"],
+    ("volume", "uscup"):        ["cup", "cups"],
+    ("weight", "kilogram"):     ["kilo", "kilos", "kgs"],
+    ("weight", "gram"):         ["gm", "gms"],
+    ("weight", "tonne"):        ["tonne", "tonnes", "metric tonne"],
+    ("weight", "pound"):        ["lbs"],
+    ("time", "second"):         ["sec", "secs"],
+    ("time", "minute"):         ["mins"],
+    ("time", "hour"):           ["hr", "hrs"],
+    ("speed", "kph"):           ["kmph", "km per hour", "kilometers per hour"],
+    ("speed", "mph"):           ["miles per hour"],
+    ("speed", "mps"):           ["meters per second"],
+    ("speed", "knot"):          ["kt"],
+    ("pressure", "atm"):        ["atmospheres"],
+    ("energy", "kilocalorie"):  ["food calorie"],
+    ("energy", "kwh"):          ["kilowatt hour"],
+}
+
+# Target kinds: [UNIT, cat, unit id, slug, name, symbol], [LAND, state, unit label, slug],
+# [STATE, state], [CATEGORY, cat] (cat and state are list indexes)
+UNIT, LAND, STATE, CATEGORY = 0, 1, 2, 3
+
+# ── Normalization (mirrors normalize() in js/search.js) ───────────────────────
+
+def normalize(text):
+    text = text.lower().replace("µ", "u").replace("μ", "u")
+    text = re.sub("[\\u0300-\\u036f]", "", unicodedata.normalize("NFKD", text))
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+def plural(name):
+    return name + ("es" if name.endswith(("s", "x", "ch", "sh")) else "s")
+
+def unit_terms(name, sym, extra=()):
+    """Normalized terms for one unit: name, plural, symbol (with and without spaces), aliases."""
+    terms = {normalize(name), normalize(plural(name)), normalize(sym), *map(normalize, extra)}
+    terms |= {t.replace(" ", "") for t in (normalize(sym), *map(normalize, extra))}
+    return {t for t in terms if t}
+
+def land_terms(label, sym):
+    """"Bigha (Pucca)" -> bigha pucca, bigha, pucca; "Sq Yard (Gaj)" -> ..., gaj."""
+    terms = {normalize(label), normalize(sym), normalize(plural(label))}
+    m = re.match(r"(.*?)\s*\((.*)\)$", label)
+    if m:
+        terms |= {normalize(m.group(1)), normalize(m.group(2))}
+    return {t for t in terms if t}
+
+# ── Index ─────────────────────────────────────────────────────────────────────
+
+def collect():
+    """Return (targets, {term: set of target indexes}, popular pairs per category)."""
+    targets, postings = [], {}
+    def add(target, terms):
+        targets.append(target)
+        for t in terms:
+            postings.setdefault(t, set()).add(len(targets) - 1)
+
+    cats = list(gen_pair_pages.CATEGORIES)
+    unit_index = {}
+    for ci, (cat_key, cat) in enumerate(gen_pair_pages.CATEGORIES.items()):
+        add([CATEGORY, ci], {normalize(cat_key), normalize(cat.get("name", cat_key))})
+        for uid, name, sym, *_ in cat["units"]:
+            unit_index[(cat_key, uid)] = len(targets)
+            add([UNIT, ci, uid, gen_pair_pages.SLUG_MAP[(cat_key, uid)], name, sym],
+                unit_terms(name, sym, ALIASES.get((cat_key, uid), ())))
+
+    for si, state in enumerate(gen_land_pages.STATES):
+        words = {w for w in normalize(f"{state['name']} {state.get('short', '')}").split() if len(w) > 1}
+        add([STATE, si], words | {normalize(state["name"])})
+        slugs = gen_land_pages.pair_slugs(state)
+        for uid, label, sym, *_ in state["units"]:
+            add([LAND, si, label, slugs[uid]], land_terms(label, sym))
+
+    popular = [[[unit_index[(cat_key, a)], unit_index[(cat_key, b)]]
+                for a, b in gen_pair_pages.RANKED_PAIRS[cat_key][0]] for cat_key in cats]
+    return targets, postings, popular
+
+def front_code(terms):
+    """Sorted terms as one string: per line, shared-prefix length (base 36) + the rest."""
+    lines, prev = [], ""
+    for term in terms:
+        n = 0
+        while n < min(len(prev), len(term), 35) and prev[n] == term[n]:
+            n += 1
+        lines.append("0123456789abcdefghijklmnopqrstuvwxyz"[n] + term[n:])
+        prev = term
+    return "\n".join(lines)
+
+def build_index():
+    targets, postings, popular = collect()
+    terms = sorted(postings)
+    return {
+        "cats": list(gen_pair_pages.CATEGORIES),
+        "states": [[s["slug"], s["name"]] for s in gen_land_pages.STATES],
+        "targets": targets,
+        "terms": front_code(terms),
+        "postings": [sorted(postings[t]) for t in terms],
+        "popular": popular,
+    }
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main(base=BASE):
+    index = build_index()
+    data = json.dumps(index, ensure_ascii=False, separators=(",", ":")) + "\n"
+    write_if_changed(os.path.join(base, INDEX_FILE), data)
+    n_terms = len(index["postings"])
+    raw = sum(len(t) + 1 for t in sorted(collect()[1]))
+    print(f"Wrote {INDEX_FILE}: {n_terms} terms, {len(index['targets'])} targets, "
+          f"{len(data.encode()):,} bytes (terms front-coded to {len(index['terms']):,} of {raw:,} chars)")
+
+if __name__ == "__main__":
+    main()
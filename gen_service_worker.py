@@ -0,0 +1,156 @@
+"""
+gen_service_worker.py
+Generates /sw.js, the service worker that keeps the site usable on flaky
+mobile connections. Run by build.py after every page generator.
+
+  - Precache: the homepage, category pages, land hub, css/style.css, the js
+    bundle (app.js, hamburger.js, search.js, js/units/), search-index.json
+    and the PRECACHE_PAIRS most popular pair pages of each category, served
+    cache-first.
+  - Runtime cache: any other pair page, stale-while-revalidate, in an LRU
+    cache bounded to RUNTIME_MAX_ENTRIES pages.
+
+The precache manifest (URL -> content hash) is built from the generators' own
+output paths and the bytes actually written, and embedded in sw.js. Any
+changed file changes sw.js, the browser installs the new worker, and only the
+entries whose hash changed are downloaded again; the rest stay cached.
+"""
+
+import os, json, hashlib
+
+from site_common import write_if_changed
+import gen_pair_pages
+import gen_land_pages
+import gen_category_pages
+import gen_js_modules
+
+BASE = os.getcwd()
+SW_FILE = "sw.js"
+
+PRECACHE_PAIRS = 3         # most popular pair pages per category
+RUNTIME_MAX_ENTRIES = 60   # other pair pages kept for offline use
+
+# ── Manifest ──────────────────────────────────────────────────────────────────
+
+def precache_files():
+    """Site-relative paths of every file to precache, in install order."""
+    files = ["index.html", "css/style.css", "js/app.js", "js/hamburger.js", "js/search.js", "search-index.json"]
+    files += [rel.replace("\\", "/") for rel in gen_js_modules.render_all(gen_js_modules.read_source())]
+    files += [f"{k}/index.html" for k in gen_category_pages.CATEGORIES]
+    files.append(gen_land_pages.HUB_PATH.replace("\\", "/"))
+    for cat_key, (popular, _) in gen_pair_pages.RANKED_PAIRS.items():
+        files += [gen_pair_pages.pair_path(cat_key, a, b).replace("\\", "/") for a, b in popular[:PRECACHE_PAIRS]]
+    return files
+
+def url_path(rel):
+    """URL path a file is requested under: directory indexes by their trailing slash."""
+    return "/" + (rel[:-len("index.html")] if rel.endswith("index.html") else rel)
+
+def build_manifest(base):
+    """{url path: content hash} for every precached file. Returns (manifest, total bytes)."""
+    manifest, total = {}, 0
+    for rel in precache_files():
+        with open(os.path.join(base, rel), "rb") as f:
+            data = f.read()
+        manifest[url_path(rel)] = hashlib.sha1(data).hexdigest()[:10]
+        total += len(data)
+    return manifest, total
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+
+def render_sw(manifest):
+    entries = ",\n".join(f"  {json.dumps(url)}: {json.dumps(rev)}" for url, rev in manifest.items())
+    return f"""// sw.js — generated by gen_service_worker.py. Do not edit.
+// PRECACHE pages and assets are served cache-first and refreshed only when
+// their content hash changes; other pair pages are stale-while-revalidate
+// in an LRU cache of RUNTIME_MAX pages.
+'use strict';
+
+const PRECACHE = {{
+{entries}
+}};
+const PRECACHE_NAME = 'precache';
+const RUNTIME_NAME = 'pages';
+const RUNTIME_MAX = {RUNTIME_MAX_ENTRIES};
+// /length/meter-to-foot/ and /land/rajasthan/bigha-pucca-to-acre/
+const PAIR_PAGE = /^\\/[a-z]+\\/(?:[a-z0-9-]+\\/)?[a-z0-9-]+-to-[a-z0-9-]+\\/$/;
+
+// Cache key carries the content hash, so a changed file gets a new entry
+function cacheKey(path) {{
+  return new URL(path + '?__rev=' + PRECACHE[path], self.location).href;
+}}
+
+function sitePath(url) {{
+  return url.pathname.endsWith('/index.html') ? url.pathname.slice(0, -'index.html'.length) : url.pathname;
+}}
+
+self.addEventListener('install', event => {{
+  event.waitUntil(caches.open(PRECACHE_NAME).then(cache =>
+    Promise.all(Object.keys(PRECACHE).map(path =>
+      cache.match(cacheKey(path)).then(hit => hit || fetch(path, {{ cache: 'no-cache' }}).then(res => {{
+        if (res.ok) return cache.put(cacheKey(path), res);
+      }})).catch(() => {{}})  // a missing entry just falls through to the network
+    ))
+  ).then(() => self.skipWaiting()));
+}});
+
+self.addEventListener('activate', event => {{
+  const wanted = new Set(Object.keys(PRECACHE).map(cacheKey));
+  event.waitUntil(caches.open(PRECACHE_NAME).then(cache =>
+    cache.keys().then(keys => Promise.all(keys.filter(req => !wanted.has(req.url)).map(req => cache.delete(req))))
+  ).then(() => self.clients.claim()));
+}});
+
+// Cache.keys() lists entries in insertion order, so re-inserting on use
+// keeps the least recently used pages first in line for eviction
+function trim(cache) {{
+  return cache.keys().then(keys =>
+    Promise.all(keys.slice(0, Math.max(0, keys.length - RUNTIME_MAX)).map(req => cache.delete(req))));
+}}
+
+function offline() {{
+  return caches.open(PRECACHE_NAME).then(cache => cache.match(cacheKey('/')))
+    .then(hit => hit || new Response('Offline', {{ status: 503, headers: {{ 'Content-Type': 'text/plain' }} }}));
+}}
+
+function staleWhileRevalidate(event, path) {{
+  return caches.open(RUNTIME_NAME).then(cache => cache.match(path).then(hit => {{
+    const update = fetch(event.request).then(res => {{
+      if (!res.ok) return res;
+      const copy = res.clone();
+      return cache.delete(path).then(() => cache.put(path, copy)).then(() => trim(cache)).then(() => res);
+    }});
+    if (!hit) return update.catch(offline);
+    const touched = hit.clone();
+    event.waitUntil(update.catch(() => cache.delete(path).then(() => cache.put(path, touched))));
+    return hit;
+  }}));
+}}
+
+self.addEventListener('fetch', event => {{
+  const req = event.request;
+  if (req.method !== 'GET') return;
+  const url = new URL(req.url);
+  if (url.origin !== self.location.origin) return;
+  const path = sitePath(url);
+  if (Object.prototype.hasOwnProperty.call(PRECACHE, path)) {{
+    event.respondWith(caches.open(PRECACHE_NAME)
+      .then(cache => cache.match(cacheKey(path)))
+      .then(hit => hit || fetch(req)));
+  }} else if (req.mode === 'navigate' && PAIR_PAGE.test(path)) {{
+    event.respondWith(staleWhileRevalidate(event, path));
+  }}
+}});
+"""
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main(base=BASE):
+    manifest, total = build_manifest(base)
+    write_if_changed(os.path.join(base, SW_FILE), render_sw(manifest))
+    pages = sum(1 for url in manifest if url.endswith("/"))
+    print(f"Wrote {SW_FILE}: {len(manifest)} precached files ({pages} pages, {total / 1024:.0f} KB), "
+          f"runtime LRU of {RUNTIME_MAX_ENTRIES} pair pages")
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,16 @@ Includes:
 - Category pages
 - Pair pages
 - Land pages
+
+Output is deterministic: directories are walked in sorted order and each
+<lastmod> is the date the page's content last changed, tracked by content
+hash in sitemap-lastmod.json, so an unchanged site rebuilds to the same bytes.
 """
 
 import os
-import datetime
+import json
+import hashlib
+from site_common import write_if_changed, build_date, load_popularity, is_value_dir
 
 BASE_URL = "https://www.swapunits.online"
 BASE_DIR = os.getcwd()
@@ -21,7 +27,43 @@ PRIORITY_MAIN = "0.8"   # Categories, About, Privacy
 PRIORITY_LAND = "0.8"   # Land Hub
 PRIORITY_PAGE = "0.7"   # Pair pages, Land state pages
 
-def get_files():
+# With popularity.json (analyze_logs.py), pair and land pages get a priority
+# between these by traffic rank instead of PRIORITY_PAGE
+PRIORITY_PAGE_MIN = 0.5
+PRIORITY_PAGE_MAX = 0.9
+
+LASTMOD_FILE = "sitemap-lastmod.json"
+
+def load_lastmod(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_lastmod(path, manifest):
+    write_if_changed(path, json.dumps(manifest, indent=1, sort_keys=True) + "\n")
+
+def content_lastmod(manifest, path, file_path, today):
+    """Return the stored lastmod for path, or today if the file's content changed."""
+    with open(file_path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    entry = manifest.get(path)
+    if entry and entry["sha1"] == digest:
+        return entry["lastmod"]
+    manifest[path] = {"sha1": digest, "lastmod": today}
+    return today
+
+def page_priorities(popularity):
+    """{url path: priority} ranking pages by hits; pages without hits get the minimum."""
+    ranked = sorted(popularity, key=lambda p: (-popularity[p], p))
+    span = PRIORITY_PAGE_MAX - PRIORITY_PAGE_MIN
+    return {p: f"{PRIORITY_PAGE_MAX - span * i / len(ranked):.1f}" for i, p in enumerate(ranked)}
+
+def get_files(base_dir=BASE_DIR, manifest=None, popularity=None):
+    if manifest is None:
+        manifest = {}
+    ranks = page_priorities(popularity) if popularity else None
+    today = build_date().isoformat()
     urls = []
     
     # 1. Static & Root pages
@@ -32,17 +74,20 @@ def get_files():
     ]
 
     for filename, path, prio in static_pages:
-        if os.path.exists(os.path.join(BASE_DIR, filename)):
+        file_path = os.path.join(base_dir, filename)
+        if os.path.exists(file_path):
             urls.append({
                 "loc": f"{BASE_URL}{path}",
-                "lastmod": datetime.date.today().isoformat(),
+                "lastmod": content_lastmod(manifest, path, file_path, today),
                 "priority": prio
             })
 
-    # 2. Crawl for index.html in subdirectories
-    for root, dirs, files in os.walk(BASE_DIR):
+    # 2. Crawl for index.html in subdirectories (sorted, so output order is stable)
+    for root, dirs, files in os.walk(base_dir):
+        # Value pages have their own rolling sitemaps (gen_value_pages.py)
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and "__" not in d and not is_value_dir(d))
         if "index.html" in files:
-            rel_path = os.path.relpath(root, BASE_DIR)
+            rel_path = os.path.relpath(root, base_dir)
             if rel_path == ".":
                 continue # Already handled root index.html
             
@@ -60,11 +105,16 @@ def get_files():
             # Determine priority
             # Top level categories (e.g. length, weight, land)
             is_top_level = "/" not in url_path.strip("/")
-            priority = PRIORITY_MAIN if is_top_level else PRIORITY_PAGE
+            if is_top_level:
+                priority = PRIORITY_MAIN
+            elif ranks is not None:
+                priority = ranks.get(f"/{url_path}", f"{PRIORITY_PAGE_MIN:.1f}")
+            else:
+                priority = PRIORITY_PAGE
             
             urls.append({
                 "loc": f"{BASE_URL}/{url_path}",
-                "lastmod": datetime.date.today().isoformat(),
+                "lastmod": content_lastmod(manifest, f"/{url_path}", os.path.join(root, "index.html"), today),
                 "priority": priority
             })
             
@@ -85,14 +135,28 @@ def generate_sitemap(urls):
     xml.append('</urlset>')
     return "\n".join(xml)
 
-if __name__ == "__main__":
+def main(base_dir=BASE_DIR, manifest_path=None, update_manifest=True):
+    """Write sitemap.xml into base_dir.
+
+    manifest_path defaults to base_dir/sitemap-lastmod.json. Pass
+    update_manifest=False to read the manifest without recording new dates.
+    """
+    if manifest_path is None:
+        manifest_path = os.path.join(base_dir, LASTMOD_FILE)
+    manifest = load_lastmod(manifest_path)
+
     print("Scanning directory for sitemap generation...")
-    urls = get_files()
+    urls = get_files(base_dir, manifest, load_popularity())
     print(f"Found {len(urls)} URLs.")
     
     xml_content = generate_sitemap(urls)
-    
-    with open("sitemap.xml", "w", encoding="utf-8") as f:
-        f.write(xml_content)
+    write_if_changed(os.path.join(base_dir, "sitemap.xml"), xml_content)
+    if update_manifest:
+        # Forget pages that no longer exist
+        live = {u["loc"][len(BASE_URL):] for u in urls}
+        save_lastmod(manifest_path, {k: v for k, v in manifest.items() if k in live})
         
     print("sitemap.xml created successfully.")
+
+if __name__ == "__main__":
+    main()
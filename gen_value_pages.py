@@ -0,0 +1,400 @@
+"""
+gen_value_pages.py
+Generates long-tail value pages such as /length/kilometer-to-mile/5/ ("5
+Kilometer to Mile") for the values people search for. Off unless
+value-pages.json exists next to this script:
+
+  {
+    "values": [1, 2, 5, 10, 20, 50, 100],        pages for every selected pair
+    "pairs_per_category": 12,                    top-ranked pairs per category (null: every pair)
+    "pairs": {"length/kilometer-to-mile": [21.0975, 42.195]}    extra values for one pair
+  }
+
+Built for hundreds of thousands of pages with memory that stays flat:
+
+  - Work is streamed: (pair, values) items come from a generator and at most
+    IN_FLIGHT_PER_WORKER items per worker are queued on the process pool.
+  - Pages are sharded by directory: a pair's value pages sit in that pair's
+    own directory, so no directory holds more than one pair's values.
+  - Sitemap entries are streamed, in a stable order, into
+    sitemap-values-N.xml files of at most SITEMAP_MAX_URLS URLs, listed by
+    the sitemap index sitemap-values.xml. A value page's <lastmod> is that of
+    its pair page (sitemap-lastmod.json), so nothing is kept per value page.
+  - robots.txt gets a Sitemap: line for sitemap-values.xml while there are
+    value pages, so crawlers find the index without any page linking to it.
+  - A pair whose values, data and templates are unchanged since the last run
+    (one fingerprint per pair in .build/cache/) is not re-rendered at all.
+
+Value pages and their sitemaps are removed again when value-pages.json no
+longer selects them.
+"""
+
+import os, json, shutil, hashlib, filecmp, argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+from gen_pair_pages import CATEGORIES, RANKED_PAIRS, fmt, temp_convert, pair_path
+from gen_sitemap import BASE_URL, LASTMOD_FILE, load_lastmod
+from site_common import (write_if_changed, build_date, is_value_dir, resource_hints,
+                         gtag_head, adsense_head, ADSENSE_PUB_ID, versioned)
+
+BASE = os.getcwd()
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.join(SRC_DIR, "value-pages.json")
+CACHE_DIR = os.path.join(SRC_DIR, ".build", "cache")
+
+SITEMAP_INDEX = "sitemap-values.xml"
+SITEMAP_SHARD = "sitemap-values-{}.xml"
+SITEMAP_MAX_URLS = 50000    # sitemaps.org limit per file
+ROBOTS_FILE = "robots.txt"
+PRIORITY_VALUE = "0.4"
+
+IN_FLIGHT_PER_WORKER = 4    # queued (pair, values) items per worker process
+NEIGHBOURS = 12             # other values of the same pair linked from each page
+
+# Sources whose edits change every value page
+TEMPLATE_FILES = ["gen_value_pages.py", "gen_pair_pages.py", "site_common.py",
+                  "js/hamburger.js", "js/search.js"]
+
+# ── Work items ────────────────────────────────────────────────────────────────
+
+def load_json(path, default=None):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+def value_slug(value):
+    """Directory name of a value: 5 -> "5", 0.25 -> "0.25", 1e-05 -> "0.00001"."""
+    return format(Decimal(repr(float(value))).normalize(), "f")
+
+def pair_key(cat_key, fid, tid):
+    """"length/kilometer-to-mile": a pair's directory, relative to the site root."""
+    return os.path.dirname(pair_path(cat_key, fid, tid)).replace(os.sep, "/")
+
+def work_items(config):
+    """Yield (cat_key, fid, tid, [values]) for every selected pair, in ranked order."""
+    limit = config.get("pairs_per_category")
+    extra = config.get("pairs", {})
+    for cat_key, (popular, rest) in RANKED_PAIRS.items():
+        for rank, (fid, tid) in enumerate(popular + rest):
+            values = list(config.get("values", [])) if limit is None or rank < limit else []
+            values += extra.get(pair_key(cat_key, fid, tid), [])
+            if values:
+                by_slug = {value_slug(v): float(v) for v in values}
+                yield cat_key, fid, tid, sorted(by_slug.values())
+
+def template_hash():
+    h = hashlib.sha1()
+    for name in TEMPLATE_FILES:
+        with open(os.path.join(SRC_DIR, name), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def fingerprint(template, cat_key, fid, tid, values):
+    return hashlib.sha1(json.dumps([template, cat_key, fid, tid, values]).encode()).hexdigest()
+
+def cache_path(base):
+    key = hashlib.sha1(os.path.abspath(base).encode()).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"value-pages-{key}.json")
+
+# ── Page template ─────────────────────────────────────────────────────────────
+
+def convert(cat_key, from_unit, to_unit, value):
+    if cat_key == "temperature":
+        return temp_convert(value, from_unit[0], to_unit[0])
+    return value * from_unit[3] / to_unit[3]
+
+def make_value_page(cat_key, from_unit, to_unit, value, values):
+    cat = CATEGORIES[cat_key]
+    fid, fname, fsym, *_ = from_unit
+    tid, tname, tsym, *_ = to_unit
+    v, r = fmt(value), fmt(convert(cat_key, from_unit, to_unit, value))
+    pair_url = f"/{pair_key(cat_key, fid, tid)}/"
+    canonical = f"{BASE_URL}{pair_url}{value_slug(value)}/"
+    if cat_key == "temperature":
+        working = f"{v} {fsym} = {r} {tsym}"
+    else:
+        working = f"{v} {fsym} &times; {fmt(from_unit[3] / to_unit[3])} = {r} {tsym}"
+
+    i = values.index(value)
+    start = max(0, min(i - NEIGHBOURS // 2, len(values) - NEIGHBOURS - 1))
+    rows = "\n            ".join(
+        f'<tr><td><a href="../{value_slug(n)}/">{fmt(n)} {fsym}</a></td>'
+        f'<td>{fmt(convert(cat_key, from_unit, to_unit, n))} {tsym}</td></tr>'
+        for n in values[start:start + NEIGHBOURS + 1] if n != value)
+
+    title = f"{v} {fname} to {tname} | {v} {fsym} in {tsym}"
+    desc = f"{v} {fname} ({fsym}) equals {r} {tname} ({tsym}). See the formula and nearby values."
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+  {resource_hints()}
+  {gtag_head()}
+  <title>{title}</title>
+  <meta name="description" content="{desc}" />
+  <meta name="robots" content="index, follow" />
+  <link rel="canonical" href="{canonical}" />
+  <meta property="og:title" content="{v} {fname} to {tname}" />
+  <meta property="og:description" content="{desc}" />
+  <meta property="og:url" content="{canonical}" />
+  <meta property="og:type" content="website" />
+  <link rel="stylesheet" href="/css/style.css" />
+  <script src="/{versioned('js/hamburger.js')}" defer></script>
+  <script src="/{versioned('js/search.js')}" defer></script>
+  {adsense_head()}
+</head>
+<body data-category="{cat_key}">
+
+  <header class="site-header" role="banner">
+    <div class="header-inner">
+      <a href="/" class="site-logo" aria-label="SwapUnits.online Home">
+        Swap<span class="logo-accent">Units</span><span class="logo-tld">.online</span>
+      </a>
+      <span class="header-tagline">Free Online Unit Converter</span>
+    </div>
+  </header>
+
+  <div class="page-wrapper">
+    <main class="main-content" role="main">
+
+      <nav class="breadcrumb" aria-label="Breadcrumb">
+        <a href="/">Home</a> <span>&rsaquo;</span>
+        <a href="/{cat_key}/">{cat["cat_label"]}</a> <span>&rsaquo;</span>
+        <a href="{pair_url}">{fname} to {tname}</a> <span>&rsaquo;</span>
+        <span>{v} {fsym}</span>
+      </nav>
+
+      <article class="converter-card pair-page-card">
+        <div class="converter-card-header">
+          <h1>{cat["icon"]} {v} {fname} to {tname}</h1>
+        </div>
+        <div class="pair-page-body">
+          <p class="pair-intro"><strong>{v} {fname} ({fsym})</strong> equals <strong>{r} {tname} ({tsym})</strong>.</p>
+          <p>{working}</p>
+          <p><a href="{pair_url}">Convert another value from {fname} to {tname}</a></p>
+        </div>
+      </article>
+
+      <section class="pair-table-card">
+        <h2>Nearby {fname} to {tname} Values</h2>
+        <table class="pair-table">
+          <thead>
+            <tr><th>{fname} [{fsym}]</th><th>{tname} [{tsym}]</th></tr>
+          </thead>
+          <tbody>
+            {rows}
+          </tbody>
+        </table>
+      </section>
+
+      <div aria-label="Advertisement">
+        <ins class="adsbygoogle"
+             style="display:block"
+             data-ad-client="{ADSENSE_PUB_ID}"
+             data-ad-slot="1122334455"
+             data-ad-format="auto"></ins>
+        <script>(adsbygoogle = window.adsbygoogle || []).push({{}});</script>
+      </div>
+
+    </main>
+  </div>
+
+  <footer class="site-footer" role="contentinfo">
+    <div class="footer-bottom" style="max-width:1200px;margin:0 auto;padding:20px;display:flex;justify-content:space-between;font-size:0.8rem;color:rgba(255,255,255,0.45);">
+      <span>&copy; 2026 SwapUnits.online &mdash; All rights reserved.</span>
+      <span><a href="/privacy.html" style="color:inherit;">Privacy</a> &middot; <a href="/sitemap.html" style="color:inherit;">Sitemap</a></span>
+    </div>
+  </footer>
+
+</body>
+</html>"""
+
+def render_values(base, cat_key, fid, tid, values):
+    """Worker: write one pair's value pages. Returns the number of files that changed."""
+    units = {u[0]: u for u in CATEGORIES[cat_key]["units"]}
+    pair_dir = os.path.join(base, os.path.dirname(pair_path(cat_key, fid, tid)))
+    return sum(write_if_changed(os.path.join(pair_dir, value_slug(v), "index.html"),
+                                make_value_page(cat_key, units[fid], units[tid], v, values))
+               for v in values)
+
+def remove_stale(base, cat_key, fid, tid, keep=()):
+    """Delete value directories of one pair that aren't in keep. Returns how many."""
+    pair_dir = os.path.join(base, os.path.dirname(pair_path(cat_key, fid, tid)))
+    try:
+        names = os.listdir(pair_dir)
+    except FileNotFoundError:
+        return 0
+    stale = [n for n in names if is_value_dir(n) and n not in keep]
+    for name in stale:
+        shutil.rmtree(os.path.join(pair_dir, name))
+    return len(stale)
+
+# ── Sitemaps ──────────────────────────────────────────────────────────────────
+
+def replace_if_changed(tmp_path, path):
+    """Move tmp_path over path unless both hold the same bytes (keeps the mtime/ETag)."""
+    if os.path.exists(path) and filecmp.cmp(tmp_path, path, shallow=False):
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, path)
+
+class SitemapWriter:
+    """Streams <url> entries into numbered sitemap files of at most SITEMAP_MAX_URLS each."""
+
+    def __init__(self, base):
+        self.base = base
+        self.shards = []     # [(file name, newest lastmod)]
+        self.file = None
+        self.count = 0
+
+    def add(self, loc, lastmod):
+        if self.file is None or self.count == SITEMAP_MAX_URLS:
+            self._roll()
+        self.file.write(f"  <url>\n    <loc>{loc}</loc>\n    <lastmod>{lastmod}</lastmod>\n"
+                        f"    <changefreq>monthly</changefreq>\n    <priority>{PRIORITY_VALUE}</priority>\n  </url>\n")
+        self.count += 1
+        name, newest = self.shards[-1]
+        if lastmod > newest:
+            self.shards[-1] = (name, lastmod)
+
+    def _roll(self):
+        self._finish()
+        name = SITEMAP_SHARD.format(len(self.shards) + 1)
+        self.shards.append((name, ""))
+        self.file = open(os.path.join(self.base, name + ".tmp"), "w", encoding="utf-8")
+        self.file.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        self.count = 0
+
+    def _finish(self):
+        if self.file:
+            self.file.write("</urlset>")
+            self.file.close()
+            self.file = None
+            name = self.shards[-1][0]
+            replace_if_changed(os.path.join(self.base, name + ".tmp"), os.path.join(self.base, name))
+
+    def close(self):
+        """Finish the last file, write the index, and delete shards left over from a bigger run."""
+        self._finish()
+        entries = "".join(f"  <sitemap>\n    <loc>{BASE_URL}/{name}</loc>\n    <lastmod>{lastmod}</lastmod>\n  </sitemap>\n"
+                          for name, lastmod in self.shards)
+        write_if_changed(os.path.join(self.base, SITEMAP_INDEX),
+                         '<?xml version="1.0" encoding="UTF-8"?>\n'
+                         f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n{entries}</sitemapindex>')
+        remove_sitemaps(self.base, keep=len(self.shards))
+
+def remove_sitemaps(base, keep=0):
+    """Delete sitemap-values-N.xml for N > keep (and the index when keep is 0)."""
+    n = keep + 1
+    while os.path.exists(os.path.join(base, SITEMAP_SHARD.format(n))):
+        os.remove(os.path.join(base, SITEMAP_SHARD.format(n)))
+        n += 1
+    if not keep and os.path.exists(os.path.join(base, SITEMAP_INDEX)):
+        os.remove(os.path.join(base, SITEMAP_INDEX))
+
+def update_robots(base, listed):
+    """Add (listed) or drop the Sitemap: line for SITEMAP_INDEX in base's robots.txt."""
+    path = os.path.join(base, ROBOTS_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return
+    entry = f"Sitemap: {BASE_URL}/{SITEMAP_INDEX}"
+    lines = [line for line in lines if line != entry]
+    if listed:
+        # after the last Sitemap: line (sitemap.xml), or at the end
+        at = max((i for i, line in enumerate(lines) if line.startswith("Sitemap:")), default=len(lines) - 1)
+        lines.insert(at + 1, entry)
+    write_if_changed(path, "\n".join(lines) + "\n")
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def all_pairs():
+    for cat_key, cat in CATEGORIES.items():
+        for a in cat["units"]:
+            for b in cat["units"]:
+                if a is not b:
+                    yield cat_key, a[0], b[0]
+
+def main(base=BASE, jobs=None, config_path=CONFIG_FILE):
+    config = load_json(config_path)
+    if config is None:
+        removed = sum(remove_stale(base, *pair) for pair in all_pairs())
+        remove_sitemaps(base)
+        update_robots(base, False)
+        print(f"No {os.path.basename(config_path)}: value pages are off ({removed} stale removed)")
+        return
+
+    known = {pair_key(*pair) for pair in all_pairs()}
+    for key in sorted(set(config.get("pairs", {})) - known):
+        print(f"  [WARN] {os.path.basename(config_path)}: no pair {key!r}")
+
+    cache_file = cache_path(base)
+    stamps = load_json(cache_file, {})  # {pair key: fingerprint} of the last run
+    lastmod = load_lastmod(os.path.join(SRC_DIR, LASTMOD_FILE))
+    today = build_date().isoformat()
+    template = template_hash()
+    sitemap = SitemapWriter(base)
+    new_stamps = {}
+    pages = changed = skipped = removed = 0
+
+    def finish(item, future):
+        nonlocal pages, changed, removed
+        cat_key, fid, tid, values = item
+        key = pair_key(cat_key, fid, tid)
+        if future is not None:
+            changed += future.result()
+        new_stamps[key] = fingerprint(template, *item)
+        slugs = [value_slug(v) for v in values]
+        removed += remove_stale(base, cat_key, fid, tid, keep=set(slugs))
+        pair_lastmod = lastmod.get(f"/{key}/", {}).get("lastmod", today)
+        for slug in slugs:
+            sitemap.add(f"{BASE_URL}/{key}/{slug}/", pair_lastmod)
+        pages += len(values)
+
+    jobs = jobs or os.cpu_count() or 1
+    in_flight = deque()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for item in work_items(config):
+            cat_key, fid, tid, values = item
+            pair_dir = os.path.join(base, os.path.dirname(pair_path(cat_key, fid, tid)))
+            up_to_date = (stamps.get(pair_key(cat_key, fid, tid)) == fingerprint(template, *item)
+                          and all(os.path.exists(os.path.join(pair_dir, value_slug(v), "index.html")) for v in values))
+            if up_to_date:
+                skipped += 1
+            in_flight.append((item, None if up_to_date else pool.submit(render_values, base, *item)))
+            while len(in_flight) > jobs * IN_FLIGHT_PER_WORKER:
+                finish(*in_flight.popleft())
+        while in_flight:
+            finish(*in_flight.popleft())
+    sitemap.close()
+    update_robots(base, bool(sitemap.shards))
+
+    for cat_key, fid, tid in all_pairs():
+        if pair_key(cat_key, fid, tid) not in new_stamps:
+            removed += remove_stale(base, cat_key, fid, tid)
+    write_if_changed(cache_file, json.dumps(new_stamps, indent=1, sort_keys=True) + "\n")
+
+    print(f"Value pages: {pages:,} pages for {len(new_stamps)} pairs ({changed:,} changed, "
+          f"{skipped} pairs unchanged and skipped, {removed:,} stale removed)")
+    print(f"  {SITEMAP_INDEX} lists {len(sitemap.shards)} sitemap file(s) of at most {SITEMAP_MAX_URLS:,} URLs")
+    try:
+        import resource
+        print(f"  peak memory: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:,.0f} MB")
+    except ImportError:  # Windows
+        pass
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate value pages such as /length/kilometer-to-mile/5/")
+    parser.add_argument("--config", default=CONFIG_FILE, help="value list (default: value-pages.json)")
+    parser.add_argument("--out", default=BASE, help="site directory to write into (default: here)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+    main(args.out, args.jobs, args.config)
@@ -0,0 +1,370 @@
+"""
+ingest_land_units.py
+Compiles the land unit spreadsheet ("state units.xlsx", or its CSV export
+state_units_extracted.csv) into land-units.json, the registry
+gen_land_pages.py takes its sq ft factors from.
+
+  - The xlsx is streamed with zipfile and xml.etree.iterparse, shared strings
+    first and then the sheet one row at a time, so no spreadsheet library is
+    needed and memory doesn't grow with the sheet.
+  - Numbers may use Indian digit grouping ("1,07,639") or Western grouping
+    ("107,639"); the grouping is checked before the commas are dropped.
+  - "State(s)" cells such as "Punjab, HR, J&K, HP" are mapped to STATES slugs
+    through STATE_ALIASES. A name it doesn't know is a new state.
+  - Notes that state a relation ("1/20 of Bigha", "40 Gunthas = 1 Acre",
+    "Equal to 10 Cents", "Measured as 132ft x 132ft") are checked against the
+    factors of the units they name, to within RELATION_TOLERANCE.
+  - land-units.json records a hash of the source file and of this script.
+    While both are unchanged, the source isn't read again.
+
+gen_land_pages.py keeps the curated parts of STATES (unit ids, symbols,
+order, notes, descriptions) and takes the sq ft factors from the registry. A
+state only the spreadsheet has gets its own page. Units the spreadsheet lists
+for a state that STATES doesn't have are reported, not added.
+
+Usage:
+  python ingest_land_units.py                  # state units.xlsx
+  python ingest_land_units.py --source state_units_extracted.csv
+  python ingest_land_units.py --check          # validate and report, write nothing
+  python ingest_land_units.py --force          # recompile even if the source is unchanged
+"""
+
+import os, re, csv, sys, json, hashlib, zipfile, argparse
+import xml.etree.ElementTree as ET
+
+import gen_land_pages
+from gen_land_pages import LAND_UNITS_FILE, unit_key
+from site_common import write_if_changed
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_FILE = os.path.join(SRC_DIR, "state units.xlsx")
+
+RELATION_TOLERANCE = 1e-3   # relative; the sheet rounds some factors (Dhur: 68.06)
+ALL_STATES = "all india"
+
+# Names and abbreviations used in the "State(s)" column -> STATES slug.
+# Full state names and slugs are recognised without an entry here.
+STATE_ALIASES = {
+    "up": "uttar-pradesh",          "uttar pradesh": "uttar-pradesh",
+    "punjab": "punjab-haryana",     "haryana": "punjab-haryana",      "pb": "punjab-haryana",
+    "hr": "punjab-haryana",
+    "bihar": "bihar-jharkhand",     "jharkhand": "bihar-jharkhand",
+    "bengal": "west-bengal",        "wb": "west-bengal",
+    "rj": "rajasthan",              "mp": "madhya-pradesh",           "gj": "gujarat",
+    "mh": "maharashtra",            "tn": "tamil-nadu",               "kl": "kerala",
+    "himachal": "himachal-uttarakhand-jk",  "himachal pradesh": "himachal-uttarakhand-jk",
+    "hp": "himachal-uttarakhand-jk",        "uttarakhand": "himachal-uttarakhand-jk",
+    "uk": "himachal-uttarakhand-jk",        "j k": "himachal-uttarakhand-jk",
+    "jammu kashmir": "himachal-uttarakhand-jk",
+    "andhra": "andhra-telangana-karnataka", "andhra pradesh": "andhra-telangana-karnataka",
+    "ap": "andhra-telangana-karnataka",     "telangana": "andhra-telangana-karnataka",
+    "karnataka": "andhra-telangana-karnataka", "ka": "andhra-telangana-karnataka",
+    "as": "assam",                  "tr": "tripura",
+}
+
+# Header text (lowercase prefix) of each column we read
+COLUMNS = {"states": "state", "unit": "unit", "sqft": "sq ft", "note": "note"}
+
+# ── Numbers ───────────────────────────────────────────────────────────────────
+
+PLAIN_RE = re.compile(r"\d+(?:\.\d+)?(?:e[-+]?\d+)?", re.I)
+INDIAN_RE = re.compile(r"\d{1,2}(?:,\d\d)*,\d{3}(?:\.\d+)?")     # 1,07,639
+WESTERN_RE = re.compile(r"\d{1,3}(?:,\d{3})+(?:\.\d+)?")       # 107,639
+
+def parse_number(text):
+    """"1,07,639" -> 107639, "1361.25" -> 1361.25, "43560.0" -> 43560. Raises ValueError."""
+    t = text.strip()
+    if not (PLAIN_RE.fullmatch(t) or INDIAN_RE.fullmatch(t) or WESTERN_RE.fullmatch(t)):
+        raise ValueError(f"not a number: {text!r}")
+    value = float(t.replace(",", ""))
+    return int(value) if value.is_integer() else value
+
+# ── Readers (each yields rows as lists of strings) ────────────────────────────
+
+NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+def first_sheet(z):
+    """Zip member name of the workbook's first sheet."""
+    sheet = ET.fromstring(z.read("xl/workbook.xml")).find(f"{NS}sheets/{NS}sheet")
+    rid = sheet.get(f"{REL_NS}id")
+    for rel in ET.fromstring(z.read("xl/_rels/workbook.xml.rels")):
+        if rel.get("Id") == rid:
+            target = rel.get("Target")
+            return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    raise ValueError(f"workbook has no sheet {rid}")
+
+def shared_strings(z):
+    strings = []
+    if "xl/sharedStrings.xml" not in z.namelist():
+        return strings
+    with z.open("xl/sharedStrings.xml") as f:
+        for _, el in ET.iterparse(f):
+            if el.tag == f"{NS}si":
+                # Plain (<t>) or rich text (<r><t>); phonetic runs (<rPh>) aren't part of the value
+                strings.append("".join(t.text or "" for part in el if part.tag != f"{NS}rPh"
+                                       for t in part.iter(f"{NS}t")))
+                el.clear()
+    return strings
+
+def column_index(ref):
+    """"C12" -> 2."""
+    n = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        n = n * 26 + ord(ch.upper()) - 64
+    return n - 1
+
+def cell_text(c, strings):
+    kind = c.get("t")
+    if kind == "inlineStr":
+        return "".join(t.text or "" for t in c.iter(f"{NS}t"))
+    v = c.find(f"{NS}v")
+    if v is None or v.text is None:
+        return ""
+    if kind == "s":
+        return strings[int(v.text)]
+    if kind == "b":
+        return "TRUE" if v.text == "1" else "FALSE"
+    return v.text
+
+def xlsx_rows(path):
+    with zipfile.ZipFile(path) as z:
+        strings = shared_strings(z)
+        with z.open(first_sheet(z)) as f:
+            for _, el in ET.iterparse(f):
+                if el.tag == f"{NS}row":
+                    row = []
+                    for c in el.iter(f"{NS}c"):
+                        i = column_index(c.get("r")) if c.get("r") else len(row)
+                        row += [""] * (i + 1 - len(row))
+                        row[i] = cell_text(c, strings)
+                    yield row
+                    el.clear()
+
+def csv_rows(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        yield from csv.reader(f)
+
+def read_rows(path):
+    return xlsx_rows(path) if path.lower().endswith(".xlsx") else csv_rows(path)
+
+# ── Records ───────────────────────────────────────────────────────────────────
+
+def normalize(text):
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+def known_states():
+    """{normalized name: slug} for every STATES entry, plus STATE_ALIASES."""
+    names = {}
+    for state in gen_land_pages.STATES:
+        names[normalize(state["slug"].replace("-", " "))] = state["slug"]
+        names[normalize(re.sub(r"\(.*?\)", "", state["name"]))] = state["slug"]
+    names.update(STATE_ALIASES)
+    return names
+
+def new_state_slug(name):
+    return normalize(name).replace(" ", "-")
+
+def state_slugs(cell, names):
+    """"Punjab, HR, J&K" -> ["punjab-haryana", "himachal-uttarakhand-jk"]; [] for All India."""
+    slugs = []
+    for part in cell.split(","):
+        key = normalize(part)
+        if not key or key == ALL_STATES:
+            continue
+        slug = names.get(key, new_state_slug(part))
+        if slug not in slugs:
+            slugs.append(slug)
+    return slugs
+
+def records(rows):
+    """Yield one dict per unit row: line, states (slugs, [] = all), state names, name, sqft, note.
+
+    Blank "State(s)" cells (merged cells) repeat the cell above.
+    """
+    rows = iter(rows)
+    header = [normalize(h) for h in next(rows)]
+    cols = {}
+    for key, prefix in COLUMNS.items():
+        matches = [i for i, h in enumerate(header) if h.startswith(prefix)]
+        if not matches:
+            raise ValueError(f"no {prefix!r} column in header {header}")
+        cols[key] = matches[0]
+    names = known_states()
+    states_cell = ""
+    for line, row in enumerate(rows, start=2):
+        row = row + [""] * (max(cols.values()) + 1 - len(row))
+        if not any(cell.strip() for cell in row):
+            continue
+        states_cell = row[cols["states"]].strip() or states_cell
+        try:
+            sqft = parse_number(row[cols["sqft"]])
+        except ValueError as e:
+            raise ValueError(f"line {line} ({row[cols['unit']]}): {e}") from None
+        yield {
+            "line": line,
+            "states": state_slugs(states_cell, names),
+            "state_names": {new_state_slug(p): p.strip() for p in states_cell.split(",")},
+            "name": row[cols["unit"]].strip(),
+            "sqft": sqft,
+            "note": row[cols["note"]].strip(),
+        }
+
+# ── Sub-unit relations ────────────────────────────────────────────────────────
+
+NUM = r"\d+(?:\.\d+)?"
+# Note patterns (lowercase, no trailing period) -> (unit named, this unit / that unit)
+RELATIONS = [
+    # "1/20 of Bigha", "Exactly 1/3 of Pucca Bigha", "1/8 of an Acre"
+    (re.compile(rf"(?:exactly )?(?P<a>{NUM})/(?P<b>{NUM}) of (?:an? |the )?(?P<ref>.+)"),
+     lambda m: (m["ref"], float(m["a"]) / float(m["b"]))),
+    # "40 Gunthas = 1 Acre"
+    (re.compile(rf"(?P<n>{NUM}) .+? = 1 (?P<ref>.+?)(?: in .+)?"),
+     lambda m: (m["ref"], 1 / float(m["n"]))),
+    # "1 Bigha = 5 Katthas in Assam"
+    (re.compile(rf"1 (?P<ref>.+?) = (?P<n>{NUM}) .+?(?: in .+)?"),
+     lambda m: (m["ref"], 1 / float(m["n"]))),
+    # "Equal to 10 Cents", "Local name for 1 Acre", "Defined as 1600 sq yards"
+    (re.compile(rf"(?:equal to|local name for|defined as) (?P<n>{NUM}) (?P<ref>.+)"),
+     lambda m: (m["ref"], float(m["n"]))),
+    # "Measured as 132ft x 132ft"
+    (re.compile(rf"measured as (?P<a>{NUM}) ?ft x (?P<b>{NUM}) ?ft"),
+     lambda m: ("square feet", float(m["a"]) * float(m["b"]))),
+]
+
+def relation(note):
+    """(unit name, multiplier) if the note says this unit = multiplier x that unit, else None."""
+    text = re.sub(r"^note: ", "", note.lower().strip().rstrip("."))
+    for pattern, read in RELATIONS:
+        m = pattern.fullmatch(text)
+        if m:
+            return read(m)
+    return None
+
+def resolve(ref, record, recs):
+    """The record a note's unit name refers to: a unit of the same states before an All India
+    one, an exact name before a partial one ("Bigha" for "Bigha (Pucca)"). None if unclear."""
+    key = unit_key(ref)
+    local = [r for r in recs if r is not record and r["states"] and set(r["states"]) & set(record["states"])]
+    national = [r for r in recs if r is not record and not r["states"]]
+    for scope in (local, national):
+        for match in (lambda r: unit_key(r["name"]) == key, lambda r: key <= unit_key(r["name"])):
+            found = [r for r in scope if match(r)]
+            if len(found) == 1:
+                return found[0]
+            if found:
+                return None
+    return None
+
+def check_relations(recs):
+    """Return (problems, relations checked, warnings)."""
+    problems, warnings, checked = [], [], 0
+    base = {"line": 0, "states": [], "name": "Square Feet", "sqft": 1, "note": ""}
+    for rec in recs:
+        rel = relation(rec["note"])
+        if rel is None:
+            continue
+        ref_name, multiplier = rel
+        ref = resolve(ref_name, rec, recs + [base])
+        if ref is None:
+            warnings.append(f"line {rec['line']} ({rec['name']}): note {rec['note']!r} names no unit of its states")
+            continue
+        expected = multiplier * ref["sqft"]
+        checked += 1
+        if abs(rec["sqft"] - expected) > RELATION_TOLERANCE * expected:
+            problems.append(f"line {rec['line']} ({rec['name']} = {rec['sqft']} sq ft): note {rec['note']!r} "
+                            f"gives {expected:g} sq ft from {ref['name']} = {ref['sqft']}")
+    return problems, checked, warnings
+
+# ── Registry ──────────────────────────────────────────────────────────────────
+
+def source_key(path):
+    """Hash of the source file and of this script, read in chunks."""
+    h = hashlib.sha1()
+    for name in (path, os.path.abspath(__file__)):
+        with open(name, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+def compile_registry(recs, source, key):
+    unit = lambda r: {"name": r["name"], "sqft": r["sqft"], "note": r["note"].rstrip(".")}
+    states = {}
+    for rec in recs:
+        for slug in rec["states"]:
+            entry = states.setdefault(slug, {"name": rec["state_names"].get(slug, slug), "units": []})
+            entry["units"].append(unit(rec))
+    return {
+        "source": os.path.basename(source),
+        "key": key,
+        "national": [unit(r) for r in recs if not r["states"]],
+        "states": states,
+    }
+
+def report(registry):
+    """Print what the registry changes on the site. Returns the number of lines printed."""
+    current = {s["slug"]: s for s in gen_land_pages.STATES}
+    lines = []
+    for slug, entry in registry["states"].items():
+        state = current.get(slug)
+        if state is None:
+            lines.append(f"  [NEW] state {slug!r} ({entry['name']}): {len(entry['units'])} units")
+            continue
+        site = {unit_key(u[1]): u for u in state["units"]}
+        for u in registry["national"] + entry["units"]:
+            match = site.get(unit_key(u["name"]))
+            if match is None:
+                lines.append(f"  [INFO] {slug}: {u['name']} isn't in STATES; add it there to publish it")
+            elif match[3] != u["sqft"]:
+                lines.append(f"  [CHANGED] {slug}: {u['name']} {match[3]} -> {u['sqft']} sq ft")
+    for line in lines:
+        print(line)
+    return len(lines)
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def load_registry(path=LAND_UNITS_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def main(source=SOURCE_FILE, force=False, check=False, registry_path=LAND_UNITS_FILE):
+    """Compile source into the registry. Returns True if land-units.json changed."""
+    key = source_key(source)
+    old = load_registry(registry_path)
+    if old and old.get("key") == key and not force and not check:
+        print(f"{os.path.basename(registry_path)} is up to date with {os.path.basename(source)}")
+        return False
+
+    recs = list(records(read_rows(source)))
+    problems, checked, warnings = check_relations(recs)
+    for w in warnings:
+        print(f"  [WARN] {w}")
+    if problems:
+        raise ValueError(f"{len(problems)} sub-unit relation(s) don't match their factors:\n  "
+                         + "\n  ".join(problems))
+    registry = compile_registry(recs, source, key)
+    print(f"Read {len(recs)} units for {len(registry['states'])} states (+{len(registry['national'])} national) "
+          f"from {os.path.basename(source)}; {checked} sub-unit relations check out")
+    report(registry)
+    if check:
+        return False
+    changed = write_if_changed(registry_path, json.dumps(registry, indent=1, ensure_ascii=False) + "\n")
+    print(f"{'Wrote' if changed else 'Unchanged'}: {os.path.basename(registry_path)}")
+    return changed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile the land unit spreadsheet into land-units.json")
+    parser.add_argument("--source", default=SOURCE_FILE, help="xlsx or csv (default: state units.xlsx)")
+    parser.add_argument("--force", action="store_true", help="recompile even if the source is unchanged")
+    parser.add_argument("--check", action="store_true", help="validate and report only")
+    args = parser.parse_args()
+    try:
+        main(args.source, args.force, args.check)
+    except ValueError as e:
+        print(f"  [ERROR] {e}")
+        sys.exit(1)
@@ -2,11 +2,16 @@
  * app.js — UI Logic for SwapUnits.online
  * Handles tab switching, real-time conversion, swap, copy
  * + Mobile: hamburger menu, dropdown selects
+ * Unit tables come from js/units/loader.js: only the active category's
+ * module is fetched, and the next tab's is prefetched while idle.
  */
 
 (function () {
     'use strict';
 
+    const Units = window.UnitLoader;
+    const formatResult = Units.formatResult;
+
     // ── State ──
     let currentCategory = 'length';
     const MOBILE_BP = 768; // px — below this = mobile behaviour
@@ -94,38 +99,93 @@
     }
 
     // ── Build tabs ──
+    // Category pages ship the tabs pre-rendered; only wire those up
     function buildTabs() {
         if (!tabsContainer) return;
-        tabsContainer.innerHTML = '';
-        Object.entries(CONVERTERS).forEach(([key, cat]) => {
-            const btn = document.createElement('button');
-            btn.className = 'cat-tab' + (key === currentCategory ? ' active' : '');
-            btn.textContent = cat.name;
-            btn.setAttribute('data-category', key);
-            btn.setAttribute('aria-label', cat.name + ' converter');
+        if (!tabsContainer.querySelector('.cat-tab')) {
+            Object.entries(Units.categories).forEach(([key, cat]) => {
+                const btn = document.createElement('button');
+                btn.className = 'cat-tab' + (key === currentCategory ? ' active' : '');
+                btn.textContent = cat.name;
+                btn.setAttribute('data-category', key);
+                btn.setAttribute('aria-label', cat.name + ' converter');
+                tabsContainer.appendChild(btn);
+            });
+        }
+        tabsContainer.querySelectorAll('.cat-tab').forEach(btn => {
+            const key = btn.getAttribute('data-category');
             btn.addEventListener('click', () => switchCategory(key));
-            tabsContainer.appendChild(btn);
+            btn.addEventListener('pointerenter', () => Units.prefetch(key), { once: true });
         });
     }
 
+    // ── Prefetch the tab after the active one ──
+    function prefetchNeighbour(categoryKey) {
+        const keys = Object.keys(Units.categories);
+        const next = keys[(keys.indexOf(categoryKey) + 1) % keys.length];
+        const idle = window.requestIdleCallback ? cb => requestIdleCallback(cb) : cb => setTimeout(cb, 200);
+        idle(() => Units.prefetch(next));
+    }
+
     // ── Build converter UI ──
+    // Each category's widget is built once (or adopted from the page the
+    // server rendered). Switching tabs parks the old widget with its handlers
+    // and re-attaches a parked one instead of rebuilding it.
+    const parked = {};         // category key -> DocumentFragment
+    const quickRefRows = {};   // category key -> rendered <tr> rows
+    let shownKey = null;
+
+    // Resolves once the category's module has loaded and its widget is shown
     function buildConverter(categoryKey) {
-        const cat = CONVERTERS[categoryKey];
-        if (!cat || !converterBody) return;
+        if (!converterBody) return Promise.resolve();
+        return Units.load(categoryKey).then(cat => {
+            // A later tab click won the race; leave its UI alone
+            if (categoryKey === currentCategory) showConverter(categoryKey, cat);
+        });
+    }
+
+    function showConverter(key, cat) {
+        if (key === shownKey) return;
+        const hydrate = !shownKey && converterBody.getAttribute('data-prerendered') === key;
+        converterBody.removeAttribute('data-prerendered');
+        if (shownKey) {
+            const frag = document.createDocumentFragment();
+            while (converterBody.firstChild) frag.appendChild(converterBody.firstChild);
+            parked[shownKey] = frag;
+        }
+        shownKey = key;
+
+        if (parked[key]) {
+            converterBody.appendChild(parked[key]);
+            delete parked[key];
+        } else {
+            if (!hydrate) converterBody.innerHTML = converterMarkup(cat);
+            bindConverter(cat);
+        }
+        fitSelects();
+        if (hydrate) return;
 
         if (pageTitleH1) pageTitleH1.textContent = cat.name + ' Converter';
         if (pageTitle) document.title = cat.name + ' Converter — SwapUnits.online';
-
         const iconEl = document.querySelector('.calc-icon');
         if (iconEl && cat.icon) iconEl.textContent = cat.icon;
+        buildQuickRef(key, cat);
+    }
+
+    // On mobile use size=1 (compact dropdown), on desktop use size=8 (listbox)
+    function fitSelects() {
+        if (!converterBody) return;
+        const size = isMobile() ? '1' : '8';
+        converterBody.querySelectorAll('select').forEach(sel => {
+            if (sel.getAttribute('size') !== size) sel.setAttribute('size', size);
+        });
+    }
 
+    function converterMarkup(cat) {
         const defaultFrom = cat.units[0].id;
         const defaultTo = cat.units[1] ? cat.units[1].id : cat.units[0].id;
-
-        // On mobile use size=1 (compact dropdown), on desktop use size=8 (listbox)
         const selectSize = isMobile() ? '1' : '8';
-
-        converterBody.innerHTML = `
+        return `
       <div class="converter-grid">
         <div class="converter-field">
           <label for="from-value">From</label>
@@ -153,7 +213,17 @@
         <button class="copy-btn" id="copy-btn" aria-label="Copy result">📋 Copy</button>
       </div>
     `;
+    }
 
+    // Only touch the DOM when the text actually changes
+    function setText(el, text) {
+        if (el.textContent !== text) el.textContent = text;
+    }
+    function setValue(el, text) {
+        if (el.value !== text) el.value = text;
+    }
+
+    function bindConverter(cat) {
         const fromVal = document.getElementById('from-value');
         const fromUnit = document.getElementById('from-unit');
         const toVal = document.getElementById('to-value');
@@ -162,22 +232,21 @@
         const copyBtn = document.getElementById('copy-btn');
         const resultEl = document.getElementById('result-value');
         const labelEl = document.getElementById('result-label');
-
-        fromUnit.value = defaultFrom;
-        toUnit.value = defaultTo;
+        let last = null;
 
         function doConvert() {
+            const input = fromVal.value + '|' + fromUnit.value + '|' + toUnit.value;
+            if (input === last) return;
+            last = input;
             const val = parseFloat(fromVal.value);
-            const from = fromUnit.value || defaultFrom;
-            const to = toUnit.value || defaultTo;
-            if (isNaN(val)) { resultEl.textContent = '\u2014'; toVal.value = ''; return; }
-            const result = cat.convert(val, from, to);
-            const formatted = formatResult(result);
-            toVal.value = (formatted === '\u2014') ? '' : formatted;
-            resultEl.textContent = formatted;
-            const fromLabel = cat.units.find(u => u.id === from)?.label || from;
-            const toLabel = cat.units.find(u => u.id === to)?.label || to;
-            labelEl.textContent = `${val} ${fromLabel} =`;
+            const from = fromUnit.value;
+            const to = toUnit.value;
+            if (isNaN(val)) { setText(resultEl, '\u2014'); setValue(toVal, ''); return; }
+            const formatted = formatResult(cat.convert(val, from, to));
+            setValue(toVal, (formatted === '\u2014') ? '' : formatted);
+            setText(resultEl, formatted);
+            const fromLabel = cat.unitById.get(from)?.label || from;
+            setText(labelEl, `${val} ${fromLabel} =`);
         }
 
         fromVal.addEventListener('input', doConvert);
@@ -201,24 +270,25 @@
             }
         });
 
+        // Also catches input typed before the script arrived
         doConvert();
-        buildQuickRef(categoryKey);
     }
 
     // ── Quick Reference Table ──
-    function buildQuickRef(categoryKey) {
+    function buildQuickRef(key, cat) {
         const tableBody = document.getElementById('quick-ref-body');
         if (!tableBody) return;
-        const cat = CONVERTERS[categoryKey];
-        const baseUnit = cat.units[0];
-        const rows = cat.units.slice(1, 9).map(u => {
-            const result = cat.convert(1, baseUnit.id, u.id);
-            return `<tr>
+        if (!quickRefRows[key]) {
+            const baseUnit = cat.units[0];
+            quickRefRows[key] = cat.units.slice(1, 9).map(u => {
+                const result = cat.convert(1, baseUnit.id, u.id);
+                return `<tr>
         <td>1 ${baseUnit.label}</td>
         <td>${formatResult(result)} ${u.label}</td>
       </tr>`;
-        });
-        tableBody.innerHTML = rows.join('');
+            }).join('');
+        }
+        tableBody.innerHTML = quickRefRows[key];
         const refTitle = document.getElementById('quick-ref-title');
         if (refTitle) refTitle.textContent = `Quick Reference — ${cat.name}`;
     }
@@ -229,11 +299,12 @@
         document.querySelectorAll('.cat-tab').forEach(btn => {
             btn.classList.toggle('active', btn.getAttribute('data-category') === key);
         });
-        buildConverter(key);
         // Update both top nav and drawer links
         document.querySelectorAll('.nav-link, .drawer-link').forEach(link => {
             link.classList.toggle('active', link.getAttribute('data-category') === key);
         });
+        prefetchNeighbour(key);
+        return buildConverter(key);
     }
 
     // ── Popular conversions click ──
@@ -243,24 +314,17 @@
                 const cat = item.getAttribute('data-cat');
                 const from = item.getAttribute('data-from');
                 const to = item.getAttribute('data-to');
-                if (cat && from && to) {
-                    switchCategory(cat);
-                    setTimeout(() => {
+                if (cat && from && to && Units.categories[cat]) {
+                    switchCategory(cat).then(() => {
                         const fromUnit = document.getElementById('from-unit');
                         const toUnit = document.getElementById('to-unit');
-                        if (fromUnit) fromUnit.value = from;
-                        if (toUnit) toUnit.value = to;
                         const fromVal = document.getElementById('from-value');
-                        if (fromVal) fromVal.value = '1';
-                        const cat_obj = CONVERTERS[cat];
-                        if (cat_obj) {
-                            const result = cat_obj.convert(1, from, to);
-                            const resultEl = document.getElementById('result-value');
-                            const toVal = document.getElementById('to-value');
-                            if (resultEl) resultEl.textContent = formatResult(result);
-                            if (toVal) toVal.value = formatResult(result);
-                        }
-                    }, 50);
+                        if (!fromUnit || !toUnit || !fromVal) return;
+                        fromUnit.value = from;
+                        toUnit.value = to;
+                        fromVal.value = '1';
+                        fromVal.dispatchEvent(new Event('input'));
+                    });
                 }
             });
         });
@@ -269,24 +333,25 @@
     // ── Init ──
     function init() {
         const bodyCategory = document.body.getAttribute('data-category');
-        if (bodyCategory && CONVERTERS[bodyCategory]) {
+        if (bodyCategory && Units.categories[bodyCategory]) {
             currentCategory = bodyCategory;
         }
 
         buildHamburgerMenu();
         buildTabs();
         buildConverter(currentCategory);
+        prefetchNeighbour(currentCategory);
         bindPopularItems();
 
         document.querySelectorAll('.nav-link').forEach(link => {
             link.classList.toggle('active', link.getAttribute('data-category') === currentCategory);
         });
 
-        // Rebuild on resize so select size updates correctly
+        // Switch select size when crossing the mobile breakpoint
         let resizeTimer;
         window.addEventListener('resize', () => {
             clearTimeout(resizeTimer);
-            resizeTimer = setTimeout(() => buildConverter(currentCategory), 150);
+            resizeTimer = setTimeout(fitSelects, 150);
         });
     }
 
@@ -296,4 +361,9 @@
         init();
     }
 
+    // ── Offline support (sw.js is generated by gen_service_worker.py) ──
+    if ('serviceWorker' in navigator) {
+        window.addEventListener('load', () => navigator.serviceWorker.register('/sw.js'));
+    }
+
 })();
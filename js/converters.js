@@ -1,6 +1,9 @@
 /**
  * converters.js — All unit conversion logic
  * UnitConvert.net
+ *
+ * Factor-based categories get their convert() from indexCategory() below.
+ * gen_js_modules.py splits this file into js/units/ for the pages.
  */
 
 const CONVERTERS = {
@@ -25,12 +28,6 @@ const CONVERTERS = {
       { id: 'furlong', label: 'Furlong', factor: 201.168 },
       { id: 'chain', label: 'Chain', factor: 20.1168 },
     ],
-    convert(value, from, to) {
-      const fromUnit = this.units.find(u => u.id === from);
-      const toUnit = this.units.find(u => u.id === to);
-      if (!fromUnit || !toUnit) return NaN;
-      return value * fromUnit.factor / toUnit.factor;
-    }
   },
 
   temperature: {
@@ -83,12 +80,6 @@ const CONVERTERS = {
       { id: 'sqinch', label: 'Square Inch (in²)', factor: 0.00064516 },
       { id: 'acre', label: 'Acre', factor: 4046.856 },
     ],
-    convert(value, from, to) {
-      const fromUnit = this.units.find(u => u.id === from);
-      const toUnit = this.units.find(u => u.id === to);
-      if (!fromUnit || !toUnit) return NaN;
-      return value * fromUnit.factor / toUnit.factor;
-    }
   },
 
   volume: {
@@ -111,12 +102,6 @@ const CONVERTERS = {
       { id: 'tablespoon', label: 'Tablespoon (tbsp)', factor: 0.0147868 },
       { id: 'teaspoon', label: 'Teaspoon (tsp)', factor: 0.00492892 },
     ],
-    convert(value, from, to) {
-      const fromUnit = this.units.find(u => u.id === from);
-      const toUnit = this.units.find(u => u.id === to);
-      if (!fromUnit || !toUnit) return NaN;
-      return value * fromUnit.factor / toUnit.factor;
-    }
   },
 
   weight: {
@@ -136,12 +121,6 @@ const CONVERTERS = {
       { id: 'ukton', label: 'UK Ton (long ton)', factor: 1016.05 },
       { id: 'carat', label: 'Carat (ct)', factor: 0.0002 },
     ],
-    convert(value, from, to) {
-      const fromUnit = this.units.find(u => u.id === from);
-      const toUnit = this.units.find(u => u.id === to);
-      if (!fromUnit || !toUnit) return NaN;
-      return value * fromUnit.factor / toUnit.factor;
-    }
   },
 
   time: {
@@ -162,12 +141,6 @@ const CONVERTERS = {
       { id: 'decade', label: 'Decade', factor: 315576000 },
       { id: 'century', label: 'Century', factor: 3155760000 },
     ],
-    convert(value, from, to) {
-      const fromUnit = this.units.find(u => u.id === from);
-      const toUnit = this.units.find(u => u.id === to);
-      if (!fromUnit || !toUnit) return NaN;
-      return value * fromUnit.factor / toUnit.factor;
-    }
   },
 
   speed: {
@@ -183,12 +156,6 @@ const CONVERTERS = {
       { id: 'mach', label: 'Mach (at sea level)', factor: 340.29 },
       { id: 'lightspeed', label: 'Speed of Light (c)', factor: 299792458 },
     ],
-    convert(value, from, to) {
-      const fromUnit = this.units.find(u => u.id === from);
-      const toUnit = this.units.find(u => u.id === to);
-      if (!fromUnit || !toUnit) return NaN;
-      return value * fromUnit.factor / toUnit.factor;
-    }
   },
 
   pressure: {
@@ -207,12 +174,6 @@ const CONVERTERS = {
       { id: 'mmhg', label: 'Millimeter of Mercury', factor: 133.322 },
       { id: 'inhg', label: 'Inch of Mercury (inHg)', factor: 3386.39 },
     ],
-    convert(value, from, to) {
-      const fromUnit = this.units.find(u => u.id === from);
-      const toUnit = this.units.find(u => u.id === to);
-      if (!fromUnit || !toUnit) return NaN;
-      return value * fromUnit.factor / toUnit.factor;
-    }
   },
 
   energy: {
@@ -233,15 +194,31 @@ const CONVERTERS = {
       { id: 'ev', label: 'Electronvolt (eV)', factor: 1.602e-19 },
       { id: 'ftlb', label: 'Foot-Pound (ft·lb)', factor: 1.35582 },
     ],
-    convert(value, from, to) {
-      const fromUnit = this.units.find(u => u.id === from);
-      const toUnit = this.units.find(u => u.id === to);
-      if (!fromUnit || !toUnit) return NaN;
-      return value * fromUnit.factor / toUnit.factor;
-    }
   },
 };
 
+// ── Helper: index units by id; factor categories get a memoized convert ──
+function indexCategory(cat) {
+  cat.unitById = new Map(cat.units.map(u => [u.id, u]));
+  if (!cat.convert) {
+    const multipliers = new Map();  // 'from>to' -> fromFactor / toFactor
+    cat.convert = function (value, from, to) {
+      const key = from + '>' + to;
+      let m = multipliers.get(key);
+      if (m === undefined) {
+        const fromUnit = this.unitById.get(from);
+        const toUnit = this.unitById.get(to);
+        m = (fromUnit && toUnit) ? fromUnit.factor / toUnit.factor : NaN;
+        multipliers.set(key, m);
+      }
+      return value * m;
+    };
+  }
+  return cat;
+}
+
+Object.values(CONVERTERS).forEach(indexCategory);
+
 // ── Helper: format number nicely ──
 function formatResult(num) {
   if (isNaN(num) || !isFinite(num)) return '\u2014';
@@ -99,6 +99,79 @@
         }
     }
 
+    // ── Business-Day Engine ──
+    // Dates become day numbers (days since 1970-01-01, UTC), so a span is a
+    // subtraction and DST never shifts a count. Workdays in [a, b) are
+    // whole weeks * workdays per week, plus a remainder-table lookup for the
+    // last 0-6 days, minus two bisects over the calendar's sorted holidays:
+    // the same few steps for any span. date_engine.py is the Python twin and
+    // compiles the holiday calendars into js/holidays.json.
+    const MS_PER_DAY = 24 * 60 * 60 * 1000;
+    const DEFAULT_WEEKEND = [5, 6]; // Monday = 0, so Saturday and Sunday
+
+    function dayNumber(d, m, y) {
+        return Math.floor(Date.UTC(y, m - 1, d) / MS_PER_DAY);
+    }
+
+    function weekdayOf(n) {
+        // 1970-01-01 was a Thursday
+        return (((n + 3) % 7) + 7) % 7;
+    }
+
+    // table[w][r]: workdays among the r days starting on weekday w (r = 0..6)
+    function remainderTable(weekend) {
+        const table = [];
+        for (let w = 0; w < 7; w++) {
+            const row = [0];
+            for (let r = 1; r < 7; r++) {
+                row.push(row[r - 1] + (weekend.includes((w + r - 1) % 7) ? 0 : 1));
+            }
+            table.push(row);
+        }
+        return table;
+    }
+
+    const DEFAULT_TABLE = remainderTable(DEFAULT_WEEKEND);
+
+    function bisectLeft(arr, x) {
+        let lo = 0, hi = arr.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (arr[mid] < x) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    }
+
+    // Workdays in [a, b) and the holidays skipped; calendar is an entry of js/holidays.json
+    function businessDays(a, b, calendar) {
+        const weekend = calendar ? calendar.weekend : DEFAULT_WEEKEND;
+        const table = calendar ? calendar.table : DEFAULT_TABLE;
+        const span = b - a;
+        const count = Math.floor(span / 7) * (7 - weekend.length) + table[weekdayOf(a)][span % 7];
+        const holidays = calendar ? bisectLeft(calendar.days, b) - bisectLeft(calendar.days, a) : 0;
+        return { count: count - holidays, holidays };
+    }
+
+    let holidayData = null; // js/holidays.json once loaded
+
+    function loadCalendars() {
+        const select = document.getElementById('bus-calendar');
+        if (!select) return;
+        fetch('js/holidays.json')
+            .then(res => res.json())
+            .then(data => {
+                data.calendars.forEach(cal => {
+                    cal.table = remainderTable(cal.weekend);
+                    const option = document.createElement('option');
+                    option.value = cal.id;
+                    option.textContent = cal.name;
+                    select.appendChild(option);
+                });
+                holidayData = data;
+            })
+            .catch(() => {}); // weekends-only still works offline
+    }
+
     // ── Tab Logic ──
     const tabs = document.querySelectorAll('.date-calc-tab');
     const tabContents = document.querySelectorAll('.tab-content');
@@ -155,19 +228,8 @@
             const startDate = new Date(start.y, start.m - 1, start.d);
             const endDate = new Date(end.y, end.m - 1, end.d);
 
-            let diffTime = endDate - startDate;
-
-            if (includeEndDate.checked) {
-                if (diffTime >= 0) {
-                    diffTime += (24 * 60 * 60 * 1000);
-                } else {
-                    diffTime = Math.abs(diffTime) + (24 * 60 * 60 * 1000);
-                }
-            } else {
-                diffTime = Math.abs(diffTime);
-            }
-
-            const totalDays = Math.round(diffTime / (1000 * 60 * 60 * 24));
+            const totalDays = Math.abs(dayNumber(end.d, end.m, end.y) - dayNumber(start.d, start.m, start.y))
+                + (includeEndDate.checked ? 1 : 0);
 
             // Calendar breakdown
             let d1 = new Date(Math.min(startDate, endDate));
@@ -291,6 +353,7 @@
     // ── Calculation 3: Business Days ──
     const calculateBusinessBtn = document.getElementById('calculate-business-btn');
     const busIncludeEnd = document.getElementById('bus-include-end');
+    const busCalendar = document.getElementById('bus-calendar');
 
     if (calculateBusinessBtn) {
         calculateBusinessBtn.addEventListener('click', () => {
@@ -302,35 +365,14 @@
                 return;
             }
 
-            const startDate = new Date(start.y, start.m - 1, start.d);
-            const endDate = new Date(end.y, end.m - 1, end.d);
+            // Either order; the end date counts only when included
+            const a = Math.min(dayNumber(start.d, start.m, start.y), dayNumber(end.d, end.m, end.y));
+            const b = Math.max(dayNumber(start.d, start.m, start.y), dayNumber(end.d, end.m, end.y))
+                + (busIncludeEnd.checked ? 1 : 0);
 
-            if (startDate > endDate) {
-                // Swap if start > end for calculation, or handle negative?
-                // Standard biz day calcs usually expect start <= end
-                // Let's just swap for count and note it
-            }
-
-            let count = 0;
-            let curDate = new Date(Math.min(startDate, endDate));
-            const stopDate = new Date(Math.max(startDate, endDate));
-
-            // Loop day by day
-            while (curDate < stopDate) {
-                const dayOfWeek = curDate.getDay();
-                if (dayOfWeek !== 0 && dayOfWeek !== 6) { // 0=Sun, 6=Sat
-                    count++;
-                }
-                curDate.setDate(curDate.getDate() + 1);
-            }
-
-            // Check end date inclusion
-            if (busIncludeEnd.checked) {
-                const dayOfWeek = stopDate.getDay();
-                if (dayOfWeek !== 0 && dayOfWeek !== 6) {
-                    count++;
-                }
-            }
+            const calendarId = busCalendar ? busCalendar.value : '';
+            const calendar = holidayData && holidayData.calendars.find(c => c.id === calendarId);
+            const { count, holidays } = businessDays(a, b, calendar);
 
             // Display
             if (resultSection) resultSection.style.display = 'block';
@@ -342,7 +384,14 @@
 
             // Calculate weeks/work weeks
             const weeks = (count / 5).toFixed(1);
-            resultDetails.textContent = `Does not include weekends (Sat/Sun)`;
+            if (calendar) {
+                const [firstYear, lastYear] = holidayData.years;
+                const outside = Math.min(start.y, end.y) < firstYear || Math.max(start.y, end.y) > lastYear;
+                resultDetails.textContent = `Does not include weekends or ${holidays} ${calendar.name} holidays`
+                    + (outside ? ` (holidays listed for ${firstYear}-${lastYear} only)` : '');
+            } else {
+                resultDetails.textContent = `Does not include weekends (Sat/Sun)`;
+            }
 
             // Alt unit: maybe show hours (8h workday?)
             let altHtml = '';
@@ -378,4 +427,6 @@
     setToday('bus-start');
     setToday('bus-end');
 
+    loadCalendars();
+
 })();
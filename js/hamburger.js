@@ -78,4 +78,9 @@
     } else {
         buildHamburgerMenu();
     }
+
+    // ── Offline support (sw.js is generated by gen_service_worker.py) ──
+    if ('serviceWorker' in navigator) {
+        window.addEventListener('load', () => navigator.serviceWorker.register('/sw.js'));
+    }
 })();
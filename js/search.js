@@ -0,0 +1,222 @@
+/**
+ * search.js — Instant unit search for SwapUnits.online
+ * Adds a search box to the header. The index (search-index.json, built by
+ * gen_search_index.py) is fetched on first focus, decoded once, and every
+ * keystroke is answered with binary searches over its sorted terms.
+ * "psi to bar" -> /pressure/psi-to-bar/, "bigha" -> land state pages,
+ * "bigha to acre" -> /land/{state}/bigha-pucca-to-acre/.
+ */
+(function () {
+    'use strict';
+
+    const INDEX_URL = '/search-index.json';
+    const MAX_RESULTS = 8;
+    const MAX_TERMS = 64;       // prefix expansions per side
+    const UNIT = 0, LAND = 1, STATE = 2, CATEGORY = 3;
+
+    let index = null;
+    let loading = null;
+
+    // ── Index ──
+    function loadIndex() {
+        if (!loading) {
+            loading = fetch(INDEX_URL)
+                .then(res => res.json())
+                .then(raw => { index = decode(raw); return index; })
+                .catch(err => { loading = null; throw err; });
+        }
+        return loading;
+    }
+
+    // Undo the front coding: each line is shared-prefix length (base 36) + suffix
+    function decode(raw) {
+        const terms = [];
+        let prev = '';
+        raw.terms.split('\n').forEach(line => {
+            prev = prev.slice(0, parseInt(line[0], 36)) + line.slice(1);
+            terms.push(prev);
+        });
+        raw.terms = terms;
+        return raw;
+    }
+
+    // Must match normalize() in gen_search_index.py
+    function normalize(s) {
+        return s.toLowerCase().replace(/[µμ]/g, 'u').normalize('NFKD')
+            .replace(/[\u0300-\u036f]/g, '').replace(/[^a-z0-9]+/g, ' ').trim();
+    }
+
+    function lowerBound(terms, q) {
+        let lo = 0, hi = terms.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (terms[mid] < q) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    }
+
+    // Map of target index -> score: 2 for an exact term, 1 for a prefix match
+    function lookup(q) {
+        const hits = new Map();
+        if (!q) return hits;
+        const terms = index.terms;
+        for (let i = lowerBound(terms, q), n = 0; i < terms.length && n < MAX_TERMS && terms[i].startsWith(q); i++, n++) {
+            const score = terms[i] === q ? 2 : 1;
+            index.postings[i].forEach(t => {
+                if ((hits.get(t) || 0) < score) hits.set(t, score);
+            });
+        }
+        return hits;
+    }
+
+    // ── Results ──
+    function pairResult(a, b) {
+        const cat = index.cats[a[1]];
+        return { label: `${a[4]} to ${b[4]}`, hint: `${a[5]} → ${b[5]}`, url: `/${cat}/${a[3]}-to-${b[3]}/` };
+    }
+
+    function stateResult(si, label) {
+        const [slug, name] = index.states[si];
+        return { label: label ? `${label} — ${name}` : `${name} land conversion`, hint: 'Land', url: `/land/${slug}-land-conversion/` };
+    }
+
+    function landPairResult(a, b) {
+        const [slug, name] = index.states[a[1]];
+        return { label: `${a[2]} to ${b[2]} — ${name}`, hint: 'Land', url: `/land/${slug}/${a[3]}-to-${b[3]}/` };
+    }
+
+    function search(query) {
+        const q = normalize(query);
+        if (!q) return [];
+        const m = q.match(/^(.+?) to(?: (.*))?$/);
+        const left = lookup(m ? m[1] : q);
+        const right = m ? lookup(m[2] || '') : null;
+        const scored = [];
+        const targets = index.targets;
+
+        left.forEach((ls, li) => {
+            const a = targets[li];
+            if (a[0] === UNIT) {
+                if (right && right.size) {
+                    right.forEach((rs, ri) => {
+                        const b = targets[ri];
+                        if (b[0] === UNIT && b[1] === a[1] && b[2] !== a[2]) scored.push([ls + rs, pairResult(a, b)]);
+                    });
+                } else {
+                    // Popular pairs with this unit first, then every other unit of its category
+                    const others = [];
+                    index.popular[a[1]].forEach(([x, y]) => {
+                        if (x === li) others.push(y);
+                        else if (y === li) scored.push([ls - 0.25, pairResult(targets[x], a)]);
+                    });
+                    targets.forEach((b, bi) => {
+                        if (b[0] === UNIT && b[1] === a[1] && bi !== li && !others.includes(bi)) others.push(bi);
+                    });
+                    others.forEach((bi, n) => scored.push([ls - (n ? 0.5 : 0), pairResult(a, targets[bi])]));
+                }
+            } else if (a[0] === LAND) {
+                if (right && right.size) {
+                    right.forEach((rs, ri) => {
+                        const b = targets[ri];
+                        if (b[0] === LAND && b[1] === a[1] && b[2] !== a[2]) {
+                            scored.push([ls + rs, landPairResult(a, b)]);
+                        }
+                    });
+                } else {
+                    scored.push([ls - 0.5, stateResult(a[1], a[2])]);
+                }
+            } else if (!right) {
+                if (a[0] === STATE) scored.push([ls, stateResult(a[1])]);
+                else if (a[0] === CATEGORY) {
+                    const cat = index.cats[a[1]];
+                    scored.push([ls, { label: `${cat[0].toUpperCase() + cat.slice(1)} converter`, hint: 'Category', url: `/${cat}/` }]);
+                }
+            }
+        });
+
+        // Stable sort keeps index order (unit order, popular first) among equal scores
+        scored.sort((x, y) => y[0] - x[0]);
+        const seen = new Set();
+        const results = [];
+        for (const [, r] of scored) {
+            if (seen.has(r.url + r.label)) continue;
+            seen.add(r.url + r.label);
+            results.push(r);
+            if (results.length === MAX_RESULTS) break;
+        }
+        return results;
+    }
+
+    // ── UI ──
+    function buildSearchBox() {
+        const headerInner = document.querySelector('.header-inner');
+        if (!headerInner || headerInner.querySelector('.unit-search')) return;
+
+        const form = document.createElement('form');
+        form.className = 'unit-search';
+        form.setAttribute('role', 'search');
+        form.innerHTML = `
+          <input type="search" class="unit-search-input" placeholder="Search, e.g. psi to bar"
+                 aria-label="Search conversions" autocomplete="off" spellcheck="false"
+                 role="combobox" aria-expanded="false" aria-controls="unit-search-results" />
+          <ul class="unit-search-results" id="unit-search-results" role="listbox" hidden></ul>
+        `;
+        const hamburger = document.getElementById('hamburger-btn');
+        headerInner.insertBefore(form, hamburger);
+
+        const input = form.querySelector('input');
+        const list = form.querySelector('ul');
+        let results = [];
+        let active = -1;
+
+        function render() {
+            list.innerHTML = results.map((r, i) =>
+                `<li role="option" id="unit-search-opt-${i}"${i === active ? ' aria-selected="true" class="active"' : ''}>` +
+                `<a href="${r.url}">${r.label}<span class="unit-search-hint">${r.hint}</span></a></li>`
+            ).join('');
+            list.hidden = !results.length;
+            input.setAttribute('aria-expanded', results.length ? 'true' : 'false');
+            if (active >= 0) input.setAttribute('aria-activedescendant', `unit-search-opt-${active}`);
+            else input.removeAttribute('aria-activedescendant');
+        }
+
+        function update() {
+            if (!index) {
+                loadIndex().then(update);
+                return;
+            }
+            results = search(input.value);
+            active = results.length ? 0 : -1;
+            render();
+        }
+
+        input.addEventListener('focus', () => { loadIndex().catch(() => {}); }, { once: true });
+        input.addEventListener('input', update);
+        input.addEventListener('keydown', e => {
+            if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+                if (!results.length) return;
+                e.preventDefault();
+                active = (active + (e.key === 'ArrowDown' ? 1 : results.length - 1)) % results.length;
+                render();
+            } else if (e.key === 'Escape') {
+                results = [];
+                render();
+            }
+        });
+        form.addEventListener('submit', e => {
+            e.preventDefault();
+            if (results[active]) window.location.href = results[active].url;
+        });
+        document.addEventListener('click', e => {
+            if (!form.contains(e.target)) { results = []; render(); }
+        });
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', buildSearchBox);
+    } else {
+        buildSearchBox();
+    }
+
+    window.UnitSearch = { search: q => loadIndex().then(() => search(q)) };
+})();
@@ -0,0 +1,19 @@
+// units/area.js — generated by gen_js_modules.py from js/converters.js. Do not edit.
+export default {
+  name: 'Area',
+  icon: '⬛',
+  baseUnit: 'sqmeter',
+  units: [
+    { id: 'sqmeter', label: 'Square Meter (m²)', factor: 1 },
+    { id: 'sqkilometer', label: 'Square Kilometer (km²)', factor: 1e6 },
+    { id: 'sqcentimeter', label: 'Square Centimeter (cm²)', factor: 1e-4 },
+    { id: 'sqmillimeter', label: 'Square Millimeter (mm²)', factor: 1e-6 },
+    { id: 'sqmicrometer', label: 'Square Micrometer (µm²)', factor: 1e-12 },
+    { id: 'hectare', label: 'Hectare (ha)', factor: 10000 },
+    { id: 'sqmile', label: 'Square Mile (mi²)', factor: 2589988.11 },
+    { id: 'sqyard', label: 'Square Yard (yd²)', factor: 0.836127 },
+    { id: 'sqfoot', label: 'Square Foot (ft²)', factor: 0.092903 },
+    { id: 'sqinch', label: 'Square Inch (in²)', factor: 0.00064516 },
+    { id: 'acre', label: 'Acre', factor: 4046.856 },
+  ],
+};
@@ -0,0 +1,20 @@
+// units/energy.js — generated by gen_js_modules.py from js/converters.js. Do not edit.
+export default {
+  name: 'Energy',
+  icon: '⚡',
+  baseUnit: 'joule',
+  units: [
+    { id: 'joule', label: 'Joule (J)', factor: 1 },
+    { id: 'kilojoule', label: 'Kilojoule (kJ)', factor: 1000 },
+    { id: 'megajoule', label: 'Megajoule (MJ)', factor: 1e6 },
+    { id: 'calorie', label: 'Calorie (cal)', factor: 4.184 },
+    { id: 'kilocalorie', label: 'Kilocalorie (kcal)', factor: 4184 },
+    { id: 'wh', label: 'Watt-Hour (Wh)', factor: 3600 },
+    { id: 'kwh', label: 'Kilowatt-Hour (kWh)', factor: 3600000 },
+    { id: 'mwh', label: 'Megawatt-Hour (MWh)', factor: 3.6e9 },
+    { id: 'btu', label: 'BTU (British Thermal)', factor: 1055.06 },
+    { id: 'therm', label: 'Therm (US)', factor: 1.055e8 },
+    { id: 'ev', label: 'Electronvolt (eV)', factor: 1.602e-19 },
+    { id: 'ftlb', label: 'Foot-Pound (ft·lb)', factor: 1.35582 },
+  ],
+};
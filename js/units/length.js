@@ -0,0 +1,22 @@
+// units/length.js — generated by gen_js_modules.py from js/converters.js. Do not edit.
+export default {
+  name: 'Length',
+  icon: '📏',
+  baseUnit: 'meter',
+  units: [
+    { id: 'meter', label: 'Meter (m)', factor: 1 },
+    { id: 'kilometer', label: 'Kilometer (km)', factor: 1000 },
+    { id: 'centimeter', label: 'Centimeter (cm)', factor: 0.01 },
+    { id: 'millimeter', label: 'Millimeter (mm)', factor: 0.001 },
+    { id: 'micrometer', label: 'Micrometer (µm)', factor: 1e-6 },
+    { id: 'nanometer', label: 'Nanometer (nm)', factor: 1e-9 },
+    { id: 'mile', label: 'Mile (mi)', factor: 1609.344 },
+    { id: 'yard', label: 'Yard (yd)', factor: 0.9144 },
+    { id: 'foot', label: 'Foot (ft)', factor: 0.3048 },
+    { id: 'inch', label: 'Inch (in)', factor: 0.0254 },
+    { id: 'nautical', label: 'Nautical Mile (nmi)', factor: 1852 },
+    { id: 'lightyear', label: 'Light Year (ly)', factor: 9.461e15 },
+    { id: 'furlong', label: 'Furlong', factor: 201.168 },
+    { id: 'chain', label: 'Chain', factor: 20.1168 },
+  ],
+};
@@ -0,0 +1,89 @@
+/**
+ * units/loader.js — generated by gen_js_modules.py from js/converters.js. Do not edit.
+ * Category names and icons up front; each category's unit table is an ES
+ * module fetched on first use (UnitLoader.load) or ahead of time (prefetch).
+ */
+
+(function () {
+  'use strict';
+
+  const CATEGORIES = {
+    "length": {"name": "Length", "icon": "📏", "v": "618356fd"},
+    "temperature": {"name": "Temperature", "icon": "🌡️", "v": "e4cb7eef"},
+    "area": {"name": "Area", "icon": "⬛", "v": "9056d5bf"},
+    "volume": {"name": "Volume", "icon": "🧊", "v": "b3963e8f"},
+    "weight": {"name": "Weight", "icon": "⚖️", "v": "215308ba"},
+    "time": {"name": "Time", "icon": "⏱️", "v": "910a44d7"},
+    "speed": {"name": "Speed", "icon": "🚀", "v": "b0d6d16d"},
+    "pressure": {"name": "Pressure", "icon": "🔵", "v": "0b26a9be"},
+    "energy": {"name": "Energy", "icon": "⚡", "v": "a00fa932"}
+  };
+
+  const BASE = new URL('.', document.currentScript.src);
+  const loaded = {};
+
+  function moduleUrl(key) {
+    return new URL(`${key}.js?v=${CATEGORIES[key].v}`, BASE).href;
+  }
+
+  // Resolves to the indexed category object ({ name, icon, units, unitById, convert })
+  function load(key) {
+    if (!CATEGORIES[key]) return Promise.reject(new Error('unknown category ' + key));
+    if (!loaded[key]) loaded[key] = import(moduleUrl(key)).then(m => indexCategory(m.default));
+    return loaded[key];
+  }
+
+  // Fetch and compile a category in the background without running it
+  function prefetch(key) {
+    if (!CATEGORIES[key] || loaded[key]) return;
+    const href = moduleUrl(key);
+    if (document.querySelector(`link[rel="modulepreload"][href="${href}"]`)) return;
+    const link = document.createElement('link');
+    link.rel = 'modulepreload';
+    link.href = href;
+    document.head.appendChild(link);
+  }
+
+  function indexCategory(cat) {
+    cat.unitById = new Map(cat.units.map(u => [u.id, u]));
+    if (!cat.convert) {
+      const multipliers = new Map();  // 'from>to' -> fromFactor / toFactor
+      cat.convert = function (value, from, to) {
+        const key = from + '>' + to;
+        let m = multipliers.get(key);
+        if (m === undefined) {
+          const fromUnit = this.unitById.get(from);
+          const toUnit = this.unitById.get(to);
+          m = (fromUnit && toUnit) ? fromUnit.factor / toUnit.factor : NaN;
+          multipliers.set(key, m);
+        }
+        return value * m;
+      };
+    }
+    return cat;
+  }
+
+  function formatResult(num) {
+    if (isNaN(num) || !isFinite(num)) return '\u2014';
+    if (num === 0) return '0';
+    const abs = Math.abs(num);
+    // Round to 10 significant digits to eliminate float noise
+    const rounded = parseFloat(num.toPrecision(10));
+    const absR = Math.abs(rounded);
+    // Very small numbers (<= 1e-6): show full decimal, no exponential
+    if (absR <= 0.000001 && absR > 0) {
+      const decimals = Math.max(0, Math.min(20, -Math.floor(Math.log10(absR)) + 5));
+      return rounded.toFixed(decimals).replace(/\.?0+$/, '');
+    }
+    // Numbers >= 1: plain integer or decimal, no commas, no exponential
+    if (absR >= 1) {
+      if (rounded === Math.round(rounded)) return Math.round(rounded).toString();
+      const dec = Math.max(0, 9 - Math.floor(Math.log10(absR)));
+      return parseFloat(rounded.toFixed(dec)).toString();
+    }
+    // Between 0.000001 and 1
+    return parseFloat(rounded.toPrecision(10)).toString();
+  }
+
+  window.UnitLoader = { categories: CATEGORIES, load, prefetch, formatResult };
+})();
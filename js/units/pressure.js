@@ -0,0 +1,18 @@
+// units/pressure.js — generated by gen_js_modules.py from js/converters.js. Do not edit.
+export default {
+  name: 'Pressure',
+  icon: '🔵',
+  baseUnit: 'pascal',
+  units: [
+    { id: 'pascal', label: 'Pascal (Pa)', factor: 1 },
+    { id: 'kilopascal', label: 'Kilopascal (kPa)', factor: 1000 },
+    { id: 'megapascal', label: 'Megapascal (MPa)', factor: 1e6 },
+    { id: 'bar', label: 'Bar', factor: 100000 },
+    { id: 'millibar', label: 'Millibar (mbar)', factor: 100 },
+    { id: 'atm', label: 'Atmosphere (atm)', factor: 101325 },
+    { id: 'psi', label: 'PSI (lb/in²)', factor: 6894.76 },
+    { id: 'torr', label: 'Torr (mmHg)', factor: 133.322 },
+    { id: 'mmhg', label: 'Millimeter of Mercury', factor: 133.322 },
+    { id: 'inhg', label: 'Inch of Mercury (inHg)', factor: 3386.39 },
+  ],
+};
@@ -0,0 +1,15 @@
+// units/speed.js — generated by gen_js_modules.py from js/converters.js. Do not edit.
+export default {
+  name: 'Speed',
+  icon: '🚀',
+  baseUnit: 'mps',
+  units: [
+    { id: 'mps', label: 'Meter/Second (m/s)', factor: 1 },
+    { id: 'kph', label: 'Kilometer/Hour (km/h)', factor: 0.277778 },
+    { id: 'mph', label: 'Mile/Hour (mph)', factor: 0.44704 },
+    { id: 'fps', label: 'Foot/Second (ft/s)', factor: 0.3048 },
+    { id: 'knot', label: 'Knot (kn)', factor: 0.514444 },
+    { id: 'mach', label: 'Mach (at sea level)', factor: 340.29 },
+    { id: 'lightspeed', label: 'Speed of Light (c)', factor: 299792458 },
+  ],
+};
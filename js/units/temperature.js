@@ -0,0 +1,33 @@
+// units/temperature.js — generated by gen_js_modules.py from js/converters.js. Do not edit.
+export default {
+  name: 'Temperature',
+  icon: '🌡️',
+  units: [
+    { id: 'celsius', label: 'Celsius (°C)' },
+    { id: 'fahrenheit', label: 'Fahrenheit (°F)' },
+    { id: 'kelvin', label: 'Kelvin (K)' },
+    { id: 'rankine', label: 'Rankine (°R)' },
+    { id: 'reaumur', label: 'Réaumur (°Ré)' },
+  ],
+  convert(value, from, to) {
+    // Convert to Celsius first
+    let celsius;
+    switch (from) {
+      case 'celsius': celsius = value; break;
+      case 'fahrenheit': celsius = (value - 32) * 5 / 9; break;
+      case 'kelvin': celsius = value - 273.15; break;
+      case 'rankine': celsius = (value - 491.67) * 5 / 9; break;
+      case 'reaumur': celsius = value * 5 / 4; break;
+      default: return NaN;
+    }
+    // Convert from Celsius to target
+    switch (to) {
+      case 'celsius': return celsius;
+      case 'fahrenheit': return celsius * 9 / 5 + 32;
+      case 'kelvin': return celsius + 273.15;
+      case 'rankine': return (celsius + 273.15) * 9 / 5;
+      case 'reaumur': return celsius * 4 / 5;
+      default: return NaN;
+    }
+  }
+};
@@ -0,0 +1,20 @@
+// units/time.js — generated by gen_js_modules.py from js/converters.js. Do not edit.
+export default {
+  name: 'Time',
+  icon: '⏱️',
+  baseUnit: 'second',
+  units: [
+    { id: 'second', label: 'Second (s)', factor: 1 },
+    { id: 'millisecond', label: 'Millisecond (ms)', factor: 0.001 },
+    { id: 'microsecond', label: 'Microsecond (µs)', factor: 1e-6 },
+    { id: 'nanosecond', label: 'Nanosecond (ns)', factor: 1e-9 },
+    { id: 'minute', label: 'Minute (min)', factor: 60 },
+    { id: 'hour', label: 'Hour (h)', factor: 3600 },
+    { id: 'day', label: 'Day (d)', factor: 86400 },
+    { id: 'week', label: 'Week (wk)', factor: 604800 },
+    { id: 'month', label: 'Month (avg)', factor: 2629800 },
+    { id: 'year', label: 'Year (yr)', factor: 31557600 },
+    { id: 'decade', label: 'Decade', factor: 315576000 },
+    { id: 'century', label: 'Century', factor: 3155760000 },
+  ],
+};
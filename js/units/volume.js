@@ -0,0 +1,22 @@
+// units/volume.js — generated by gen_js_modules.py from js/converters.js. Do not edit.
+export default {
+  name: 'Volume',
+  icon: '🧊',
+  baseUnit: 'liter',
+  units: [
+    { id: 'liter', label: 'Liter (L)', factor: 1 },
+    { id: 'milliliter', label: 'Milliliter (mL)', factor: 0.001 },
+    { id: 'cubicmeter', label: 'Cubic Meter (m³)', factor: 1000 },
+    { id: 'cubicfoot', label: 'Cubic Foot (ft³)', factor: 28.3168 },
+    { id: 'cubicinch', label: 'Cubic Inch (in³)', factor: 0.0163871 },
+    { id: 'cubicyard', label: 'Cubic Yard (yd³)', factor: 764.555 },
+    { id: 'usgallon', label: 'US Gallon (gal)', factor: 3.78541 },
+    { id: 'ukgallon', label: 'UK Gallon (gal)', factor: 4.54609 },
+    { id: 'usquart', label: 'US Quart (qt)', factor: 0.946353 },
+    { id: 'uspint', label: 'US Pint (pt)', factor: 0.473176 },
+    { id: 'uscup', label: 'US Cup', factor: 0.236588 },
+    { id: 'usfloz', label: 'US Fluid Ounce (fl oz)', factor: 0.0295735 },
+    { id: 'tablespoon', label: 'Tablespoon (tbsp)', factor: 0.0147868 },
+    { id: 'teaspoon', label: 'Teaspoon (tsp)', factor: 0.00492892 },
+  ],
+};
@@ -0,0 +1,19 @@
+// units/weight.js — generated by gen_js_modules.py from js/converters.js. Do not edit.
+export default {
+  name: 'Weight',
+  icon: '⚖️',
+  baseUnit: 'kilogram',
+  units: [
+    { id: 'kilogram', label: 'Kilogram (kg)', factor: 1 },
+    { id: 'gram', label: 'Gram (g)', factor: 0.001 },
+    { id: 'milligram', label: 'Milligram (mg)', factor: 1e-6 },
+    { id: 'microgram', label: 'Microgram (µg)', factor: 1e-9 },
+    { id: 'tonne', label: 'Metric Ton (t)', factor: 1000 },
+    { id: 'pound', label: 'Pound (lb)', factor: 0.453592 },
+    { id: 'ounce', label: 'Ounce (oz)', factor: 0.0283495 },
+    { id: 'stone', label: 'Stone (st)', factor: 6.35029 },
+    { id: 'uston', label: 'US Ton (short ton)', factor: 907.185 },
+    { id: 'ukton', label: 'UK Ton (long ton)', factor: 1016.05 },
+    { id: 'carat', label: 'Carat (ct)', factor: 0.0002 },
+  ],
+};
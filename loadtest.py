@@ -0,0 +1,290 @@
+"""
+loadtest.py
+Load-tests the built site: serves a site directory locally, replays traffic
+against it and reports throughput, latency percentiles and bytes on the wire,
+so .htaccess caching and compression changes can be measured.
+
+Server: by default a bundled stdlib server (in its own process) that mimics
+what .htaccess asks Apache for:
+  - name.json.gz served as-is with Content-Encoding: gzip (precompress.py)
+  - other text responses gzipped on the fly, like mod_deflate
+  - Apache-style ETags ("size-mtime", "-gzip" when compressed) and 304s
+--url points the clients at a server of your own instead, e.g. Apache or
+nginx with the site directory as its docroot.
+
+Traffic: a Zipf distribution over the real URL set (every page in
+sitemap.xml plus the JSON endpoints), most popular first when
+popularity.json has hits, or a replay of the request paths in access logs.
+Each client is one keep-alive connection with its own ETag cache, like one
+browser; --conditional makes it revalidate pages it has seen.
+
+--matrix runs the same request sequence four times on the bundled server:
+with and without precompressed files, and with and without conditional
+requests.
+
+Usage:
+  python loadtest.py                        # Zipf traffic against this directory
+  python loadtest.py --base .build/current --requests 50000 --clients 16 --matrix
+  python loadtest.py --log /var/log/apache2/access.log --conditional
+  python loadtest.py --url http://127.0.0.1:8080
+"""
+
+import os, re, sys, gzip, time, random, argparse, statistics, http.client, multiprocessing
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from itertools import accumulate
+from urllib.parse import urlsplit
+
+import precompress
+from analyze_logs import REQUEST_RE, open_log
+from gen_sitemap import BASE_URL
+from site_common import load_popularity
+
+BASE = os.getcwd()
+
+LOC_RE = re.compile(r"<loc>([^<]+)</loc>")
+# Compressed on the fly when precompressed copies are off or missing (.htaccess AddOutputFilterByType DEFLATE)
+COMPRESSIBLE = {"text/html", "text/css", "text/javascript", "application/javascript", "application/json",
+                "text/plain", "application/xml", "text/xml", "image/svg+xml"}
+DEFLATE_LEVEL = 6  # mod_deflate's default
+
+# ── Bundled server ────────────────────────────────────────────────────────────
+
+class SiteHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as browsers get from Apache
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def respond(self, send_body):
+        url_path = self.path.split("?", 1)[0].split("#", 1)[0]
+        path = self.translate_path(url_path)
+        if os.path.isdir(path):
+            if not url_path.endswith("/"):
+                self.send_response(301)
+                self.send_header("Location", url_path + "/")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            path = os.path.join(path, "index.html")
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+
+        ctype = self.guess_type(path)
+        accepts_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        encoding = None
+        if accepts_gzip and self.server.precompressed and path.endswith(".json") and os.path.isfile(path + ".gz"):
+            path, encoding = path + ".gz", "gzip"
+        elif accepts_gzip and ctype in COMPRESSIBLE:
+            encoding = "deflate-filter"
+
+        st = os.stat(path)
+        etag = f"{st.st_size:x}-{st.st_mtime_ns // 1000:x}"
+        etag = f'"{etag}-gzip"' if encoding == "deflate-filter" else f'"{etag}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        with open(path, "rb") as f:
+            data = f.read()
+        if encoding == "deflate-filter":
+            data = gzip.compress(data, compresslevel=DEFLATE_LEVEL, mtime=0)
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        if encoding:
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+
+def serve(base, precompressed, ports):
+    """Server process: serve base on a free port and report the port through the ports queue."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(SiteHandler, directory=base))
+    server.precompressed = precompressed
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+def start_server(base, precompressed):
+    """Returns (process, port)."""
+    ports = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=serve, args=(base, precompressed, ports), daemon=True)
+    proc.start()
+    return proc, ports.get(timeout=10)
+
+# ── Traffic ───────────────────────────────────────────────────────────────────
+
+def site_urls(base):
+    """Every page in sitemap.xml plus every JSON endpoint the build generates, as URL paths."""
+    with open(os.path.join(base, "sitemap.xml"), encoding="utf-8") as f:
+        pages = [loc[len(BASE_URL):] or "/" for loc in LOC_RE.findall(f.read())]
+    endpoints = ["/" + rel.replace(os.sep, "/") for rel in precompress.json_files()]
+    return pages + [url for url in endpoints if os.path.exists(os.path.join(base, url.lstrip("/")))]
+
+def zipf_requests(urls, n, s=1.0, seed=1):
+    """n URL paths drawn from a Zipf distribution: the k-th most popular URL has weight 1 / k^s.
+    Known hits (popularity.json) decide the order; the rest keep sitemap order."""
+    hits = load_popularity()
+    ranked = sorted(urls, key=lambda url: -hits.get(url, 0))  # stable, so ties keep sitemap order
+    cum = list(accumulate(1 / k ** s for k in range(1, len(ranked) + 1)))
+    return random.Random(seed).choices(ranked, cum_weights=cum, k=n)
+
+def log_requests(paths, n=None):
+    """The GET/HEAD paths of successful requests in access logs, in order (the first n)."""
+    requests = []
+    for path in paths:
+        with open_log(path) as f:
+            for line in f:
+                m = REQUEST_RE.search(line)
+                if m:
+                    requests.append(m.group(1).decode("latin-1"))
+                    if n is not None and len(requests) >= n:
+                        return requests
+    return requests
+
+# ── Clients ───────────────────────────────────────────────────────────────────
+
+def header_bytes(resp):
+    """Size of the status line and headers as sent."""
+    status_line = len(f"HTTP/1.1 {resp.status} {resp.reason}\r\n")
+    return status_line + sum(len(k) + len(v) + 4 for k, v in resp.getheaders()) + 2
+
+def run_client(host, port, paths, conditional):
+    """One keep-alive connection requesting paths in order. Returns (latencies, statuses, bytes, gzipped)."""
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    etags = {}
+    latencies, statuses = [], Counter()
+    wire = gzipped = 0
+    for path in paths:
+        headers = {"Accept-Encoding": "gzip"}
+        if conditional and path in etags:
+            headers["If-None-Match"] = etags[path]
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()  # reconnects on the next request
+            statuses["error"] += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+        statuses[resp.status] += 1
+        wire += header_bytes(resp) + len(body)
+        gzipped += resp.getheader("Content-Encoding") == "gzip"
+        if resp.getheader("ETag"):
+            etags[path] = resp.getheader("ETag")
+    conn.close()
+    return latencies, statuses, wire, gzipped
+
+def run(host, port, requests, clients, conditional):
+    """Spread requests round-robin over clients and run them concurrently. Returns a result dict."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        results = list(pool.map(lambda i: run_client(host, port, requests[i::clients], conditional), range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(l for r in results for l in r[0])
+    statuses = sum((r[1] for r in results), Counter())
+    # No percentiles when nothing came back (server down, every connection refused)
+    if len(latencies) > 1:
+        q = statistics.quantiles(latencies, n=100, method="inclusive")
+    else:
+        q = latencies * 99 or [None] * 99
+    return {
+        "requests": len(requests), "answered": len(latencies), "elapsed": elapsed, "statuses": statuses,
+        "p50": q[49], "p95": q[94], "p99": q[98],
+        "bytes": sum(r[2] for r in results), "gzipped": sum(r[3] for r in results),
+    }
+
+# ── Report ────────────────────────────────────────────────────────────────────
+
+def report(label, r):
+    rps = r["requests"] / r["elapsed"]
+    statuses = "  ".join(f"{k}: {v:,}" for k, v in sorted(r["statuses"].items(), key=lambda kv: str(kv[0])))
+    print(f"{label}: {r['requests']:,} requests in {r['elapsed']:.2f}s = {rps:,.0f} req/s")
+    if not r["answered"]:
+        print(f"  0 successful requests ({r['statuses']['error']:,} errors): is the server up?")
+        return
+    print(f"  latency p50 {r['p50'] * 1000:.2f} ms  p95 {r['p95'] * 1000:.2f} ms  p99 {r['p99'] * 1000:.2f} ms")
+    print(f"  {statuses}")
+    print(f"  on the wire: {r['bytes'] / 1048576:,.1f} MB ({r['bytes'] / r['requests'] / 1024:,.1f} KB/request, "
+          f"{r['bytes'] / 1048576 / r['elapsed']:,.1f} MB/s); {r['gzipped']:,} gzip responses")
+
+def summary(rows):
+    print(f"\n{'precompressed':<14}{'conditional':<13}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'MB':>9}")
+    for precompressed, conditional, r in rows:
+        ms = "".join(f"{r[p] * 1000:>9.2f}" if r["answered"] else f"{'-':>9}" for p in ("p50", "p95", "p99"))
+        print(f"{'on' if precompressed else 'off':<14}{'on' if conditional else 'off':<13}"
+              f"{r['requests'] / r['elapsed']:>9,.0f}{ms}{r['bytes'] / 1048576:>9.1f}")
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the built site and measure it under replayed traffic")
+    parser.add_argument("--base", default=BASE, help="site directory to serve and take URLs from (default: here)")
+    parser.add_argument("--url", help="test this server instead of the bundled one, e.g. http://127.0.0.1:8080")
+    parser.add_argument("--log", nargs="+", help="replay the requests in these access logs (.gz allowed)")
+    parser.add_argument("--requests", type=int, default=None, help="requests to send (default: 20,000, or every log line)")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent keep-alive connections (default: 8)")
+    parser.add_argument("--zipf", type=float, default=1.0, help="Zipf exponent s (default: 1.0)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for Zipf traffic (default: 1)")
+    parser.add_argument("--conditional", action="store_true", help="revalidate seen URLs with If-None-Match")
+    parser.add_argument("--no-precompressed", action="store_true", help="bundled server ignores .json.gz files")
+    parser.add_argument("--matrix", action="store_true", help="run all four precompressed/conditional combinations")
+    args = parser.parse_args()
+
+    base = os.path.abspath(args.base)
+    if args.log:
+        requests = log_requests(args.log, args.requests)
+        print(f"Replaying {len(requests):,} requests from {len(args.log)} log files")
+    else:
+        urls = site_urls(base)
+        requests = zipf_requests(urls, args.requests or 20000, args.zipf, args.seed)
+        print(f"Zipf traffic (s = {args.zipf}): {len(requests):,} requests over {len(urls):,} URLs, "
+              f"{len(set(requests)):,} distinct")
+    if not requests:
+        print("No requests to send.")
+        return 1
+    if not any(os.path.exists(os.path.join(base, rel + ".gz")) for rel in precompress.json_files()):
+        print("  (no .json.gz files under --base; run python build.py or precompress.py first)")
+
+    if args.url:
+        if args.matrix:
+            parser.error("--matrix needs the bundled server (precompression is a server setting)")
+        target = urlsplit(args.url)
+        r = run(target.hostname, target.port or 80, requests, args.clients, args.conditional)
+        report(f"{args.url}, conditional {'on' if args.conditional else 'off'}", r)
+        return 0 if r["answered"] else 1
+
+    combos = [(p, c) for p in (True, False) for c in (False, True)] if args.matrix \
+        else [(not args.no_precompressed, args.conditional)]
+    rows = []
+    for precompressed, conditional in combos:
+        proc, port = start_server(base, precompressed)
+        try:
+            r = run("127.0.0.1", port, requests, args.clients, conditional)
+        finally:
+            proc.terminate()
+            proc.join()
+        report(f"\nprecompressed {'on' if precompressed else 'off'}, conditional {'on' if conditional else 'off'}", r)
+        rows.append((precompressed, conditional, r))
+    if len(rows) > 1:
+        summary(rows)
+    return 0 if all(r["answered"] for _, _, r in rows) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
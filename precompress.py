@@ -0,0 +1,51 @@
+"""
+precompress.py
+Writes a gzipped copy (name.json.gz) next to every JSON endpoint the build
+generates: each pair's data.json, each category's units.json,
+search-index.json, the land matrix and the holiday calendars. .htaccess
+serves the .gz file as-is to clients that accept gzip, so a JSON request
+costs Apache a file read and no compression work.
+
+The .gz files are compressed once at level 9 with a zero timestamp, so they
+are byte-identical across builds. They are build output only (.gitignore'd);
+--out and --release builds contain them, and an in-place build writes them
+into the working tree.
+"""
+
+import os, gzip
+
+import gen_pair_pages
+import gen_search_index
+import gen_land_matrix
+import date_engine
+from site_common import write_if_changed
+
+BASE = os.getcwd()
+
+def json_files():
+    """Site-relative paths of every generated JSON file."""
+    return gen_pair_pages.json_files() + [gen_search_index.INDEX_FILE, gen_land_matrix.MATRIX_FILE,
+                                         date_engine.HOLIDAYS_JS]
+
+def compress(path):
+    """Write path + ".gz" if it is missing or stale. Returns (changed, raw bytes, gzipped bytes).
+    Written atomically and only on change, so the .gz keeps its mtime (and ETag) between builds
+    and Apache never serves a half-written file."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    packed = gzip.compress(raw, compresslevel=9, mtime=0)
+    return write_if_changed(path + ".gz", packed), len(raw), len(packed)
+
+def main(base=BASE):
+    files = json_files()
+    changed = raw_total = packed_total = 0
+    for rel in files:
+        c, raw, packed = compress(os.path.join(base, rel))
+        changed += c
+        raw_total += raw
+        packed_total += packed
+    print(f"Precompressed {len(files)} JSON files ({changed} changed): "
+          f"{raw_total / 1024:,.0f} KB -> {packed_total / 1024:,.0f} KB gzipped")
+
+if __name__ == "__main__":
+    main()
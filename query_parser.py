@@ -0,0 +1,195 @@
+"""
+query_parser.py
+Parses free-text conversion queries such as "5.5 kanal in marla", "20 C to F"
+or "3 km/h to mph" into (value, category, from unit, to unit), for scripts
+and tools that take conversions as text.
+
+Units are recognised by one compiled regex whose alternatives are every alias
+of every unit: ids, names, plurals, symbols and URL slugs from CATEGORIES
+(gen_pair_pages.py), land units from STATES (gen_land_pages.py) and the
+search-only ALIASES (gen_search_index.py), all normalized the way the search
+box normalizes what it's typed ("km/h" -> "km h", "°C" -> "c"). The regex
+settles where one unit ends and the next starts ("5 sq in to cm2",
+"5 in in cm") in a single match instead of a chain of replacements.
+
+A term several units share ("gal", "c", "bigha", "sq ft") resolves the same
+way every time. Each term's units are ranked: the PREFERRED unit first, then
+registry order (CATEGORIES before STATES, units in their listed order). The
+first from-unit that has a to-unit in the same category (or, for land units,
+the same state) wins, so "20 c to f" is Celsius, "2 c to years" is centuries
+and "5 gal to l" is US gallons. Land queries can be pinned to one state.
+
+parse() is memoized with an LRU cache, so a repeated query is a dict lookup.
+
+Usage:
+  python query_parser.py "5.5 kanal in marla" "20 C to F"
+  python query_parser.py --state rajasthan "2 bigha to acre"
+  some-tool | python query_parser.py          (one query per line)
+  python query_parser.py --bench 200000
+"""
+
+import re, sys, time, random, argparse
+from collections import namedtuple
+from functools import lru_cache
+
+import gen_pair_pages
+import gen_land_pages
+from gen_search_index import ALIASES as SEARCH_ALIASES, normalize, unit_terms, land_terms
+
+CACHE_SIZE = 4096
+
+# Pinned answers for terms several units share, so reordering a registry
+# never changes what they mean: term -> unit id
+PREFERRED = {
+    "gal": "usgallon",      # not ukgallon
+    "c":   "celsius",       # not century or the speed of light
+    "ms":  "millisecond",   # not m/s
+    "dec": "decade",        # the West Bengal decimal is "decimal"
+}
+
+# value: category, from/to unit ids; state: land state slug (category "land") or None
+Query = namedtuple("Query", "value category from_id to_id state")
+
+# ── Alias table ───────────────────────────────────────────────────────────────
+# A unit target is (category, unit id, state slug or None)
+
+def build_aliases():
+    """{normalized term: tuple of unit targets, best first}."""
+    aliases = {}
+    def add(target, terms):
+        for t in terms:
+            if t:
+                aliases.setdefault(t, []).append(target)
+
+    for cat_key, cat in gen_pair_pages.CATEGORIES.items():
+        for uid, name, sym, *_ in cat["units"]:
+            terms = unit_terms(name, sym, SEARCH_ALIASES.get((cat_key, uid), ()))
+            add((cat_key, uid, None), terms | {normalize(uid), normalize(gen_pair_pages.SLUG_MAP[(cat_key, uid)])})
+    for state in gen_land_pages.STATES:
+        for uid, label, sym, *_ in state["units"]:
+            add(("land", uid, state["slug"]), land_terms(label, sym) | {normalize(uid)})
+
+    for term, uid in PREFERRED.items():
+        if term in aliases:
+            aliases[term].sort(key=lambda t: t[1] != uid)  # stable: the rest keep registry order
+    return {t: tuple(targets) for t, targets in aliases.items()}
+
+ALIASES = build_aliases()
+
+UNITS = {}  # target -> (display name, factor; None for temperature)
+for _cat_key, _cat in gen_pair_pages.CATEGORIES.items():
+    for _uid, _name, _sym, _factor in _cat["units"]:
+        UNITS[(_cat_key, _uid, None)] = (_name, _factor)
+for _state in gen_land_pages.STATES:
+    for _uid, _label, _sym, _factor, _note in _state["units"]:
+        UNITS[("land", _uid, _state["slug"])] = (_label, _factor)
+STATE_SLUGS = {s["slug"] for s in gen_land_pages.STATES}
+
+# ── Grammar ───────────────────────────────────────────────────────────────────
+
+# Leading number: "5", "-40", "1,250.5", "1,00,000" (lakh grouping), "2.5e3"; optional
+VALUE_RE = re.compile(r"\s*([-+]?(?:\d[\d,]*(?:\.\d*)?|\.\d+)(?:e[-+]?\d+)?)?\s*(.*)", re.I | re.S)
+ARROW_RE = re.compile(r"\s*(?:->|→|=)\s*")
+# Longest alternatives first, so "sq in" is tried before "sq"
+_UNIT = "|".join(re.escape(t) for t in sorted(ALIASES, key=lambda t: (-len(t), t)))
+QUERY_RE = re.compile(rf"(?P<src>{_UNIT}) (?:to|in|into|as) (?P<dst>{_UNIT})")
+
+def resolve(src, dst, state=None):
+    """Best (from target, to target) for two alias terms, or None if no category has both."""
+    left, right = ALIASES[src], ALIASES[dst]
+    if state:
+        left = [t for t in left if t[2] in (None, state)]
+        right = [t for t in right if t[2] in (None, state)]
+    for a in left:
+        for b in right:
+            if a[0] == b[0] and a[2] == b[2]:
+                return a, b
+    return None
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse(query, state=None):
+    """Parse "<value> <unit> to|in|into|as <unit>" into a Query. Raises ValueError."""
+    if state is not None and state not in STATE_SLUGS:
+        raise ValueError(f"unknown land state {state!r}")
+    number, rest = VALUE_RE.fullmatch(query).groups()
+    m = QUERY_RE.fullmatch(normalize(ARROW_RE.sub(" to ", rest)))
+    if not m:
+        raise ValueError(f"not a conversion query: {query!r}")
+    pair = resolve(m.group("src"), m.group("dst"), state)
+    if not pair:
+        raise ValueError(f"no category converts {m.group('src')!r} to {m.group('dst')!r}")
+    (category, from_id, state), (_, to_id, _) = pair
+    value = float(number.replace(",", "")) if number else 1.0
+    return Query(value, category, from_id, to_id, state)
+
+def convert(q):
+    """The converted value of a parsed Query, with the site's own conversion math."""
+    if q.category == "temperature":
+        return gen_pair_pages.temp_convert(q.value, q.from_id, q.to_id)
+    from_factor = UNITS[(q.category, q.from_id, q.state)][1]
+    to_factor = UNITS[(q.category, q.to_id, q.state)][1]
+    return gen_pair_pages.factor_convert(q.value, from_factor, to_factor)
+
+def describe(q):
+    from_name = UNITS[(q.category, q.from_id, q.state)][0]
+    to_name = UNITS[(q.category, q.to_id, q.state)][0]
+    where = f"land, {q.state}" if q.state else q.category
+    return (f"{gen_pair_pages.fmt(q.value)} {from_name} = {gen_pair_pages.fmt(convert(q))} {to_name}"
+            f"  ({where}: {q.from_id} -> {q.to_id})")
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────
+
+def bench(n, seed=1):
+    """Parse n queries over the popular pairs, cold (every query new) and warm (repeats)."""
+    rng = random.Random(seed)
+    names = {t: UNITS[t][0] for t in UNITS}
+    pairs = [((c, a, None), (c, b, None)) for c, (popular, _) in gen_pair_pages.RANKED_PAIRS.items()
+             for a, b in popular]
+    pairs += [(("land", a[0], s["slug"]), ("land", b[0], s["slug"]))
+              for s in gen_land_pages.STATES for a in s["units"][:3] for b in s["units"][3:]]
+    queries = [f"{rng.randint(1, 10**6) / 100} {names[a]} to {names[b]}" for a, b in
+               (rng.choice(pairs) for _ in range(n))]
+
+    parse.cache_clear()
+    start = time.perf_counter()
+    for q in queries:
+        parse(q)
+    cold = time.perf_counter() - start
+
+    hot = [queries[int(rng.paretovariate(1.2)) % CACHE_SIZE] for _ in range(n)]  # Zipf-like repeats
+    parse.cache_clear()
+    start = time.perf_counter()
+    for q in hot:
+        parse(q)
+    warm = time.perf_counter() - start
+    info = parse.cache_info()
+    print(f"{len(ALIASES)} alias terms, {len(UNITS)} units")
+    print(f"  cold: {n:,} distinct queries in {cold:.2f}s ({n / cold:,.0f}/s)")
+    print(f"  warm: {n:,} repeated queries in {warm:.2f}s ({n / warm:,.0f}/s), "
+          f"{info.hits / n:.0%} cache hits")
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse and convert free-text unit queries")
+    parser.add_argument("queries", nargs="*", help='e.g. "5.5 kanal in marla" (default: one per line on stdin)')
+    parser.add_argument("--state", default=None, help="land state slug for land units (default: first match)")
+    parser.add_argument("--bench", type=int, metavar="N", help="time N parses instead")
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.bench)
+        return
+    failed = 0
+    for line in args.queries or (line.strip() for line in sys.stdin):
+        if not line:
+            continue
+        try:
+            print(describe(parse(line, args.state)))
+        except ValueError as e:
+            print(f"  [ERROR] {e}")
+            failed += 1
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+site_common.py
+Small helpers shared by the page generators and build.py.
+"""
+
+import os, re, json, hashlib, datetime
+from functools import lru_cache
+from html.parser import HTMLParser
+
+
+def write_if_changed(path, content, encoding="utf-8"):
+    """Write content to path unless the file already holds exactly the same bytes.
+
+    Unchanged files keep their mtime (and so their Apache ETag). Changed files
+    are written to a temp file and renamed into place, so readers never see a
+    half-written page. Returns True when the file was (re)written.
+    """
+    data = content.encode(encoding) if isinstance(content, str) else content
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+def build_date():
+    """Date stamped into generated files; honours SOURCE_DATE_EPOCH for reproducible builds."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.datetime.fromtimestamp(int(epoch), datetime.timezone.utc).date()
+    return datetime.date.today()
+
+
+# Value pages (gen_value_pages.py) live in numeric directories under a pair,
+# e.g. /length/kilometer-to-mile/5/ or .../0.25/
+VALUE_DIR_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+def is_value_dir(name):
+    return VALUE_DIR_RE.fullmatch(name) is not None
+
+
+POPULARITY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "popularity.json")
+
+def load_popularity(path=POPULARITY_FILE):
+    """{url path: hits} written by analyze_logs.py, or {} if there is no popularity file yet."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["hits"]
+    except FileNotFoundError:
+        return {}
+
+
+
+# Hand-written scripts the pages include as name.js?v={content hash}: .htaccess
+# caches .js for 30 days, so an edited file must get a new URL
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+VERSIONED_SCRIPTS = ["js/app.js", "js/hamburger.js", "js/search.js", "js/date-calculator.js"]
+SCRIPT_SRC_RE = re.compile(r'(src="[^"?]*?)(js/[\w-]+\.js)(?:\?v=\w+)?"')
+
+@lru_cache(maxsize=None)
+def _file_hash(path, mtime_ns):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:8]
+
+def asset_version(rel):
+    """Content hash of a source file such as "js/app.js", for its ?v= query."""
+    path = os.path.join(SRC_DIR, rel)
+    return _file_hash(path, os.stat(path).st_mtime_ns)
+
+def versioned(rel):
+    """rel with its ?v= content hash, e.g. "js/app.js?v=1a2b3c4d"."""
+    return f"{rel}?v={asset_version(rel)}"
+
+def stamp_versions(html):
+    """Point every VERSIONED_SCRIPTS <script src> in hand-written html at its current ?v=."""
+    def stamp(m):
+        return f'{m.group(1)}{versioned(m.group(2))}"' if m.group(2) in VERSIONED_SCRIPTS else m.group(0)
+    return SCRIPT_SRC_RE.sub(stamp, html)
+
+
+PREFETCH_LIMIT = 3
+
+def speculation_rules(urls):
+    """Speculation Rules <script> that prefetches the first PREFETCH_LIMIT of urls.
+
+    urls are relative to the page and most likely next click first. Browsers
+    without Speculation Rules support ignore the script.
+    """
+    urls = list(dict.fromkeys(urls))[:PREFETCH_LIMIT]
+    if not urls:
+        return ""
+    rules = json.dumps({"prefetch": [{"source": "list", "urls": urls}]})
+    return f'<script type="speculationrules">{rules}</script>'
+
+
+# ── Third-party scripts ───────────────────────────────────────────────────────
+# One switch for every generator: when True, gtag.js and adsbygoogle.js are
+# only fetched on the first interaction (tap, key, scroll) or once the page
+# has loaded and the browser is idle, instead of competing with the page in
+# <head>. Queued gtag() calls and adsbygoogle.push() slots run when they load.
+DEFER_THIRD_PARTY = True
+
+GTAG_ID = "G-TSFVXECJ40"
+ADSENSE_PUB_ID = "ca-pub-2662293899276634"
+GTAG_SRC = f"https://www.googletagmanager.com/gtag/js?id={GTAG_ID}"
+ADSENSE_SRC = f"https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client={ADSENSE_PUB_ID}"
+
+def gtag_head():
+    """Google tag for the top of <head>."""
+    loader = "" if DEFER_THIRD_PARTY else f'<script async src="{GTAG_SRC}"></script>\n  '
+    return f"""<!-- Google tag (gtag.js) -->
+  {loader}<script>
+    window.dataLayer = window.dataLayer || [];
+    function gtag(){{dataLayer.push(arguments);}}
+    gtag('js', new Date());
+
+    gtag('config', '{GTAG_ID}');
+  </script>"""
+
+def adsense_head():
+    """AdSense loader for the end of <head>; when deferred it also loads gtag.js."""
+    if not DEFER_THIRD_PARTY:
+        return f"""<!-- Google AdSense -->
+  <script async src="{ADSENSE_SRC}" crossorigin="anonymous"></script>"""
+    srcs = json.dumps([GTAG_SRC, ADSENSE_SRC])
+    return f"""<!-- Google AdSense + Analytics, loaded on first interaction or idle -->
+  <script>
+    (function () {{
+      var done = false;
+      function load() {{
+        if (done) return;
+        done = true;
+        {srcs}.forEach(function (src) {{
+          var s = document.createElement('script');
+          s.async = true;
+          s.src = src;
+          s.crossOrigin = 'anonymous';
+          document.head.appendChild(s);
+        }});
+      }}
+      ['pointerdown', 'keydown', 'scroll', 'touchstart'].forEach(function (type) {{
+        addEventListener(type, load, {{ once: true, passive: true }});
+      }});
+      addEventListener('load', function () {{
+        if ('requestIdleCallback' in window) requestIdleCallback(load, {{ timeout: 4000 }});
+        else setTimeout(load, 2000);
+      }});
+    }})();
+  </script>"""
+
+
+# Origins the ad and analytics scripts talk to. Scripts and ad frames come from
+# the first two; the rest are only looked up ahead of time.
+PRECONNECT_ORIGINS = ["https://www.googletagmanager.com", "https://pagead2.googlesyndication.com"]
+DNS_PREFETCH_ORIGINS = ["https://www.google-analytics.com", "https://googleads.g.doubleclick.net",
+                        "https://tpc.googlesyndication.com"]
+
+def resource_hints():
+    """preconnect / dns-prefetch <link>s for the third-party origins, for early in <head>."""
+    links = [f'<link rel="preconnect" href="{o}" crossorigin />' for o in PRECONNECT_ORIGINS]
+    links += [f'<link rel="dns-prefetch" href="{o}" />' for o in PRECONNECT_ORIGINS + DNS_PREFETCH_ORIGINS]
+    return "\n  ".join(links)
+
+
+class _HeadScanner(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.in_head = True
+        self.blocking = []
+        self._inline = None
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        if tag == "body":
+            self.in_head = False
+        if not self.in_head:
+            return
+        if tag == "script" and a.get("type") not in ("application/ld+json", "speculationrules", "module"):
+            if "src" not in a:
+                self._inline = []
+            elif "async" not in a and "defer" not in a:
+                self.blocking.append(f"script {a['src']}")
+        elif tag == "link" and a.get("rel") == "stylesheet" and a.get("media", "all") in ("all", "screen"):
+            self.blocking.append(f"stylesheet {a.get('href')}")
+
+    def handle_data(self, data):
+        if self._inline is not None:
+            self._inline.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._inline is not None:
+            self.blocking.append(f"inline script ({len(''.join(self._inline).encode())} bytes)")
+            self._inline = None
+
+def report_blocking(template, html):
+    """Print the render-blocking resources in a rendered page's <head>."""
+    scanner = _HeadScanner()
+    scanner.feed(html)
+    print(f"  Blocking resources in the {template} template: {len(scanner.blocking)}")
+    for item in scanner.blocking:
+        print(f"    - {item}")
+    return scanner.blocking
@@ -0,0 +1,133 @@
+// sw.js — generated by gen_service_worker.py. Do not edit.
+// PRECACHE pages and assets are served cache-first and refreshed only when
+// their content hash changes; other pair pages are stale-while-revalidate
+// in an LRU cache of RUNTIME_MAX pages.
+'use strict';
+
+const PRECACHE = {
+  "/": "28eba35aa8",
+  "/css/style.css": "b87a61e0c1",
+  "/js/app.js": "54717b9bde",
+  "/js/hamburger.js": "42f3100605",
+  "/js/search.js": "c9bee448b3",
+  "/search-index.json": "e8c74d28fb",
+  "/js/units/length.js": "618356fd83",
+  "/js/units/temperature.js": "e4cb7eeffd",
+  "/js/units/area.js": "9056d5bf29",
+  "/js/units/volume.js": "b3963e8f28",
+  "/js/units/weight.js": "215308ba2a",
+  "/js/units/time.js": "910a44d745",
+  "/js/units/speed.js": "b0d6d16d17",
+  "/js/units/pressure.js": "0b26a9be57",
+  "/js/units/energy.js": "a00fa93259",
+  "/js/units/loader.js": "e76e8e18e7",
+  "/length/": "6e3028e958",
+  "/temperature/": "48b6e4752f",
+  "/area/": "141a9b57b8",
+  "/volume/": "46cced84c1",
+  "/weight/": "1b2530ad68",
+  "/time/": "098f2c8461",
+  "/speed/": "ecd2dfb15d",
+  "/pressure/": "6bdf51ec78",
+  "/energy/": "1818f1c562",
+  "/land/": "a032369df0",
+  "/length/meter-to-foot/": "a2b0ce32af",
+  "/length/foot-to-meter/": "a1b926aa98",
+  "/length/kilometer-to-mile/": "434092a0f7",
+  "/temperature/celsius-to-fahrenheit/": "393875de72",
+  "/temperature/fahrenheit-to-celsius/": "18bd802508",
+  "/temperature/celsius-to-kelvin/": "307a62956f",
+  "/area/square-foot-to-square-meter/": "c9dde671d7",
+  "/area/square-meter-to-square-foot/": "4763c5b9aa",
+  "/area/acre-to-hectare/": "ae90acb08c",
+  "/volume/liter-to-us-gallon/": "5ec5634379",
+  "/volume/us-gallon-to-liter/": "c4fc75ed9c",
+  "/volume/milliliter-to-us-fluid-ounce/": "e8ba53906b",
+  "/weight/kilogram-to-pound/": "176841526a",
+  "/weight/pound-to-kilogram/": "6bbb97c631",
+  "/weight/gram-to-ounce/": "0b6a9e2be2",
+  "/time/hour-to-minute/": "a3cd1f28e6",
+  "/time/minute-to-second/": "412e82947c",
+  "/time/day-to-hour/": "ddd3e38d6a",
+  "/speed/kilometer-per-hour-to-mile-per-hour/": "4fd50fa820",
+  "/speed/mile-per-hour-to-kilometer-per-hour/": "b73dc85b25",
+  "/speed/meter-per-second-to-kilometer-per-hour/": "d17951a9ec",
+  "/pressure/psi-to-bar/": "6066d018c7",
+  "/pressure/bar-to-psi/": "e078d698bb",
+  "/pressure/kilopascal-to-psi/": "4d23359de3",
+  "/energy/kilocalorie-to-kilojoule/": "9d44fc1baf",
+  "/energy/kilojoule-to-kilocalorie/": "a5774c8490",
+  "/energy/kilowatt-hour-to-joule/": "5788b7461f"
+};
+const PRECACHE_NAME = 'precache';
+const RUNTIME_NAME = 'pages';
+const RUNTIME_MAX = 60;
+// /length/meter-to-foot/ and /land/rajasthan/bigha-pucca-to-acre/
+const PAIR_PAGE = /^\/[a-z]+\/(?:[a-z0-9-]+\/)?[a-z0-9-]+-to-[a-z0-9-]+\/$/;
+
+// Cache key carries the content hash, so a changed file gets a new entry
+function cacheKey(path) {
+  return new URL(path + '?__rev=' + PRECACHE[path], self.location).href;
+}
+
+function sitePath(url) {
+  return url.pathname.endsWith('/index.html') ? url.pathname.slice(0, -'index.html'.length) : url.pathname;
+}
+
+self.addEventListener('install', event => {
+  event.waitUntil(caches.open(PRECACHE_NAME).then(cache =>
+    Promise.all(Object.keys(PRECACHE).map(path =>
+      cache.match(cacheKey(path)).then(hit => hit || fetch(path, { cache: 'no-cache' }).then(res => {
+        if (res.ok) return cache.put(cacheKey(path), res);
+      })).catch(() => {})  // a missing entry just falls through to the network
+    ))
+  ).then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+  const wanted = new Set(Object.keys(PRECACHE).map(cacheKey));
+  event.waitUntil(caches.open(PRECACHE_NAME).then(cache =>
+    cache.keys().then(keys => Promise.all(keys.filter(req => !wanted.has(req.url)).map(req => cache.delete(req))))
+  ).then(() => self.clients.claim()));
+});
+
+// Cache.keys() lists entries in insertion order, so re-inserting on use
+// keeps the least recently used pages first in line for eviction
+function trim(cache) {
+  return cache.keys().then(keys =>
+    Promise.all(keys.slice(0, Math.max(0, keys.length - RUNTIME_MAX)).map(req => cache.delete(req))));
+}
+
+function offline() {
+  return caches.open(PRECACHE_NAME).then(cache => cache.match(cacheKey('/')))
+    .then(hit => hit || new Response('Offline', { status: 503, headers: { 'Content-Type': 'text/plain' } }));
+}
+
+function staleWhileRevalidate(event, path) {
+  return caches.open(RUNTIME_NAME).then(cache => cache.match(path).then(hit => {
+    const update = fetch(event.request).then(res => {
+      if (!res.ok) return res;
+      const copy = res.clone();
+      return cache.delete(path).then(() => cache.put(path, copy)).then(() => trim(cache)).then(() => res);
+    });
+    if (!hit) return update.catch(offline);
+    const touched = hit.clone();
+    event.waitUntil(update.catch(() => cache.delete(path).then(() => cache.put(path, touched))));
+    return hit;
+  }));
+}
+
+self.addEventListener('fetch', event => {
+  const req = event.request;
+  if (req.method !== 'GET') return;
+  const url = new URL(req.url);
+  if (url.origin !== self.location.origin) return;
+  const path = sitePath(url);
+  if (Object.prototype.hasOwnProperty.call(PRECACHE, path)) {
+    event.respondWith(caches.open(PRECACHE_NAME)
+      .then(cache => cache.match(cacheKey(path)))
+      .then(hit => hit || fetch(req)));
+  } else if (req.mode === 'navigate' && PAIR_PAGE.test(path)) {
+    event.respondWith(staleWhileRevalidate(event, path));
+  }
+});
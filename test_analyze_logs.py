@@ -0,0 +1,50 @@
+import os, json, tempfile
+
+import analyze_logs
+import gen_pair_pages
+import gen_land_pages
+import gen_sitemap
+
+# A land pair page hit must be counted, rank that pair first on its state's
+# pages and lift its sitemap priority above the minimum.
+STATE = gen_land_pages.STATES[0]
+SLUGS = gen_land_pages.pair_slugs(STATE)
+FROM, TO = STATE["units"][-1][0], STATE["units"][0][0]
+PAGE = f"/land/{STATE['slug']}/{SLUGS[FROM]}-to-{SLUGS[TO]}/"
+
+LOG = "".join(f'1.2.3.4 - - [19/Oct/2026:10:00:0{i} +0000] "GET {path} HTTP/1.1" 200 512 "-" "test"\n'
+              for i, path in enumerate([PAGE, PAGE + "index.html", PAGE[:-1], "/length/meter-to-foot/"]))
+
+def test_land_pair_hits():
+    with tempfile.TemporaryDirectory() as tmp:
+        log, out = os.path.join(tmp, "access.log"), os.path.join(tmp, "popularity.json")
+        with open(log, "w") as f:
+            f.write(LOG)
+        analyze_logs.analyze([log], out=out, jobs=1)
+        with open(out) as f:
+            hits = json.load(f)["hits"]
+
+    saved = gen_pair_pages.POPULARITY
+    gen_pair_pages.POPULARITY = hits
+    try:
+        popular, rest = gen_land_pages.ranked_state_pairs(STATE)
+    finally:
+        gen_pair_pages.POPULARITY = saved
+    priorities = gen_sitemap.page_priorities(hits)
+
+    checks = [
+        ("land pair hits counted", hits.get(PAGE), 3),
+        ("two-segment page still counted", hits.get("/length/meter-to-foot/"), 1),
+        ("land pair ranked first", popular[:1], [(FROM, TO)]),
+        ("land pair sitemap priority", priorities.get(PAGE), f"{gen_sitemap.PRIORITY_PAGE_MAX:.1f}"),
+    ]
+    all_ok = True
+    for name, result, expected in checks:
+        ok = result == expected
+        all_ok = all_ok and ok
+        print(f"{name}: {result}  {'OK' if ok else f'FAIL (expected: {expected})'}")
+    print(f"\nAll OK: {all_ok}")
+    assert all_ok
+
+if __name__ == "__main__":
+    test_land_pair_hits()
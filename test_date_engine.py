@@ -0,0 +1,59 @@
+import random
+from datetime import date, timedelta
+
+import date_engine
+
+# business_days() counts in closed form (whole weeks, the remainder table and a
+# bisect over holidays); it must agree with walking the range one day at a time.
+CALENDARS = [None] + date_engine.compile_all()["calendars"]
+ANCHORS = [date(2024, 1, 22), date(2023, 12, 25), date(1999, 12, 27)]  # each a Monday, with holidays close by
+SPANS = list(range(15)) + [29, 30, 31, 100, 365, 366, 1000]
+
+def walk(start, end, calendar, include_end):
+    """Workdays from start up to end, one day at a time."""
+    a, b = sorted((start, end))
+    weekend = calendar["weekend"] if calendar else date_engine.DEFAULT_WEEKEND
+    holidays = set(calendar["days"]) if calendar else set()
+    count = skipped = 0
+    for i in range((b - a).days + include_end):
+        d = a + timedelta(days=i)
+        if d.weekday() in weekend:
+            continue
+        if date_engine.day_number(d) in holidays:
+            skipped += 1
+        else:
+            count += 1
+    return count, skipped
+
+def ranges():
+    """(start, end) for every weekday start and span % 7, then random ranges from 1900 to 2100."""
+    for anchor in ANCHORS:
+        for offset in range(7):
+            start = anchor + timedelta(days=offset)
+            for span in SPANS:
+                yield start, start + timedelta(days=span)
+    rng = random.Random(1)
+    lo, hi = date(date_engine.FIRST_YEAR, 1, 1).toordinal(), date(date_engine.LAST_YEAR, 12, 31).toordinal()
+    for _ in range(300):
+        start = rng.randint(lo, hi - 800)
+        yield date.fromordinal(start), date.fromordinal(start + rng.randint(0, 800))
+
+def test_business_days():
+    failures, checked = [], 0
+    for calendar in CALENDARS:
+        for start, end in ranges():
+            for include_end in (False, True):
+                for a, b in ((start, end), (end, start)):
+                    result = date_engine.business_days(a, b, calendar, include_end)
+                    expected = walk(a, b, calendar, include_end)
+                    checked += 1
+                    if result != expected:
+                        failures.append((calendar and calendar["id"], a, b, include_end, result, expected))
+    for cal_id, a, b, include_end, result, expected in failures[:10]:
+        print(f"{cal_id} {a} -> {b} include_end={include_end}: {result}  FAIL (expected: {expected})")
+    print(f"{checked:,} ranges checked over {len(CALENDARS)} calendars, {len(failures)} failures")
+    print(f"\nAll OK: {not failures}")
+    assert not failures
+
+if __name__ == "__main__":
+    test_business_days()
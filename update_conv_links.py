@@ -1,10 +1,20 @@
 """
 update_conv_links.py
 Updates conv-link hrefs in index.html to point to individual pair pages.
+When popularity.json exists (see analyze_logs.py), the "Common Conversions"
+list is rebuilt from the HOMEPAGE_LINKS most-visited pair pages instead.
+Also stamps the current js/units/loader.js content hash into its ?v=, and
+the content hashes of the hand-written scripts (site_common.VERSIONED_SCRIPTS)
+into index.html and the other STAMPED_PAGES.
 """
 import re, os
+from site_common import write_if_changed, load_popularity, stamp_versions
+import gen_pair_pages
+import gen_js_modules
 
 BASE = r"C:\Users\Administrator\Documents\AntiGravity\Units"
+if os.name == 'posix':
+    BASE = os.getcwd()
 
 # Exact slug map for each conv-link in index.html
 # (cat, from_id, to_id) -> (from_slug, to_slug)
@@ -47,9 +57,40 @@ SLUG_MAP = {
     ("area","sqfoot","acre"):             ("square-foot","acre"),
 }
 
-index_path = os.path.join(BASE, "index.html")
-with open(index_path, encoding="utf-8") as f:
-    content = f.read()
+HOMEPAGE_LINKS = 30
+
+CONV_LINK_RE = re.compile(r'<a href="[^"]*" class="conv-link" data-cat="([^"]+)"\s+data-from="([^"]+)"\s+'
+                          r'data-to="([^"]+)"[^>]*>(.*?)</a>', re.S)
+CONV_GRID_RE = re.compile(r'(<div class="common-conv-grid">\n)(.*?)(\n        </div>\n      </section>)', re.S)
+LOADER_SRC_RE = re.compile(r'(src="js/units/loader\.js\?v=)\w+')
+# Hand-written pages besides index.html whose <script src> get a ?v= content hash
+STAMPED_PAGES = ["date-calculator.html"]
+
+def popular_links(content, popularity, n=HOMEPAGE_LINKS):
+    """Markup for the Common Conversions grid: the n most-visited pairs in two columns."""
+    # Keep the hand-written labels ("kg to lbs") for pairs already on the page
+    labels = {m.group(1, 2, 3): " ".join(m.group(4).split()) for m in CONV_LINK_RE.finditer(content)}
+    pages = {}
+    for cat_key, cat in gen_pair_pages.CATEGORIES.items():
+        for f in cat["units"]:
+            for t in cat["units"]:
+                if f[0] != t[0]:
+                    href = f"{cat_key}/{gen_pair_pages.SLUG_MAP[(cat_key, f[0])]}-to-{gen_pair_pages.SLUG_MAP[(cat_key, t[0])]}/"
+                    pages[f"/{href}"] = (cat_key, f, t, href)
+    by_key = {(cat_key, f[0], t[0]): path for path, (cat_key, f, t, href) in pages.items()}
+    ranked = sorted((p for p in popularity if p in pages), key=lambda p: (-popularity[p], p))
+    # Top up with the current links if the logs cover fewer than n pairs
+    ranked += [by_key[k] for k in labels if k in by_key]
+    top = list(dict.fromkeys(ranked))[:n]
+    items = []
+    for path in top:
+        cat_key, f, t, href = pages[path]
+        label = labels.get((cat_key, f[0], t[0]), f"{f[1]} to {t[1]}")
+        items.append(f'            <li><a href="{href}" class="conv-link" data-cat="{cat_key}" data-from="{f[0]}"\n'
+                     f'                data-to="{t[0]}" data-val="1">{label}</a></li>')
+    half = (len(items) + 1) // 2
+    return "\n".join(f'          <ul class="common-conv-list">\n' + "\n".join(col) + '\n          </ul>'
+                     for col in (items[:half], items[half:]) if col)
 
 def replace_href(m):
     full = m.group(0)
@@ -63,18 +104,39 @@ def replace_href(m):
         return full.replace('href="#"', f'href="{href}"')
     return full
 
-orig_count = content.count('href="#" class="conv-link"')
-new_content = re.sub(r'<a href="#" class="conv-link"[^>]+>', replace_href, content)
-new_count = new_content.count('href="#" class="conv-link"')
+def main(base=BASE):
+    index_path = os.path.join(base, "index.html")
+    with open(index_path, encoding="utf-8") as f:
+        content = f.read()
+
+    orig_count = content.count('href="#" class="conv-link"')
+    new_content = re.sub(r'<a href="#" class="conv-link"[^>]+>', replace_href, content)
+    new_count = new_content.count('href="#" class="conv-link"')
+
+    print(f"Links updated: {orig_count - new_count} of {orig_count}")
+
+    popularity = load_popularity()
+    if popularity:
+        grid = popular_links(new_content, popularity)
+        if grid:
+            new_content = CONV_GRID_RE.sub(lambda m: m.group(1) + grid + m.group(3), new_content, count=1)
+            print(f"Common Conversions rebuilt from popularity.json ({grid.count('<li>')} links)")
+
+    new_content = LOADER_SRC_RE.sub(f"\\g<1>{gen_js_modules.loader_version()}", new_content)
+    new_content = stamp_versions(new_content)
 
-print(f"Links updated: {orig_count - new_count} of {orig_count}")
+    write_if_changed(index_path, new_content)
+    for name in STAMPED_PAGES:
+        path = os.path.join(base, name)
+        with open(path, encoding="utf-8") as f:
+            write_if_changed(path, stamp_versions(f.read()))
 
-with open(index_path, "w", encoding="utf-8") as f:
-    f.write(new_content)
+    print("index.html updated successfully.")
 
-print("index.html updated successfully.")
+    # Also verify a sample page exists
+    sample = os.path.join(base, "volume", "us-gallon-to-liter", "index.html")
+    print(f"Sample page exists: {os.path.exists(sample)}")
+    print(f"  -> {sample}")
 
-# Also verify a sample page exists
-sample = os.path.join(BASE, "volume", "us-gallon-to-liter", "index.html")
-print(f"Sample page exists: {os.path.exists(sample)}")
-print(f"  -> {sample}")
+if __name__ == "__main__":
+    main()
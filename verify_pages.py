@@ -0,0 +1,263 @@
+"""
+verify_pages.py
+Re-checks the numbers baked into the rendered pages against the unit registry.
+
+For every pair page it recomputes the "How to Convert" formulas, the worked
+example, each row of the conversion table and the `result = val * ff / tf`
+coefficients in the inline converter script. For every land state page it
+recomputes the sq ft table and the sqft factors in the inline UNITS object.
+Land pair pages (/land/{state}/{from}-to-{to}/) get the pair page checks
+with the state's sq ft factors. The cross-state matrix (land/compare/matrix.json)
+is recomputed entry by entry from the same factors.
+A displayed value only counts as a mismatch if it is off by more than the
+rounding of the digits actually shown.
+
+Each category (and the land pages, and the land pair pages) is checked in its own worker process.
+
+Usage:
+  python verify_pages.py              # verify this directory
+  python verify_pages.py --base DIR   # verify a build output (e.g. .build/current)
+"""
+
+import os, re, sys, json, math, time, argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import gen_pair_pages
+import gen_land_pages
+import gen_land_pair_pages
+import gen_land_matrix
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+# Relative error allowed on top of display rounding (both formatters round to 10 significant digits)
+REL_TOL = 1e-9
+
+TABLE_ROW_RE  = re.compile(r"<tr><td>([^<]*)</td><td>([^<]*)</td></tr>")
+FORMULA_RE    = re.compile(r"<p>1 [^<]*? = ([-\d.,e+]+) [^<]*</p>")
+EXAMPLE_RE    = re.compile(r"(-?\d+) [^<]*? = (?:-?\d+ &times; [-\d.,e+]+ [^<]*? = )?([-\d.,e+N/A]+) [^<]*</p>")
+FACTOR_JS_RE  = re.compile(r"result = val \* ([^ ;]+) / ([^ ;]+);")
+TEMP_JS_RE    = re.compile(r"var c = ([^;]+); result = ([^;]+);")
+LAND_ROW_RE   = re.compile(r"<td>1 ([^<]*)</td>\s*<td>= ([-\d.,e+]+) ([^<]*)</td>")
+LAND_UNIT_RE  = re.compile(r'"(\w+)": \{ label: "[^"]*", sym: "[^"]*", sqft: ([^,]+),')
+
+# ── Number helpers ────────────────────────────────────────────────────────────
+
+def parse_shown(text):
+    """Parse a displayed number ("1,609.344", "2.29568e-05"); return (value, rounding step)."""
+    text = text.replace(",", "")
+    mantissa, _, exp = text.partition("e")
+    decimals = len(mantissa.partition(".")[2])
+    return float(text), 10 ** (int(exp or 0) - decimals)
+
+def close(shown, expected):
+    """True if expected rounds to the displayed string."""
+    try:
+        value, step = parse_shown(shown)
+    except ValueError:
+        return False
+    if math.isnan(expected) or math.isinf(expected):
+        return False
+    return abs(value - expected) <= step / 2 + REL_TOL * abs(expected)
+
+def eval_js(expr, **names):
+    """Evaluate one of the generator's arithmetic-only JS expressions."""
+    return eval(expr, {"__builtins__": {}, "NaN": float("nan")}, names)
+
+# ── Pair pages ────────────────────────────────────────────────────────────────
+
+def check_pair(html, cat_key, from_unit, to_unit):
+    fid, fname, fsym, *frest = from_unit
+    tid, tname, tsym, *trest = to_unit
+    if cat_key == "temperature":
+        fwd = lambda v: gen_pair_pages.temp_convert(v, fid, tid)
+        rev = lambda v: gen_pair_pages.temp_convert(v, tid, fid)
+    else:
+        fwd = lambda v: v * frest[0] / trest[0]
+        rev = lambda v: v * trest[0] / frest[0]
+
+    errors = []
+    formulas = FORMULA_RE.findall(html)
+    if len(formulas) != 2:
+        errors.append(f"expected 2 formula lines, found {len(formulas)}")
+    for shown, expected, label in zip(formulas, (fwd(1), rev(1)), ("1 from", "1 to")):
+        if not close(shown, expected):
+            errors.append(f"formula {label}: shows {shown}, expected {gen_pair_pages.fmt(expected)}")
+
+    example = EXAMPLE_RE.search(html, html.find("<strong>Example:</strong>"))
+    if not example:
+        errors.append("worked example not found")
+    elif not close(example.group(2), fwd(float(example.group(1)))):
+        errors.append(f"example: shows {example.group(2)}, expected {gen_pair_pages.fmt(fwd(float(example.group(1))))}")
+
+    rows = TABLE_ROW_RE.findall(html)
+    if not rows:
+        errors.append("conversion table not found")
+    for left, right in rows:
+        if not (left.endswith(f" {fsym}") and right.endswith(f" {tsym}")):
+            errors.append(f"table row has wrong units: {left} | {right}")
+            continue
+        value = float(left[:-len(fsym) - 1].replace(",", ""))
+        shown = right[:-len(tsym) - 1]
+        if not close(shown, fwd(value)):
+            errors.append(f"table row {left}: shows {shown}, expected {gen_pair_pages.fmt(fwd(value))}")
+
+    if cat_key == "temperature":
+        exprs = TEMP_JS_RE.findall(html)
+        if len(exprs) != 2:
+            errors.append(f"expected 2 inline converters, found {len(exprs)}")
+        for (to_c, from_c), func, label in zip(exprs, (fwd, rev), ("forward", "reverse")):
+            for v in (-40, 0, 37, 100):
+                got = eval_js(from_c, c=eval_js(to_c, val=v))
+                if not close(repr(got), func(v)):
+                    errors.append(f"inline {label} converter gives {got} for {v}, expected {func(v)}")
+                    break
+    else:
+        coeffs = FACTOR_JS_RE.findall(html)
+        want = [(frest[0], trest[0]), (trest[0], frest[0])]
+        if [(float(a), float(b)) for a, b in coeffs] != want:
+            errors.append(f"inline coefficients {coeffs}, expected {want}")
+    return errors
+
+def verify_category(base, cat_key):
+    """Worker: verify every pair page of one category. Returns (pages checked, [(path, error)])."""
+    cat = gen_pair_pages.CATEGORIES[cat_key]
+    checked, problems = 0, []
+    for from_unit in cat["units"]:
+        for to_unit in cat["units"]:
+            if from_unit is to_unit:
+                continue
+            rel = gen_pair_pages.pair_path(cat_key, from_unit[0], to_unit[0])
+            try:
+                with open(os.path.join(base, rel), encoding="utf-8") as f:
+                    html = f.read()
+            except FileNotFoundError:
+                problems.append((rel, "page missing"))
+                continue
+            problems += [(rel, e) for e in check_pair(html, cat_key, from_unit, to_unit)]
+            checked += 1
+    return checked, problems
+
+# ── Land pages ────────────────────────────────────────────────────────────────
+
+def check_state(html, state):
+    errors = []
+    units = {f"{u[1]} ({u[2]})": u for u in state["units"]}
+    rows = LAND_ROW_RE.findall(html)
+    if not rows:
+        errors.append("conversion table not found")
+    for left, shown, right in rows:
+        if left == "sq ft":
+            unit, expected = units.get(right), None
+            if unit:
+                expected = 1 / unit[3]
+        else:
+            unit = units.get(left)
+            expected = unit[3] if unit else None
+        if expected is None:
+            errors.append(f"table row for unknown unit: 1 {left} = {shown} {right}")
+        elif not close(shown, expected):
+            errors.append(f"table row 1 {left}: shows {shown} {right}, expected {gen_land_pages.fmt(expected)}")
+
+    js = dict(LAND_UNIT_RE.findall(html))
+    for uid, label, sym, factor, *_ in state["units"]:
+        if uid not in js:
+            errors.append(f"inline UNITS is missing {uid}")
+        elif float(js[uid]) != factor:
+            errors.append(f"inline UNITS.{uid}.sqft is {js[uid]}, expected {factor}")
+    return errors
+
+def verify_land(base):
+    """Worker: verify every land state page. Returns (pages checked, [(path, error)])."""
+    checked, problems = 0, []
+    for state in gen_land_pages.STATES:
+        rel = gen_land_pages.state_path(state["slug"])
+        try:
+            with open(os.path.join(base, rel), encoding="utf-8") as f:
+                html = f.read()
+        except FileNotFoundError:
+            problems.append((rel, "page missing"))
+            continue
+        problems += [(rel, e) for e in check_state(html, state)]
+        checked += 1
+    return checked, problems
+
+def verify_land_pairs(base):
+    """Worker: verify every land pair page. Returns (pages checked, [(path, error)])."""
+    checked, problems = 0, []
+    for state in gen_land_pages.STATES:
+        slugs = gen_land_pages.pair_slugs(state)
+        for from_unit in state["units"]:
+            for to_unit in state["units"]:
+                if from_unit is to_unit:
+                    continue
+                rel = gen_land_pair_pages.land_pair_path(state["slug"], f"{slugs[from_unit[0]]}-to-{slugs[to_unit[0]]}")
+                try:
+                    with open(os.path.join(base, rel), encoding="utf-8") as f:
+                        html = f.read()
+                except FileNotFoundError:
+                    problems.append((rel, "page missing"))
+                    continue
+                problems += [(rel, e) for e in check_pair(html, "land", from_unit, to_unit)]
+                checked += 1
+    return checked, problems
+
+def verify_land_matrix(base):
+    """Worker: check every state's units and every entry of matrix.json. Returns (1, [(path, error)])."""
+    rel = gen_land_matrix.MATRIX_FILE
+    try:
+        with open(os.path.join(base, rel), encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return 0, [(rel, "matrix missing")]
+    units, n, matrix = data["units"], data["n"], data["matrix"]
+    problems = []
+    if len(units) != n or len(matrix) != n * n:
+        return 1, [(rel, f"{len(units)} units and {len(matrix)} entries for n = {n}")]
+    states = {slug: ids for slug, name, ids in data["states"]}
+    for state in gen_land_pages.STATES:
+        ids = states.get(state["slug"])
+        if ids is None or len(ids) != len(state["units"]):
+            problems.append((rel, f"{state['slug']}: units don't match STATES"))
+            continue
+        for (uid, label, sym, sqft, note), i in zip(state["units"], ids):
+            if units[i][0] != label or not math.isclose(units[i][2], sqft, rel_tol=REL_TOL):
+                problems.append((rel, f"{state['slug']} {uid}: {units[i]} != {label} {sqft}"))
+    for i in range(n):
+        for j in range(n):
+            expected = units[i][2] / units[j][2]
+            if not math.isclose(matrix[i * n + j], expected, rel_tol=REL_TOL):
+                problems.append((rel, f"1 {units[i][0]} = {matrix[i * n + j]} {units[j][0]}, expected {expected}"))
+    return 1, problems
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def verify(base=BASE, jobs=None):
+    """Verify every pair and land page under base. Returns the number of problems."""
+    base = os.path.abspath(base)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(jobs) as pool:
+        futures = {cat_key: pool.submit(verify_category, base, cat_key) for cat_key in gen_pair_pages.CATEGORIES}
+        futures["land"] = pool.submit(verify_land, base)
+        futures["land pairs"] = pool.submit(verify_land_pairs, base)
+        futures["land matrix"] = pool.submit(verify_land_matrix, base)
+        results = {name: f.result() for name, f in futures.items()}
+
+    total, problems = 0, 0
+    for name, (checked, errors) in results.items():
+        total += checked
+        problems += len(errors)
+        print(f"  [{'OK' if not errors else 'FAIL'}] {name}: {checked} pages")
+        for rel, err in errors:
+            print(f"      {rel}: {err}")
+    print(f"\nVerified {total} pages in {time.perf_counter() - start:.2f}s: {problems} mismatches.")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute the numbers shown on every pair and land page")
+    parser.add_argument("--base", default=BASE, help="site root to verify (default: this directory)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+    return 1 if verify(args.base, args.jobs) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+watch.py
+Development watch mode: polls the build inputs and re-renders only the pages
+a change actually affects. Started with `python build.py --watch`.
+
+When only the registry data in gen_pair_pages.py (CATEGORIES) or
+gen_land_pages.py (STATES) changed, the old and new registries are diffed
+and mapped to the affected pages:
+
+  - a definition edit       -> pair pages whose from-unit is that unit
+  - a unit's symbol/factor  -> pair pages that convert from or to that unit
+  - a unit rename, added/removed/reordered unit, or category metadata
+                            -> every pair page in that category (the related
+                               links list every unit of the category)
+  - one state's units/desc  -> that state page and the land hub
+  - a state rename or added/removed state
+                            -> every state page (related states) and the hub
+
+An edit to the land spreadsheet recompiles land-units.json first
+(ingest_land_units.py), then counts as a change to the STATES registry.
+
+The land pair pages (gen_land_pair_pages.py) are re-checked after every
+change; they keep one fingerprint per state and only re-render states whose
+units or templates changed. The cross-state matrix (gen_land_matrix.py) is
+small enough to rebuild after every change.
+
+The other stages that read the changed registry file (the search index,
+category pages, homepage links, ...) rerun in full. Any other change
+(templates, helpers, static files) reruns the affected build stages in
+full. Stdlib only.
+"""
+
+import os, sys, ast, copy, time, hashlib, importlib
+
+import site_common
+import gen_pair_pages
+import gen_land_pages
+import gen_land_pair_pages
+import gen_land_matrix
+import gen_value_pages
+import build
+
+POLL_INTERVAL = 0.5  # seconds
+
+# ── Registry snapshots ────────────────────────────────────────────────────────
+
+def code_fingerprint(module, registry_name):
+    """Hash of a generator's source with the registry assignment cut out.
+
+    If this is unchanged, only registry data was edited and an incremental
+    re-render is safe.
+    """
+    with open(module.__file__, encoding="utf-8") as f:
+        source = f.read()
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == registry_name for t in node.targets):
+            source = source.replace(ast.get_source_segment(source, node), "")
+    return hashlib.sha1(source.encode()).hexdigest()
+
+def pair_snapshot():
+    pages = {}
+    for cat_key, cat in gen_pair_pages.CATEGORIES.items():
+        for fid, *_ in cat["units"]:
+            for tid, *_ in cat["units"]:
+                if fid != tid:
+                    pages[(cat_key, fid, tid)] = gen_pair_pages.pair_path(cat_key, fid, tid)
+    return {
+        "code": code_fingerprint(gen_pair_pages, "CATEGORIES"),
+        "registry": copy.deepcopy(gen_pair_pages.CATEGORIES),
+        "pages": pages,
+    }
+
+def land_snapshot():
+    return {
+        "code": code_fingerprint(gen_land_pages, "STATES"),
+        "registry": copy.deepcopy(gen_land_pages.STATES),
+        "pages": {s["slug"]: gen_land_pages.state_path(s["slug"]) for s in gen_land_pages.STATES},
+    }
+
+# ── Dependency graph ──────────────────────────────────────────────────────────
+
+def affected_pairs(old, new):
+    """Map a CATEGORIES diff to the (cat_key, from_id, to_id) pages that must be re-rendered."""
+    render = set()
+    for cat_key, n in new.items():
+        o = old.get(cat_key)
+        pages = {(cat_key, fid, tid) for fid, *_ in n["units"] for tid, *_ in n["units"] if fid != tid}
+        meta_o = {k: v for k, v in (o or {}).items() if k not in ("units", "definitions")}
+        meta_n = {k: v for k, v in n.items() if k not in ("units", "definitions")}
+        if o is None or meta_o != meta_n or [u[:2] for u in o["units"]] != [u[:2] for u in n["units"]]:
+            render |= pages
+            continue
+        changed_units = {nu[0] for ou, nu in zip(o["units"], n["units"]) if ou != nu}
+        defs_o, defs_n = o["definitions"], n["definitions"]
+        changed_defs = {uid for uid in defs_o.keys() | defs_n.keys() if defs_o.get(uid) != defs_n.get(uid)}
+        render |= {(c, fid, tid) for c, fid, tid in pages
+                   if fid in changed_units or tid in changed_units or fid in changed_defs}
+    return render
+
+def affected_states(old, new):
+    """Map a STATES diff to (state slugs to re-render, whether the hub changes)."""
+    old_by = {s["slug"]: s for s in old}
+    if [(s["slug"], s["name"]) for s in old] != [(s["slug"], s["name"]) for s in new]:
+        return {s["slug"] for s in new}, True
+    changed = {s["slug"] for s in new if s != old_by[s["slug"]]}
+    return changed, bool(changed)
+
+# ── Incremental rendering ─────────────────────────────────────────────────────
+
+def remove_pages(out_dir, rel_paths):
+    for rel in rel_paths:
+        path = os.path.join(out_dir, rel)
+        if os.path.exists(path):
+            os.remove(path)
+            try:
+                os.rmdir(os.path.dirname(path))
+            except OSError:
+                pass
+
+def update_pairs(out_dir, old, full=False):
+    """Re-render pair pages after gen_pair_pages.py changed. Returns (new snapshot, pages written)."""
+    importlib.reload(gen_pair_pages)
+    new = pair_snapshot()
+    if full or new["code"] != old["code"]:
+        gen_pair_pages.main(out_dir)
+        render = set(new["pages"])
+    else:
+        render = affected_pairs(old["registry"], new["registry"])
+        for cat_key, fid, tid in sorted(render):
+            gen_pair_pages.render_pair(out_dir, cat_key, fid, tid)
+        for cat_key in sorted({c for c, _, _ in render}):
+            gen_pair_pages.render_units(out_dir, cat_key)
+    # A pair directory also holds data.json and its .gz; remove those before the page
+    stale = set(old["pages"].values()) - set(new["pages"].values())
+    remove_pages(out_dir, [os.path.join(os.path.dirname(p), f) for p in sorted(stale)
+                           for f in (gen_pair_pages.DATA_FILE, gen_pair_pages.DATA_FILE + ".gz", "index.html")])
+    return new, len(render)
+
+def update_land(out_dir, old, full=False):
+    """Re-render land pages after gen_land_pages.py changed. Returns (new snapshot, pages written)."""
+    importlib.reload(gen_land_pages)
+    new = land_snapshot()
+    if full or new["code"] != old["code"]:
+        gen_land_pages.main(out_dir)
+        slugs, hub = set(new["pages"]), True
+    else:
+        slugs, hub = affected_states(old["registry"], new["registry"])
+        for state in gen_land_pages.STATES:
+            if state["slug"] in slugs:
+                gen_land_pages.render_state(out_dir, state)
+        if hub:
+            gen_land_pages.render_hub(out_dir)
+    remove_pages(out_dir, set(old["pages"].values()) - set(new["pages"].values()))
+    return new, len(slugs) + hub
+
+# ── Polling loop ──────────────────────────────────────────────────────────────
+
+def watched_files():
+    """{source path: [stage names]} for every input of every build stage."""
+    files = {}
+    for stage in build.STAGES:
+        for rel in stage["inputs"]:
+            src = os.path.join(build.SRC_DIR, rel)
+            paths = [os.path.join(src, f) for f in build.list_files(src)] if os.path.isdir(src) else [src]
+            for path in paths:
+                files.setdefault(path, []).append(stage["name"])
+    return files
+
+def mtimes(paths):
+    stamps = {}
+    for path in paths:
+        try:
+            stamps[path] = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            stamps[path] = None
+    return stamps
+
+def reload_modules(paths):
+    """Reload the build modules whose source changed (all generators if site_common did)."""
+    names = {os.path.splitext(os.path.basename(p))[0] for p in paths if p.endswith(".py")}
+    if "site_common" in names:
+        names |= {"site_common", "gen_category_pages", "gen_html_sitemap", "update_conv_links", "gen_sitemap"}
+    for name in ["site_common"] + sorted(names - {"site_common"}):
+        if name in names and name in sys.modules and name not in ("gen_pair_pages", "gen_land_pages"):
+            importlib.reload(sys.modules[name])
+
+def watch(out_dir=build.SRC_DIR, interval=POLL_INTERVAL):
+    out_dir = os.path.abspath(out_dir)
+    start = time.perf_counter()
+    build.print_summary(build.build(out_dir), time.perf_counter() - start)
+    pairs, land = pair_snapshot(), land_snapshot()
+    files = watched_files()
+    stamps = mtimes(files)
+    pair_src = os.path.abspath(gen_pair_pages.__file__)
+    land_src = os.path.abspath(gen_land_pages.__file__)
+    common_src = os.path.join(build.SRC_DIR, "site_common.py")
+    # Pages include these with a ?v= content hash, so an edit re-renders the pages that use them
+    script_srcs = {os.path.join(build.SRC_DIR, rel) for rel in site_common.VERSIONED_SCRIPTS}
+    popularity_src = os.path.join(build.SRC_DIR, "popularity.json")
+    registry_src = gen_land_pages.LAND_UNITS_FILE
+    print(f"\nWatching {len(files)} files (Ctrl+C to stop)...")
+
+    while True:
+        time.sleep(interval)
+        now = mtimes(files)
+        changed = [p for p in files if now[p] != stamps[p]]
+        if not changed:
+            continue
+        start = time.perf_counter()
+        written = 0
+        stages = set()
+        try:
+            reload_modules(changed)
+            if any("land_units" in files[p] for p in changed) and build.ingest_land_units.main() \
+                    and registry_src not in changed:
+                changed.append(registry_src)
+            for path in changed:
+                if path in (pair_src, common_src, popularity_src) \
+                        or (path in script_srcs and "pair_pages" in files[path]):
+                    # popularity.json reorders related links and prefetch hints
+                    pairs, n = update_pairs(out_dir, pairs, full=path != pair_src)
+                    written += n
+                if path in (land_src, common_src, popularity_src, registry_src) \
+                        or (path in script_srcs and "land_pages" in files[path]):
+                    land, n = update_land(out_dir, land, full=path != land_src)
+                    written += n
+                # Pair and land pages were re-rendered incrementally above; every other
+                # stage that reads this file (search index, category pages, ...) reruns
+                stages.update(s for s in files[path] if s not in ("pair_pages", "land_pages"))
+            for stage in build.STAGES:
+                if stage["name"] in stages and stage["name"] not in ("land_units", "land_pair_pages", "land_matrix",
+                                                                     "precompress", "service_worker", "sitemap",
+                                                                     "value_pages"):
+                    stage["run"](out_dir, True)
+                    print(f"  reran stage {stage['name']}")
+            # Picks up the reloaded registries; unchanged states are skipped
+            importlib.reload(gen_land_pair_pages)
+            build.stage_land_pair_pages(out_dir, True)
+            importlib.reload(gen_land_matrix)
+            build.stage_land_matrix(out_dir, True)
+            # These summarise every page, so they follow any change
+            build.stage_precompress(out_dir, True)
+            build.stage_service_worker(out_dir, True)
+            build.stage_sitemap(out_dir, True)
+            importlib.reload(gen_value_pages)  # it binds CATEGORIES from gen_pair_pages at import
+            build.stage_value_pages(out_dir, True)
+        except Exception as e:  # keep watching through a half-saved edit
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+        else:
+            names = ", ".join(os.path.relpath(p, build.SRC_DIR) for p in changed)
+            print(f"{names} changed: re-rendered {written} pages in {time.perf_counter() - start:.2f}s")
+        # Re-stat after rendering so our own writes (in-place builds) don't retrigger
+        stamps = mtimes(files)